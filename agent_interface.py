@@ -6,27 +6,77 @@ It checks for compliance with input/output constraints.
 """
 
 from abc import ABC, abstractmethod
+from collections.abc import Mapping
+import numpy as np
+
+def feature_column(features, name: str, default: float = 0.0) -> np.ndarray:
+    """
+    Reads one feature as a float64 array (at least 1-D).
+
+    Missing features fall back to `default`, broadcast to the batch shape.
+
+    Args:
+        features (dict, pd.Series or pd.DataFrame): { 'FeatureName': scalar or array }.
+        name (str): Feature to read.
+        default (float): Value used when the feature is absent.
+
+    Returns:
+        np.ndarray: Feature values.
+    """
+    value = features.get(name)
+    if value is None:
+        if isinstance(features, Mapping):
+            values = features.values()
+        elif np.ndim(features) == 2:
+            # pd.DataFrame: one batch element per row
+            return np.full(len(features), default)
+        else:
+            # pd.Series row (its .values is an array, not a method)
+            values = features.to_numpy()
+        shape = next((np.shape(v) for v in values if np.ndim(v) > 0), (1,))
+        return np.full(shape, default)
+    return np.atleast_1d(np.asarray(value, dtype=np.float64))
 
 class BaseAgent(ABC):
     """
     Abstract base class for deterministic market agents.
     Constraints:
-    - Input: Structured feature dictionary/Series.
+    - Input: Structured feature dictionary/Series (scalars or column arrays).
     - Output: (signal, confidence).
     - Stateless and side-effect free.
     """
-    
+
     @abstractmethod
+    def evaluate_batch(self, features: dict) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Evaluates feature columns to produce signal and confidence arrays.
+
+        Implementations must be element-wise so any batch shape works
+        (rows, or dates x tickers).
+
+        Args:
+            features (dict): { 'FeatureName': np.ndarray } of equal shape.
+
+        Returns:
+            tuple[np.ndarray, np.ndarray]:
+                - signal: Range [-1.0, 1.0] (Sell < 0 < Buy)
+                - confidence: Range [0.0, 1.0] (Low < High)
+        """
+        pass
+
     def evaluate(self, feature_row: dict) -> tuple[float, float]:
         """
         Evaluates features to produce a signal and confidence.
-        
+
+        Thin scalar wrapper over evaluate_batch (batch of one row).
+
         Args:
             feature_row (dict): A row of engineered features.
-            
+
         Returns:
             tuple[float, float]:
                 - signal: Range [-1.0, 1.0] (Sell < 0 < Buy)
                 - confidence: Range [0.0, 1.0] (Low < High)
         """
-        pass
+        signal, confidence = self.evaluate_batch(feature_row)
+        return float(signal[0]), float(confidence[0])
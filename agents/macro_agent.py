@@ -5,11 +5,16 @@ Assesses broad market context via regime detection.
 Prevents tunnel vision.
 """
 
+import numpy as np
 from agent_interface import BaseAgent
 import regime_detection
 
+# (signal, confidence) per regime code, in regime_detection.REGIMES order
+REGIME_SIGNAL = np.array([-1.0, -0.5, 0.5, 0.0])
+REGIME_CONFIDENCE = np.array([0.9, 0.6, 0.8, 0.4])
+
 class MacroAgent(BaseAgent):
-    def evaluate(self, feature_row: dict) -> tuple[float, float]:
+    def evaluate_batch(self, features: dict) -> tuple[np.ndarray, np.ndarray]:
         """
         Evaluates macro context based on Regime.
         
@@ -19,13 +24,7 @@ class MacroAgent(BaseAgent):
         - CALM: Signal +0.5, High Confidence.
         - TRANSITION: Signal 0.0, Low Confidence.
         """
-        regime, _ = regime_detection.detect_regime(feature_row)
+        # Detect regime (or reuse the caller's classification)
+        regimes = regime_detection.regime_codes(features)
         
-        if regime == regime_detection.REGIME_STRESS:
-            return -1.0, 0.9
-        elif regime == regime_detection.REGIME_VOLATILE:
-            return -0.5, 0.6
-        elif regime == regime_detection.REGIME_CALM:
-            return 0.5, 0.8
-        else: # TRANSITION
-            return 0.0, 0.4
+        return REGIME_SIGNAL[regimes], REGIME_CONFIDENCE[regimes]
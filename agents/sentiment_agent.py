@@ -5,12 +5,13 @@ Simulates sentiment using Volume and Trend proxies.
 Bounded by stress constraints.
 """
 
-from agent_interface import BaseAgent
+import numpy as np
+from agent_interface import BaseAgent, feature_column
 from config import settings
 import regime_detection
 
 class SentimentAgent(BaseAgent):
-    def evaluate(self, feature_row: dict) -> tuple[float, float]:
+    def evaluate_batch(self, features: dict) -> tuple[np.ndarray, np.ndarray]:
         """
         Evaluates sentiment using proxies (Volume Anomaly + Trend).
         
@@ -23,35 +24,30 @@ class SentimentAgent(BaseAgent):
         2. Constraints:
            - If Regime == STRESS: Signal <= 0, Confidence capped at 0.5.
         """
-        vol_anomaly = feature_row.get('Volume_Anomaly_20D', 0.0)
-        trend = feature_row.get('Trend_Strength_50D', 0.0)
+        vol_anomaly = feature_column(features, 'Volume_Anomaly_20D')
+        trend = feature_column(features, 'Trend_Strength_50D')
         
         # --- Signal Calculation ---
         # Basic proxy: Volume confirms trend direction
-        if abs(vol_anomaly) > 1.0: # Significant volume
-            if trend > 0:
-                signal = 0.8
-            else:
-                signal = -0.8
-        else:
-            signal = 0.0
+        # Significant volume: |Z| > 1
+        signal = np.where(np.abs(vol_anomaly) > 1.0, np.where(trend > 0, 0.8, -0.8), 0.0)
             
         # Modulation by trend magnitude
-        signal += (trend * 5.0) # Add trend bias
-        signal = max(-1.0, min(1.0, signal))
+        signal = signal + (trend * 5.0) # Add trend bias
+        signal = np.maximum(-1.0, np.minimum(1.0, signal))
         
         # --- Confidence Calculation ---
         # Base confidence on anomaly strength
-        confidence = min(1.0, abs(vol_anomaly) / 3.0) # Z=3 is high confidence
+        confidence = np.minimum(1.0, np.abs(vol_anomaly) / 3.0) # Z=3 is high confidence
         
         # --- Constraints ---
-        # Detect regime for constraint checking
-        regime, _ = regime_detection.detect_regime(feature_row)
+        # Detect regime for constraint checking (or reuse the caller's classification)
+        regimes = regime_detection.regime_codes(features)
+        stress = regimes == regime_detection.CODE_STRESS
         
-        if regime == regime_detection.REGIME_STRESS:
-            # Force neutral/negative
-            signal = min(0.0, signal)
-            # Cap confidence
-            confidence = min(0.5, confidence)
+        # Force neutral/negative
+        signal = np.where(stress, np.minimum(0.0, signal), signal)
+        # Cap confidence
+        confidence = np.where(stress, np.minimum(0.5, confidence), confidence)
             
         return signal, confidence
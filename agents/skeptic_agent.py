@@ -5,11 +5,12 @@ Actively challenges bullish interpretations.
 Biased toward negative signals.
 """
 
-from agent_interface import BaseAgent
+import numpy as np
+from agent_interface import BaseAgent, feature_column
 from config import settings
 
 class SkepticAgent(BaseAgent):
-    def evaluate(self, feature_row: dict) -> tuple[float, float]:
+    def evaluate_batch(self, features: dict) -> tuple[np.ndarray, np.ndarray]:
         """
         Evaluates skepticism.
         
@@ -22,33 +23,29 @@ class SkepticAgent(BaseAgent):
         Constraints:
         - Max Signal <= 0.2 (Never strong positive).
         """
-        volatility = feature_row.get('Volatility_20D', 0.0)
-        trend = feature_row.get('Trend_Strength_50D', 0.0)
+        volatility = feature_column(features, 'Volatility_20D')
+        trend = feature_column(features, 'Trend_Strength_50D')
         
-        signal = 0.0
-        confidence = 0.5 # Base
+        signal = np.zeros_like(volatility)
+        confidence = np.full_like(volatility, 0.5) # Base
         
         # 1. Volatility Penalty
-        if volatility > settings.VOLATILITY_THRESHOLD_LOW:
-            # Scaled negative signal
-            # e.g., if vol=2%, low=1%. Ratio=2. Signal -> -1.0 check
-            ratio = volatility / settings.VOLATILITY_THRESHOLD_HIGH
-            signal -= (ratio * 1.0)
+        # Scaled negative signal above the low threshold
+        # e.g., if vol=2%, high=2.5%. Ratio=0.8. Signal -> -0.8
+        ratio = volatility / settings.VOLATILITY_THRESHOLD_HIGH
+        signal = np.where(volatility > settings.VOLATILITY_THRESHOLD_LOW, signal - (ratio * 1.0), signal)
             
         # 2. Trend Skepticism
         # If trend is strong positive, Skeptic remains doubtful (neutral/mild negative)
+        # "Biased toward reducing autonomy" -> Dampen positive
         # If trend is negative, Skeptic agrees (negative)
-        if trend > 0.05:
-            # Contrarian fade? Or just restricted?
-            # "Biased toward reducing autonomy" -> Dampen positive
-            signal -= 0.1
-        elif trend < -0.05:
-            # Agree with downtrend
-            signal -= 0.5
-            confidence += 0.2
+        uptrend = trend > 0.05
+        downtrend = trend < -0.05
+        signal = np.where(uptrend, signal - 0.1, np.where(downtrend, signal - 0.5, signal))
+        confidence = np.where(downtrend, confidence + 0.2, confidence)
             
         # Constraints
-        signal = max(-1.0, min(0.2, signal))
-        confidence = max(0.0, min(1.0, confidence))
+        signal = np.maximum(-1.0, np.minimum(0.2, signal))
+        confidence = np.maximum(0.0, np.minimum(1.0, confidence))
         
         return signal, confidence
@@ -6,11 +6,12 @@ Signal increases with trend strength.
 Confidence decreases with volatility.
 """
 
-from agent_interface import BaseAgent
+import numpy as np
+from agent_interface import BaseAgent, feature_column
 from config import settings
 
 class StructureAgent(BaseAgent):
-    def evaluate(self, feature_row: dict) -> tuple[float, float]:
+    def evaluate_batch(self, features: dict) -> tuple[np.ndarray, np.ndarray]:
         """
         Evaluates market structure.
         
@@ -24,14 +25,14 @@ class StructureAgent(BaseAgent):
            - Volatility >= High Threshold => Confidence 0.0.
            - Volatility near 0 => Confidence 1.0.
         """
-        trend = feature_row.get('Trend_Strength_50D', 0.0)
-        volatility = feature_row.get('Volatility_20D', 0.0)
+        trend = feature_column(features, 'Trend_Strength_50D')
+        volatility = feature_column(features, 'Volatility_20D')
         
         # --- Signal Calculation ---
         # Scale: 0.10 trend (10%) = 1.0 signal
         raw_signal = trend * 10.0
         # Clamp to [-1.0, 1.0]
-        signal = max(-1.0, min(1.0, raw_signal))
+        signal = np.maximum(-1.0, np.minimum(1.0, raw_signal))
         
         # --- Confidence Calculation ---
         # Volatility penalty
@@ -39,10 +40,10 @@ class StructureAgent(BaseAgent):
         limit = settings.VOLATILITY_THRESHOLD_HIGH
         if limit <= 0:
             # Defensive check, though constant is fixed > 0
-            penalty_factor = 1.0 
+            penalty_factor = np.ones_like(volatility)
         else:
             penalty_factor = volatility / limit
             
-        confidence = max(0.0, 1.0 - penalty_factor)
+        confidence = np.maximum(0.0, 1.0 - penalty_factor)
         
         return signal, confidence
@@ -0,0 +1,239 @@
+"""
+FULL-HISTORY BACKTEST
+---------------------
+Runs the decision pipeline on every date of every ticker.
+
+Each stage is evaluated as whole-column NumPy operations over the feature
+frame instead of row-by-row Series lookups. The arithmetic mirrors the
+scalar path operation for operation, so every row reproduces exactly what
+run_simulation would emit if that row were the latest one.
+"""
+
+import numpy as np
+import pandas as pd
+import system_constraints
+from config import settings
+import data_persistence
+import data_processor
+import feature_engineering
+import regime_detection
+from decision_engine import execution, consensus, risk_assessment, final_verdict
+
+# Compact codes used inside the backtest (index into the label tuples)
+RISK_LABELS = (risk_assessment.RISK_HIGH, risk_assessment.RISK_MEDIUM, risk_assessment.RISK_LOW)
+ACTION_LABELS = (final_verdict.ACTION_BUY, final_verdict.ACTION_SELL, final_verdict.ACTION_HOLD)
+
+HIGH, MEDIUM, LOW = range(3)
+BUY, SELL, HOLD = range(3)
+
+def _risk(regimes, disagreement, drawdown):
+    """Vectorized risk_assessment.assess_risk."""
+    high = (
+        (regimes == regime_detection.CODE_STRESS)
+        | (disagreement > settings.DISAGREEMENT_THRESHOLD)
+        | (drawdown < settings.MAX_DRAWDOWN_LIMIT)
+    )
+    medium = (regimes == regime_detection.CODE_VOLATILE) | (disagreement > (settings.DISAGREEMENT_THRESHOLD * 0.5))
+    return np.select([high, medium], [HIGH, MEDIUM], default=LOW).astype(np.int8)
+
+def _verdicts(score, risk):
+    """Vectorized final_verdict.decide_verdict (action codes, execution flags)."""
+    low = risk == LOW
+    buy = low & (score > settings.CONSENSUS_SCORE_BUY)
+    sell = low & ~buy & (score < settings.CONSENSUS_SCORE_SELL)
+    actions = np.select([buy, sell], [BUY, SELL], default=HOLD).astype(np.int8)
+    return actions, buy | sell
+
+def _labels(codes, labels):
+    return pd.Categorical.from_codes(codes, categories=list(labels))
+
+FEATURE_NAMES = ('Trend_Strength_50D', 'Volatility_20D', 'Drawdown_20D', 'Volume_Anomaly_20D')
+
+def decide_batch(features):
+    """
+    Regime, agents, consensus, risk and verdict on feature arrays of any shape.
+
+    Args:
+        features (dict): { feature name: float64 array }, all the same shape.
+
+    Returns:
+        dict: Code/value arrays keyed regimes, regime_confidence, signals,
+              confidences (agents on the last axis), score, disagreement,
+              risk, actions, execution_allowed.
+    """
+    features = dict(features)
+
+    # 1. Regime (classified once, reused by the agents)
+    regimes, regime_conf = regime_detection.detect_regimes(features)
+    features[regime_detection.REGIME_CODE_COLUMN] = regimes
+
+    # 2. Agents
+    signals, confidences = execution.execute_agents_batch(features)
+
+    # 3. Consensus & Logic
+    score = consensus.compute_consensus_batch(signals, confidences, execution.AGENT_ORDER)
+    disagreement = consensus.compute_disagreement_batch(signals)
+    risk = _risk(regimes, disagreement, features['Drawdown_20D'])
+
+    # 4. Verdict
+    actions, exec_allowed = _verdicts(score, risk)
+
+    return {
+        'regimes': regimes, 'regime_confidence': regime_conf,
+        'signals': signals, 'confidences': confidences,
+        'score': score, 'disagreement': disagreement,
+        'risk': risk, 'actions': actions, 'execution_allowed': exec_allowed
+    }
+
+def backtest_features(df_feat):
+    """
+    Runs regime, agents, consensus, risk and verdict on every row.
+
+    Args:
+        df_feat (pd.DataFrame): Output of feature_engineering.compute_features.
+
+    Returns:
+        pd.DataFrame: One row per date with Regime, Regime_Confidence,
+                      <Agent>_Signal/<Agent>_Confidence, Consensus_Score,
+                      Disagreement_Index, Risk_Level, Action, Execution_Allowed.
+    """
+    d = decide_batch({name: df_feat[name].to_numpy(dtype=np.float64) for name in FEATURE_NAMES})
+
+    columns = {
+        'Regime': _labels(d['regimes'], regime_detection.REGIMES),
+        'Regime_Confidence': d['regime_confidence']
+    }
+    for i, name in enumerate(execution.AGENT_ORDER):
+        columns[f'{name}_Signal'] = d['signals'][:, i]
+        columns[f'{name}_Confidence'] = d['confidences'][:, i]
+    columns.update({
+        'Consensus_Score': d['score'],
+        'Disagreement_Index': d['disagreement'],
+        'Risk_Level': _labels(d['risk'], RISK_LABELS),
+        'Action': _labels(d['actions'], ACTION_LABELS),
+        'Execution_Allowed': d['execution_allowed']
+    })
+    return pd.DataFrame(columns, index=df_feat.index)
+
+def backtest_panel(panel):
+    """
+    Backtests every usable (date, ticker) cell of a featured Panel in one batch.
+
+    Only masked-in cells reach the agents (missing cells would violate the
+    agents' output contract); results are scattered back onto the calendar.
+
+    Args:
+        panel (Panel): Output of feature_engineering.compute_features(panel).
+
+    Returns:
+        dict: decide_batch arrays shaped (dates x tickers [x agents]); codes
+              are -1 and values NaN/False outside the mask.
+    """
+    mask = panel.mask
+    d = decide_batch({name: panel.field(name)[mask] for name in FEATURE_NAMES})
+
+    out = {}
+    for key, values in d.items():
+        if values.dtype == np.int8:
+            full = np.full(mask.shape + values.shape[1:], -1, dtype=np.int8)
+        elif values.dtype == bool:
+            full = np.zeros(mask.shape + values.shape[1:], dtype=bool)
+        else:
+            full = np.full(mask.shape + values.shape[1:], np.nan)
+        full[mask] = values
+        out[key] = full
+    return out
+
+def panel_verdicts(panel, date):
+    """
+    Cross-sectional verdicts: every ticker with a usable row on one date.
+
+    Reads the date's contiguous (tickers x fields) slice instead of one
+    DataFrame lookup per ticker.
+
+    Args:
+        panel (Panel): Featured panel.
+        date: Trading date in the panel calendar.
+
+    Returns:
+        list: Verdict dicts matching output_schema.json.
+    """
+    row, usable = panel.on_date(date)
+    d = decide_batch({name: row[usable, panel.fields.index(name)] for name in FEATURE_NAMES})
+    timestamp = pd.Timestamp(panel.dates[panel.date_position(date)]).isoformat()
+
+    records = []
+    for i, ticker in enumerate(np.asarray(panel.tickers)[usable]):
+        action = ACTION_LABELS[d['actions'][i]]
+        risk_level = RISK_LABELS[d['risk'][i]]
+        _, _, reason = final_verdict.decide_verdict(d['score'][i], risk_level)
+        records.append({
+            "ticker": str(ticker),
+            "timestamp": timestamp,
+            "action": action,
+            "confidence": float(d['regime_confidence'][i]),
+            "is_simulation": True,
+            "execution_allowed": bool(d['execution_allowed'][i]),
+            "consensus_score": round(float(d['score'][i]), 4),
+            "disagreement_index": round(float(d['disagreement'][i]), 4),
+            "risk_level": risk_level,
+            "regime": regime_detection.REGIMES[d['regimes'][i]],
+            "regime_confidence": float(d['regime_confidence'][i]),
+            "reason": reason
+        })
+    return records
+
+def backtest_ticker(ticker):
+    """
+    Loads, cleans and featurizes one cached ticker, then backtests it.
+
+    Returns:
+        pd.DataFrame: See backtest_features.
+    """
+    df = data_persistence.load_from_cache(ticker)
+    df_clean = data_processor.clean_data(df)
+    df_feat = feature_engineering.compute_features(df_clean)
+    return backtest_features(df_feat)
+
+def run_backtest(tickers=system_constraints.MARKET_UNIVERSE):
+    """
+    Backtests the full cached history of every ticker.
+
+    Args:
+        tickers (iterable): Tickers to backtest (must be cached).
+
+    Returns:
+        dict: { 'Ticker': backtest DataFrame }
+    """
+    return {ticker: backtest_ticker(ticker) for ticker in tickers}
+
+def verdict_records(ticker, frame):
+    """
+    Converts a backtest frame into verdict dicts matching output_schema.json.
+
+    Args:
+        ticker (str): The ticker the frame belongs to.
+        frame (pd.DataFrame): Output of backtest_features.
+
+    Returns:
+        list: Verdict dicts, one per date.
+    """
+    records = []
+    for timestamp, row in zip(frame.index, frame.itertuples(index=False)):
+        # Reason strings come from the scalar layer so wording stays identical
+        _, _, reason = final_verdict.decide_verdict(row.Consensus_Score, row.Risk_Level)
+        records.append({
+            "ticker": ticker,
+            "timestamp": timestamp.isoformat(),
+            "action": row.Action,
+            "confidence": row.Regime_Confidence,
+            "is_simulation": True,
+            "execution_allowed": bool(row.Execution_Allowed),
+            "consensus_score": round(row.Consensus_Score, 4),
+            "disagreement_index": round(row.Disagreement_Index, 4),
+            "risk_level": row.Risk_Level,
+            "regime": row.Regime,
+            "regime_confidence": row.Regime_Confidence,
+            "reason": reason
+        })
+    return records
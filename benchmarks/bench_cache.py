@@ -0,0 +1,68 @@
+"""
+CACHE LOAD BENCHMARK
+--------------------
+Compares load_from_cache on the CSV format against the memory-mapped
+columnar format, on the cached market universe and on a synthetic universe.
+
+Usage:
+    python -m benchmarks.bench_cache [--tickers 10000] [--rows 1000]
+"""
+
+import argparse
+import shutil
+import tempfile
+import time
+
+import data_persistence
+import system_constraints
+from benchmarks.synthetic import synthetic_universe
+
+def _time_loads(tickers, loader, repeat):
+    """Best-of-N wall time for loading every ticker and reading its Close column."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for ticker in tickers:
+            df = loader(ticker)
+            # Touch the data so lazy memory maps are charged for the read
+            df["Close"].sum()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def _compare(label, tickers, repeat):
+    # Conversion is one-time work, kept out of the timed loop
+    for ticker in tickers:
+        data_persistence.load_from_cache(ticker)
+
+    csv_time = _time_loads(tickers, data_persistence._load_csv, repeat)
+    col_time = _time_loads(tickers, data_persistence.load_from_cache, repeat)
+
+    print(f"{label:<24} {len(tickers):>7} {csv_time:>10.3f}s {col_time:>10.3f}s {csv_time / col_time:>8.1f}x")
+
+def run_benchmark(n_tickers, n_rows, repeat):
+    print(f"{'Universe':<24} {'Tickers':>7} {'CSV':>11} {'Columnar':>11} {'Speedup':>9}")
+
+    # 1. Real cached universe
+    _compare("Cached universe", list(system_constraints.MARKET_UNIVERSE), repeat)
+
+    # 2. Synthetic universe in a throwaway cache directory
+    original_dir = data_persistence.CACHE_DIR
+    tmp_dir = tempfile.mkdtemp(prefix="bench_cache_")
+    try:
+        data_persistence.CACHE_DIR = tmp_dir
+        tickers = []
+        for ticker, df in synthetic_universe(n_tickers, n_rows):
+            data_persistence.save_to_cache(ticker, df)
+            tickers.append(ticker)
+        _compare(f"Synthetic ({n_rows} rows)", tickers, 1)
+    finally:
+        data_persistence.CACHE_DIR = original_dir
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="CSV vs columnar cache load benchmark")
+    parser.add_argument("--tickers", type=int, default=10000, help="Synthetic universe size")
+    parser.add_argument("--rows", type=int, default=1000, help="Rows per synthetic ticker")
+    parser.add_argument("--repeat", type=int, default=5, help="Repeats for the cached universe")
+    args = parser.parse_args()
+    run_benchmark(args.tickers, args.rows, args.repeat)
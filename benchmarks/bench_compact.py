@@ -0,0 +1,132 @@
+"""
+COMPACT MODE BENCHMARK
+----------------------
+Compares clean_data + compute_features in the default float64 mode with
+the compact mode (float32 prices/features, int64 volume, no intermediate
+frames) on a synthetic universe:
+
+- resident: traced bytes kept for the whole universe, per ticker-year
+  (252 rows), for the pipeline's working set (the clean and feature
+  frames evaluate_ticker holds until the verdict) and for the feature
+  frames alone,
+- peak:     highest traced memory while one ticker is cleaned and featured,
+plus the largest absolute / relative difference of every column and the
+number of verdicts that change.
+
+Usage:
+    python -m benchmarks.bench_compact [--tickers 1000] [--rows 1000]
+"""
+
+import argparse
+import shutil
+import sys
+import tempfile
+import tracemalloc
+
+import numpy as np
+
+import data_persistence
+import data_processor
+import feature_engineering
+import main_simulation
+from benchmarks.synthetic import synthetic_universe
+
+TRADING_DAYS = 252
+VERDICT_FIELDS = ('action', 'regime', 'risk_level', 'execution_allowed')
+
+def _stages(ticker, compact):
+    df = data_persistence.load_from_cache(ticker)
+    df_clean = data_processor.clean_data(df, compact=compact)
+    return df_clean, feature_engineering.compute_features(df_clean, compact=compact)
+
+def _measure(tickers, compact):
+    """
+    Traced memory of one mode.
+
+    Returns:
+        tuple: (feature frames, working-set bytes, feature-only bytes,
+                max per-ticker peak bytes, rows kept)
+    """
+    held = []
+    peak = 0
+    tracemalloc.start()
+    try:
+        for ticker in tickers:
+            before = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+            held.append(_stages(ticker, compact))
+            peak = max(peak, tracemalloc.get_traced_memory()[1] - before)
+        working_set = tracemalloc.get_traced_memory()[0]
+        # Drop the clean frames; compact feature frames may still view them
+        frames = [df_feat for _, df_feat in held]
+        del held
+        features_only = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    return frames, working_set, features_only, peak, sum(len(f) for f in frames)
+
+def _differences(tickers, default_frames, compact_frames):
+    """Max abs/rel difference per column and verdicts that change."""
+    diffs = {}
+    changed = 0
+    for ticker, a, b in zip(tickers, default_frames, compact_frames):
+        for column in a.columns:
+            x = a[column].to_numpy(dtype=np.float64)
+            y = b[column].to_numpy(dtype=np.float64)
+            abs_diff = np.abs(x - y)
+            rel_diff = abs_diff / np.maximum(np.abs(x), 1e-12)
+            worst = diffs.setdefault(column, [0.0, 0.0])
+            worst[0] = max(worst[0], float(abs_diff.max(initial=0.0)))
+            worst[1] = max(worst[1], float(rel_diff.max(initial=0.0)))
+
+        va = main_simulation.build_verdict(ticker, a)
+        vb = main_simulation.build_verdict(ticker, b)
+        changed += any(va[f] != vb[f] for f in VERDICT_FIELDS)
+    return diffs, changed
+
+def run_benchmark(n_tickers, n_rows, seed=0):
+    original_dir = data_persistence.CACHE_DIR
+    tmp_dir = tempfile.mkdtemp(prefix="bench_compact_")
+    try:
+        data_persistence.CACHE_DIR = tmp_dir
+        tickers = []
+        for ticker, df in synthetic_universe(n_tickers, n_rows, seed=seed):
+            data_persistence.save_to_cache(ticker, df)
+            data_persistence.load_from_cache(ticker)    # One-time columnar conversion
+            tickers.append(ticker)
+
+        default_frames, *default_memory, rows = _measure(tickers, compact=False)
+        compact_frames, *compact_memory, compact_rows = _measure(tickers, compact=True)
+        if rows != compact_rows:
+            print(f"⚠️ Row counts differ: {rows} (float64) vs {compact_rows} (compact)")
+
+        years = rows / TRADING_DAYS
+        print(f"{n_tickers} tickers x {n_rows} rows ({years:.0f} ticker-years after warm-up)")
+        print(f"{'Mode':<10} {'working set/ticker-year':>24} {'features/ticker-year':>21} {'peak/ticker':>12}")
+        for mode, (working_set, features_only, peak) in (("float64", default_memory), ("compact", compact_memory)):
+            print(f"{mode:<10} {working_set / years / 1024:>22.1f}KB {features_only / years / 1024:>19.1f}KB "
+                  f"{peak / 1024:>10.1f}KB")
+        print("Reduction: " + ", ".join(
+            f"{label} {d / c:.2f}x" for label, d, c in zip(("working set", "features", "peak"), default_memory, compact_memory)
+        ))
+
+        diffs, changed = _differences(tickers, default_frames, compact_frames)
+        print(f"{'Column':<20} {'max abs diff':>13} {'max rel diff':>13}")
+        for column, (abs_diff, rel_diff) in diffs.items():
+            print(f"{column:<20} {abs_diff:>13.2e} {rel_diff:>13.2e}")
+        print(f"Verdicts changed: {changed}/{n_tickers}")
+        return diffs, changed
+    finally:
+        data_persistence.CACHE_DIR = original_dir
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="float64 vs compact clean_data/compute_features")
+    parser.add_argument("--tickers", type=int, default=1000, help="Synthetic universe size")
+    parser.add_argument("--rows", type=int, default=1000, help="Rows per synthetic ticker")
+    args = parser.parse_args(argv)
+    run_benchmark(args.tickers, args.rows)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
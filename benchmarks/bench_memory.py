@@ -0,0 +1,105 @@
+"""
+PIPELINE MEMORY BENCHMARK
+-------------------------
+Runs evaluate_ticker over a synthetic universe under the memory profiler
+and reports peak / retained traced memory per stage and per ticker, the
+top allocation sites, and the process peak RSS.
+
+The synthetic cache is written before tracing starts, so only the pipeline
+itself is measured. Use it to validate memory reductions: the per-stage
+peaks should drop, and the run's retained total should stay flat as the
+universe grows (anything else is a leak).
+
+Usage:
+    python -m benchmarks.bench_memory [--tickers 10000] [--rows 1000] [--sample 1]
+"""
+
+import argparse
+import json
+import os
+import resource
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import data_persistence
+import main_simulation
+import memory_profiling
+from benchmarks.synthetic import synthetic_universe
+
+RESULTS_PATH = "data/bench/memory.json"
+
+def _peak_rss() -> int:
+    """Peak resident set size of this process in bytes (ru_maxrss is KiB on Linux)."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+def run_memory(n_tickers, n_rows, sample=1, top=10, seed=0):
+    """
+    Builds a synthetic cache and profiles evaluate_ticker on every ticker.
+
+    Returns:
+        dict: Memory report (see MemoryProfiler.report) plus run totals.
+    """
+    original_dir = data_persistence.CACHE_DIR
+    tmp_dir = tempfile.mkdtemp(prefix="bench_memory_")
+    try:
+        data_persistence.CACHE_DIR = tmp_dir
+        tickers = []
+        for ticker, df in synthetic_universe(n_tickers, n_rows, seed=seed):
+            data_persistence.save_to_cache(ticker, df)
+            tickers.append(ticker)
+        # First load converts each CSV to the columnar format; keep that out of the trace
+        for ticker in tickers:
+            data_persistence.load_from_cache(ticker)
+
+        profiler = memory_profiling.start(top=top, sample=sample)
+        start = time.perf_counter()
+        for ticker in tickers:
+            main_simulation.evaluate_ticker(ticker)
+        elapsed = time.perf_counter() - start
+        current, peak = tracemalloc.get_traced_memory()
+        memory_profiling.stop()
+
+        report = profiler.report()
+        report["run"] = {
+            "seconds": elapsed,
+            "traced_current": current,
+            "traced_peak": peak,
+            "peak_rss": _peak_rss()
+        }
+        return profiler, report
+    finally:
+        data_persistence.CACHE_DIR = original_dir
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Per-stage peak/retained memory of the ticker pipeline")
+    parser.add_argument("--tickers", type=int, default=10000, help="Synthetic universe size")
+    parser.add_argument("--rows", type=int, default=1000, help="Rows per synthetic ticker")
+    parser.add_argument("--sample", type=int, default=1, help="Tickers with per-stage allocation site listings")
+    parser.add_argument("--top", type=int, default=10, help="Allocation sites per listing")
+    parser.add_argument("--output", default=RESULTS_PATH, help="Where to write the JSON report")
+    args = parser.parse_args(argv)
+
+    profiler, report = run_memory(args.tickers, args.rows, sample=args.sample, top=args.top)
+    report["config"] = {"tickers": args.tickers, "rows": args.rows}
+
+    directory = os.path.dirname(args.output)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+
+    run = report["run"]
+    print(profiler.summary())
+    print(f"{args.tickers} tickers x {args.rows} rows in {run['seconds']:.1f}s (traced) | "
+          f"traced peak {run['traced_peak'] / 2**20:.2f}MB, "
+          f"retained {run['traced_current'] / 2**20:.2f}MB, peak RSS {run['peak_rss'] / 2**20:.1f}MB")
+    print(f"Results written to {args.output}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
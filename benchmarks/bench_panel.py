@@ -0,0 +1,89 @@
+"""
+PANEL BENCHMARK
+---------------
+Compares the per-ticker DataFrame pipeline with the Panel pipeline on a
+synthetic universe:
+
+- clean + features + full-history backtest for every ticker,
+- a cross-sectional read: every ticker's features on one date
+  (N frame lookups vs one contiguous panel slice).
+
+Usage:
+    python -m benchmarks.bench_panel [--tickers 500] [--rows 1000]
+"""
+
+import argparse
+import shutil
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+import backtest
+import data_persistence
+import data_processor
+import feature_engineering
+from panel import Panel
+from benchmarks.synthetic import synthetic_universe
+
+def _best(func, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+def run_benchmark(n_tickers, n_rows, repeat=3, seed=0):
+    original_dir = data_persistence.CACHE_DIR
+    tmp_dir = tempfile.mkdtemp(prefix="bench_panel_")
+    try:
+        data_persistence.CACHE_DIR = tmp_dir
+        tickers = []
+        for ticker, df in synthetic_universe(n_tickers, n_rows, seed=seed):
+            data_persistence.save_to_cache(ticker, df)
+            data_persistence.load_from_cache(ticker)    # One-time columnar conversion
+            tickers.append(ticker)
+
+        def per_ticker():
+            frames = {}
+            for ticker in tickers:
+                df = data_persistence.load_from_cache(ticker)
+                frames[ticker] = feature_engineering.compute_features(data_processor.clean_data(df))
+                backtest.backtest_features(frames[ticker])
+            return frames
+
+        def panel():
+            featured = feature_engineering.compute_features(data_processor.clean_data(Panel.from_cache(tickers)))
+            backtest.backtest_panel(featured)
+            return featured
+
+        frame_time, frames = _best(per_ticker, repeat)
+        panel_time, featured = _best(panel, repeat)
+
+        date = featured.dates[-1]
+        lookup_time, _ = _best(lambda: np.array([frames[t].loc[date, 'Volatility_20D'] for t in tickers]), repeat)
+        slice_time, _ = _best(lambda: featured.on_date(date)[0][:, featured.fields.index('Volatility_20D')], repeat)
+
+        print(f"{n_tickers} tickers x {n_rows} rows | panel {featured.values.nbytes / 2**20:.1f}MB")
+        print(f"{'Step':<34} {'per-ticker':>11} {'panel':>11} {'speedup':>8}")
+        print(f"{'load + clean + features + backtest':<34} {frame_time:>10.3f}s {panel_time:>10.3f}s "
+              f"{frame_time / panel_time:>7.1f}x")
+        print(f"{'all tickers on one date':<34} {lookup_time * 1e3:>9.3f}ms {slice_time * 1e3:>9.3f}ms "
+              f"{lookup_time / slice_time:>7.0f}x")
+    finally:
+        data_persistence.CACHE_DIR = original_dir
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Per-ticker frames vs the universe Panel")
+    parser.add_argument("--tickers", type=int, default=500, help="Synthetic universe size")
+    parser.add_argument("--rows", type=int, default=1000, help="Rows per synthetic ticker")
+    parser.add_argument("--repeat", type=int, default=3, help="Timing repeats (best is kept)")
+    args = parser.parse_args(argv)
+    run_benchmark(args.tickers, args.rows, args.repeat)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,128 @@
+"""
+SHARED FEATURES BENCHMARK
+-------------------------
+Compares two ways of handing precomputed features to a process pool on a
+synthetic universe (features are computed once in the parent for both):
+
+- pickle: every task carries its tickers' feature frames,
+- shared: the feature matrices are published once in shared memory
+          (shared_features) and tasks carry the segment descriptor.
+
+Each worker runs the full-history agents (backtest.decide_batch) on its
+tickers and returns per-ticker action counts, which must match between
+the two modes. Reported: wall time from first submit to last result
+(shared includes publishing the segment) and bytes pickled into tasks.
+
+Usage:
+    python -m benchmarks.bench_shared [--tickers 2000] [--rows 1000] [--workers N]
+"""
+
+import argparse
+import math
+import os
+import pickle
+import shutil
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+import backtest
+import data_persistence
+import data_processor
+import feature_engineering
+import shared_features
+from panel import Panel
+from benchmarks.synthetic import synthetic_universe
+
+def _action_counts(actions):
+    codes, counts = np.unique(actions, return_counts=True)
+    return tuple(zip(codes.tolist(), counts.tolist()))
+
+def _pickled_task(frames):
+    """Worker: agents over each pickled feature frame."""
+    results = {}
+    for ticker, df_feat in frames:
+        d = backtest.decide_batch({name: df_feat[name].to_numpy(dtype=np.float64) for name in backtest.FEATURE_NAMES})
+        results[ticker] = _action_counts(d['actions'])
+    return results
+
+def _shared_task(descriptor, columns):
+    """Worker: agents over each ticker column of the shared matrices."""
+    results = {}
+    with shared_features.SharedArrays.attach(descriptor) as shared:
+        mask = shared["mask"]
+        for i in columns:
+            rows = mask[:, i]
+            d = backtest.decide_batch({name: shared[name][rows, i] for name in backtest.FEATURE_NAMES})
+            results[shared.meta["tickers"][i]] = _action_counts(d['actions'])
+    return results
+
+def _run(pool, tasks):
+    """Submits (func, *args) tasks; returns merged results and pickled task bytes."""
+    sent = sum(len(pickle.dumps(args, protocol=pickle.HIGHEST_PROTOCOL)) for _, *args in tasks)
+    results = {}
+    for future in [pool.submit(func, *args) for func, *args in tasks]:
+        results.update(future.result())
+    return results, sent
+
+def run_benchmark(n_tickers, n_rows, workers, seed=0):
+    original_dir = data_persistence.CACHE_DIR
+    tmp_dir = tempfile.mkdtemp(prefix="bench_shared_")
+    try:
+        data_persistence.CACHE_DIR = tmp_dir
+        tickers = []
+        for ticker, df in synthetic_universe(n_tickers, n_rows, seed=seed):
+            data_persistence.save_to_cache(ticker, df)
+            tickers.append(ticker)
+
+        featured = feature_engineering.compute_features(data_processor.clean_data(Panel.from_cache(tickers)))
+        columns = list(range(len(tickers)))
+        chunksize = max(1, math.ceil(n_tickers / (workers * 4)))
+        chunks = [columns[i:i + chunksize] for i in range(0, n_tickers, chunksize)]
+
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            pool.submit(int).result()       # Start the workers outside the timings
+
+            start = time.perf_counter()
+            frames = [[(tickers[i], featured.ticker_frame(tickers[i])) for i in chunk] for chunk in chunks]
+            pickled, pickled_bytes = _run(pool, [(_pickled_task, chunk) for chunk in frames])
+            pickle_time = time.perf_counter() - start
+            del frames
+
+            start = time.perf_counter()
+            with shared_features.publish_panel(featured) as shared:
+                shared_results, shared_bytes = _run(pool, [(_shared_task, shared.descriptor, chunk) for chunk in chunks])
+                segment = shared.nbytes
+            shared_time = time.perf_counter() - start
+
+        print(f"{n_tickers} tickers x {n_rows} rows | {workers} workers | {len(chunks)} tasks | "
+              f"segment {segment / 2**20:.1f}MB")
+        print(f"{'Mode':<8} {'wall':>9} {'task bytes':>12}")
+        print(f"{'pickle':<8} {pickle_time:>8.3f}s {pickled_bytes / 2**20:>10.1f}MB")
+        print(f"{'shared':<8} {shared_time:>8.3f}s {shared_bytes / 2**10:>10.1f}KB")
+        print(f"Speedup {pickle_time / shared_time:.1f}x, {pickled_bytes / shared_bytes:.0f}x fewer bytes pickled")
+        if pickled != shared_results:
+            print("⚠️ Worker results differ between modes")
+        leaked = [name for name in os.listdir("/dev/shm") if shared.shm.name.lstrip("/") in name] \
+            if os.path.isdir("/dev/shm") else []
+        if leaked:
+            print(f"⚠️ Segment not unlinked: {leaked}")
+        return pickle_time, shared_time
+    finally:
+        data_persistence.CACHE_DIR = original_dir
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Pickled vs shared-memory feature handoff to workers")
+    parser.add_argument("--tickers", type=int, default=2000, help="Synthetic universe size")
+    parser.add_argument("--rows", type=int, default=1000, help="Rows per synthetic ticker")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Pool size")
+    args = parser.parse_args(argv)
+    run_benchmark(args.tickers, args.rows, args.workers)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,268 @@
+"""
+PIPELINE STAGE BENCHMARK
+------------------------
+Times every stage of the per-ticker pipeline on a synthetic universe and
+compares the result with a stored baseline:
+
+    load_from_cache -> clean_data -> compute_features -> detect_regime
+    -> execute_agents -> consensus -> assess_risk -> decide_verdict
+
+plus the end-to-end evaluate_ticker run. Fully offline: the synthetic
+universe is written to a throwaway cache directory.
+
+Every run also times a fixed reference workload (pandas rolling std and a
+Python sort on the synthetic data, no pipeline code) and records a machine
+fingerprint (CPU, core count, Python / NumPy / pandas versions). Against a
+baseline from the same machine, stages are compared in seconds. Against one
+from another machine, absolute timings mean nothing, so each baseline stage
+is rescaled by this run's reference / the baseline's reference and only
+those ratios are compared.
+
+Usage:
+    python -m benchmarks.bench_stages [--tickers 20] [--rows 1000] [--repeat 5]
+    python -m benchmarks.bench_stages --update-baseline
+
+Exits with status 1 when a stage is slower than the (rescaled) baseline
+* (1 + tolerance) and by more than --min-delta seconds per call.
+"""
+
+import argparse
+import json
+import math
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+import data_persistence
+import data_processor
+import feature_engineering
+import main_simulation
+import regime_detection
+from decision_engine import execution, consensus, risk_assessment, final_verdict
+from benchmarks.synthetic import synthetic_universe
+
+BASELINE_PATH = "benchmarks/baseline_stages.json"
+RESULTS_PATH = "data/bench/stages.json"
+
+DEFAULT_TOLERANCE = 0.5      # Allowed relative slowdown per stage
+DEFAULT_MIN_DELTA = 20e-6    # Seconds per call; smaller slowdowns are timer noise
+MIN_REPEAT_TIME = 0.05       # Seconds each timed repeat should last
+REFERENCE_STAGE = "reference"   # Machine-speed yardstick; never gated itself
+
+def _cpu_model():
+    try:
+        with open("/proc/cpuinfo", "r") as f:
+            for line in f:
+                if line.startswith("model name"):
+                    return line.split(":", 1)[1].strip()
+    except OSError:
+        pass
+    return platform.processor()
+
+def machine_fingerprint():
+    """What absolute timings depend on besides the code under test."""
+    return {
+        "cpu": _cpu_model(),
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+        "system": platform.system(),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__
+    }
+
+def _prepare(ticker):
+    """Inputs of every stage for one ticker, computed once outside the timers."""
+    df = data_persistence.load_from_cache(ticker)
+    df_clean = data_processor.clean_data(df)
+    df_feat = feature_engineering.compute_features(df_clean)
+    latest_row = df_feat.iloc[-1]
+
+    regime, _ = regime_detection.detect_regime(latest_row)
+    features = dict(latest_row)
+    features[regime_detection.REGIME_CODE_COLUMN] = regime_detection.REGIMES.index(regime)
+    agent_outputs = execution.execute_agents(features)
+    score = consensus.compute_consensus(agent_outputs)
+    disagreement = consensus.compute_disagreement(agent_outputs)
+    risk = risk_assessment.assess_risk(regime, disagreement, latest_row)
+
+    return {
+        "ticker": ticker, "df": df, "df_clean": df_clean, "latest_row": latest_row,
+        "regime": regime, "features": features, "agent_outputs": agent_outputs,
+        "score": score, "disagreement": disagreement, "risk": risk
+    }
+
+def _consensus(s):
+    consensus.compute_consensus(s["agent_outputs"])
+    consensus.compute_disagreement(s["agent_outputs"])
+
+def _reference(s):
+    # Library and interpreter work only: its time tracks the machine, not the repo
+    s["df"]["Close"].rolling(20).std().sum()
+    sorted(s["df"]["Volume"].tolist())
+
+# Stage name -> callable(prepared inputs), in pipeline order
+STAGES = (
+    ("load_from_cache", lambda s: data_persistence.load_from_cache(s["ticker"])["Close"].sum()),
+    ("clean_data", lambda s: data_processor.clean_data(s["df"])),
+    ("compute_features", lambda s: feature_engineering.compute_features(s["df_clean"])),
+    ("detect_regime", lambda s: regime_detection.detect_regime(s["latest_row"])),
+    ("execute_agents", lambda s: execution.execute_agents(s["features"])),
+    ("consensus", _consensus),
+    ("assess_risk", lambda s: risk_assessment.assess_risk(s["regime"], s["disagreement"], s["latest_row"])),
+    ("decide_verdict", lambda s: final_verdict.decide_verdict(s["score"], s["risk"])),
+    ("end_to_end", lambda s: main_simulation.evaluate_ticker(s["ticker"])),
+    (REFERENCE_STAGE, _reference),
+)
+
+def _time_stage(func, prepared, repeat):
+    """
+    Best-of-N mean seconds per call over the universe.
+
+    Like timeit's autorange, each repeat loops over the universe enough times
+    to last MIN_REPEAT_TIME, so microsecond stages are not dominated by noise.
+    """
+    start = time.perf_counter()
+    for inputs in prepared:
+        func(inputs)
+    loops = max(1, math.ceil(MIN_REPEAT_TIME / max(time.perf_counter() - start, 1e-9)))
+
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(loops):
+            for inputs in prepared:
+                func(inputs)
+        best = min(best, (time.perf_counter() - start) / (loops * len(prepared)))
+    return best
+
+def run_stages(n_tickers, n_rows, repeat, seed=0):
+    """
+    Builds a synthetic cache and times every stage.
+
+    Returns:
+        dict: { stage: seconds per call }
+    """
+    original_dir = data_persistence.CACHE_DIR
+    tmp_dir = tempfile.mkdtemp(prefix="bench_stages_")
+    try:
+        data_persistence.CACHE_DIR = tmp_dir
+        prepared = []
+        for ticker, df in synthetic_universe(n_tickers, n_rows, seed=seed):
+            data_persistence.save_to_cache(ticker, df)
+            prepared.append(_prepare(ticker))
+
+        return {name: _time_stage(func, prepared, repeat) for name, func in STAGES}
+    finally:
+        data_persistence.CACHE_DIR = original_dir
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+def compare(results, baseline, tolerance=DEFAULT_TOLERANCE, min_delta=DEFAULT_MIN_DELTA):
+    """
+    Flags stages slower than the baseline.
+
+    Returns:
+        list: (stage, baseline seconds, current seconds) for each regression.
+    """
+    regressions = []
+    for stage, current in results.items():
+        reference = baseline.get(stage)
+        if reference is None or stage == REFERENCE_STAGE:
+            continue
+        if current > reference * (1.0 + tolerance) and current - reference > min_delta:
+            regressions.append((stage, reference, current))
+    return regressions
+
+def rescale(baseline, results):
+    """
+    Baseline stage timings translated to this run's machine speed.
+
+    Returns:
+        dict: { stage: baseline seconds * current reference / baseline reference }
+    """
+    scale = results[REFERENCE_STAGE] / baseline[REFERENCE_STAGE]
+    return {stage: seconds * scale for stage, seconds in baseline.items()}
+
+def _write_json(path, payload):
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(payload, f, indent=2)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Per-stage pipeline benchmark with regression check")
+    parser.add_argument("--tickers", type=int, default=20, help="Synthetic universe size")
+    parser.add_argument("--rows", type=int, default=1000, help="Rows per synthetic ticker")
+    parser.add_argument("--repeat", type=int, default=5, help="Repeats per stage (best is kept)")
+    parser.add_argument("--output", default=RESULTS_PATH, help="Where to write the JSON results")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="Baseline JSON to compare against")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE, help="Allowed relative slowdown")
+    parser.add_argument("--min-delta", type=float, default=DEFAULT_MIN_DELTA, help="Ignored absolute slowdown (s/call)")
+    parser.add_argument("--update-baseline", action="store_true", help="Store this run as the new baseline")
+    args = parser.parse_args(argv)
+
+    config = {"tickers": args.tickers, "rows": args.rows, "repeat": args.repeat}
+    results = run_stages(args.tickers, args.rows, args.repeat)
+    report = {
+        "config": config,
+        "fingerprint": machine_fingerprint(),
+        "stages": results
+    }
+    _write_json(args.output, report)
+
+    baseline = None
+    if not args.update_baseline and os.path.exists(args.baseline):
+        with open(args.baseline, "r") as f:
+            baseline = json.load(f)
+        if baseline["config"] != config:
+            print(f"⚠️ Baseline config {baseline['config']} differs from {config}; timings not compared")
+            baseline = None
+
+    # 1. Same machine: seconds are comparable as they are
+    # 2. Other machine: only ratios to the reference workload are
+    expected = None
+    if baseline is not None:
+        if baseline.get("fingerprint") == report["fingerprint"]:
+            expected = baseline["stages"]
+        elif REFERENCE_STAGE in baseline["stages"]:
+            print(f"⚠️ Baseline recorded on another machine ({baseline.get('fingerprint')}); "
+                  f"comparing timings relative to the {REFERENCE_STAGE} workload")
+            expected = rescale(baseline["stages"], results)
+        else:
+            print("⚠️ Baseline has no machine fingerprint or reference timing; timings not compared "
+                  "(refresh it with --update-baseline)")
+
+    print(f"{'Stage':<18} {'per call':>12} {'baseline':>12} {'change':>8}")
+    for stage, seconds in results.items():
+        line = f"{stage:<18} {seconds * 1e3:>10.3f}ms"
+        if expected is not None and stage in expected:
+            reference = expected[stage]
+            line += f" {reference * 1e3:>10.3f}ms {(seconds / reference - 1) * 100:>+7.1f}%"
+        print(line)
+    print(f"Results written to {args.output}")
+
+    if args.update_baseline:
+        _write_json(args.baseline, report)
+        print(f"Baseline updated: {args.baseline}")
+        return 0
+
+    if expected is None:
+        return 0
+
+    regressions = compare(results, expected, args.tolerance, args.min_delta)
+    for stage, reference, current in regressions:
+        print(f"❌ {stage} regressed: {reference * 1e3:.3f}ms -> {current * 1e3:.3f}ms "
+              f"(tolerance {args.tolerance:.0%})")
+    if not regressions:
+        print("✅ No stage regressed beyond the baseline.")
+    return 1 if regressions else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
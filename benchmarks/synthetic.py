@@ -0,0 +1,67 @@
+"""
+SYNTHETIC MARKET DATA
+---------------------
+Generates reproducible OHLCV frames shaped like the yfinance cache files.
+Prices follow a geometric Brownian motion; volume is log-normal noise.
+Used by the benchmarks so they run fully offline at any universe size.
+"""
+
+import numpy as np
+import pandas as pd
+
+START_DATE = "2020-01-01"
+
+def synthetic_ohlcv(n_rows, seed=0, start=START_DATE, s0=1000.0, mu=0.0003, sigma=0.015):
+    """
+    Generates one ticker's daily OHLCV history.
+
+    Args:
+        n_rows (int): Number of business days to generate.
+        seed (int): Seed for the random generator (same seed, same frame).
+        start (str): First date of the business-day index.
+        s0 (float): Starting close price.
+        mu (float): Daily drift of log returns.
+        sigma (float): Daily volatility of log returns.
+
+    Returns:
+        pd.DataFrame: Columns Close, High, Low, Open, Volume indexed by Date.
+    """
+    rng = np.random.default_rng(seed)
+
+    log_returns = rng.normal(mu - 0.5 * sigma ** 2, sigma, n_rows)
+    close = s0 * np.exp(np.cumsum(log_returns))
+
+    # Open gaps from the previous close; High/Low bracket both
+    prev_close = np.concatenate(([s0], close[:-1]))
+    open_ = prev_close * np.exp(rng.normal(0.0, sigma * 0.25, n_rows))
+    spread = np.abs(rng.normal(0.0, sigma * 0.5, n_rows))
+    high = np.maximum(open_, close) * (1.0 + spread)
+    low = np.minimum(open_, close) * (1.0 - spread)
+
+    volume = rng.lognormal(mean=14.5, sigma=0.4, size=n_rows).astype(np.int64)
+
+    index = pd.bdate_range(start=start, periods=n_rows, name="Date")
+    return pd.DataFrame({
+        "Close": close,
+        "High": high,
+        "Low": low,
+        "Open": open_,
+        "Volume": volume
+    }, index=index)
+
+def synthetic_universe(n_tickers, n_rows, seed=0):
+    """
+    Yields (ticker, frame) pairs for a synthetic universe.
+
+    Frames are generated lazily so large universes never sit in memory at once.
+
+    Args:
+        n_tickers (int): Number of tickers.
+        n_rows (int): Rows per ticker.
+        seed (int): Base seed; ticker i uses seed + i.
+
+    Yields:
+        tuple: (ticker (str), pd.DataFrame)
+    """
+    for i in range(n_tickers):
+        yield f"SYN{i:05d}.NS", synthetic_ohlcv(n_rows, seed=seed + i)
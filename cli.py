@@ -0,0 +1,183 @@
+"""
+COMMAND LINE ENTRY POINT
+------------------------
+Single entry point for the simulation toolchain:
+
+    python cli.py fetch     [--universe FILE]
+    python cli.py run       [--universe FILE] [--workers N [--shared]] [--no-cache] [--offline] [--compact] [--metrics [PATH]] [--memory [PATH]]
+    python cli.py backtest  [--universe FILE] [--offline] [--metrics [PATH]] [--memory [PATH]]
+    python cli.py serve     [--port 5001]
+    python cli.py bench     cache [--tickers N] [--rows N] | stages [...] | memory [...] | compact [...] | panel [...] | shared [...] | imports
+
+Each subcommand imports only what it needs: `run` on a fresh, memoized cache
+never loads pandas or the network stack. `bench imports` measures the cold
+import cost of every subcommand in a fresh interpreter.
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+SERVER_DIR = os.path.join(ROOT, "server")
+
+# Modules each subcommand loads up front (measured by `bench imports`)
+COMMAND_MODULES = {
+    "fetch": ("data_fetcher",),
+    "run": ("main_simulation",),
+    "backtest": ("main_simulation", "backtest"),
+    "serve": ("main",),
+    "bench": ("benchmarks.bench_cache", "benchmarks.bench_stages", "benchmarks.bench_memory",
+              "benchmarks.bench_compact", "benchmarks.bench_panel", "benchmarks.bench_shared"),
+}
+
+HEAVY_MODULES = ("pandas", "yfinance", "langchain", "langgraph")
+
+def cmd_fetch(args):
+    import data_fetcher
+    import system_constraints
+
+    added, report = data_fetcher.update_cache(system_constraints.load_universe(args.universe))
+    print(report.summary())
+    for ticker, rows in added.items():
+        print(f"  {ticker:<16} +{rows} rows")
+
+def cmd_run(args):
+    import main_simulation
+    import memory_profiling
+    import system_constraints
+
+    if args.metrics:
+        import instrumentation
+        instrumentation.enable()
+    if args.memory:
+        # tracemalloc only sees this process
+        args.workers = 1
+        memory_profiling.start()
+
+    main_simulation.run_simulation(
+        system_constraints.load_universe(args.universe), workers=args.workers,
+        memoize=not args.no_cache, offline=args.offline, shared=args.shared,
+        compact=args.compact
+    )
+    if args.memory:
+        main_simulation.write_memory_report(memory_profiling.stop(), args.memory)
+    if args.metrics:
+        main_simulation.write_metrics(args.metrics)
+
+def cmd_backtest(args):
+    import main_simulation
+    import memory_profiling
+    import system_constraints
+    if args.metrics:
+        import instrumentation
+        instrumentation.enable()
+    if args.memory:
+        memory_profiling.start()
+
+    main_simulation.run_backtest(system_constraints.load_universe(args.universe), offline=args.offline)
+    if args.memory:
+        main_simulation.write_memory_report(memory_profiling.stop(), args.memory)
+    if args.metrics:
+        main_simulation.write_metrics(args.metrics)
+
+def cmd_serve(args):
+    # Server modules import each other as top-level modules
+    sys.path.insert(0, SERVER_DIR)
+    import main
+    main.app.run(host=args.host, port=args.port, threaded=True)
+
+def _measure_imports(modules):
+    """Cold import time (ms) and heavy modules loaded, in a fresh interpreter."""
+    code = (
+        "import sys, time\n"
+        f"sys.path[:0] = [{ROOT!r}, {SERVER_DIR!r}]\n"
+        "start = time.perf_counter()\n"
+        f"for name in {modules!r}: __import__(name)\n"
+        "elapsed = (time.perf_counter() - start) * 1000\n"
+        f"heavy = [m for m in {HEAVY_MODULES!r} if m in sys.modules]\n"
+        "print(f'{elapsed:.1f}', ','.join(heavy))\n"
+    )
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, cwd=ROOT)
+    if result.returncode != 0:
+        return None, result.stderr.strip().splitlines()[-1]
+    elapsed, _, heavy = result.stdout.strip().partition(" ")
+    return float(elapsed), heavy or "-"
+
+def cmd_bench(args):
+    if args.target == "imports":
+        print(f"{'command':<10} {'import ms':>10}  heavy modules loaded")
+        for command, modules in COMMAND_MODULES.items():
+            elapsed, heavy = _measure_imports(modules)
+            if elapsed is None:
+                print(f"{command:<10} {'n/a':>10}  {heavy}")
+            else:
+                print(f"{command:<10} {elapsed:>10.1f}  {heavy}")
+        return
+
+    if args.target in ("stages", "memory", "compact", "panel", "shared"):
+        import importlib
+        bench = importlib.import_module(f"benchmarks.bench_{args.target}")
+        argv = list(args.extra)
+        for flag in ("tickers", "rows", "repeat"):
+            if getattr(args, flag) is not None:
+                argv += [f"--{flag}", str(getattr(args, flag))]
+        sys.exit(bench.main(argv))
+
+    from benchmarks import bench_cache
+    bench_cache.run_benchmark(args.tickers or 10000, args.rows or 1000, args.repeat or 5)
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Deterministic market simulation toolchain")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    fetch = commands.add_parser("fetch", help="Incrementally refresh the local data cache")
+    fetch.add_argument("--universe", help="Universe file (one ticker per line); defaults to MARKET_UNIVERSE")
+    fetch.set_defaults(func=cmd_fetch)
+
+    run = commands.add_parser("run", help="Run the simulation (cache-first) and export server/data.json")
+    run.add_argument("--universe", help="Universe file (one ticker per line); defaults to MARKET_UNIVERSE")
+    run.add_argument("--workers", type=int, default=1, help="Worker processes for the per-ticker pipeline")
+    run.add_argument("--no-cache", action="store_true", help="Recompute every stage instead of reusing cached outputs")
+    run.add_argument("--shared", action="store_true", help="With --workers: compute features once and share them with workers")
+    run.add_argument("--offline", action="store_true", help="Never fetch; run on the cache as-is")
+    run.add_argument("--compact", action="store_true", help="Low-memory clean/features (float32 columns)")
+    run.add_argument("--metrics", nargs="?", const="data/metrics/run_report.json", help="Record stage timings and write a JSON run report")
+    run.add_argument("--memory", nargs="?", const="data/metrics/memory_report.json",
+                     help="Trace peak/retained memory per stage and ticker (single process; combine with --no-cache)")
+    run.set_defaults(func=cmd_run)
+
+    backtest = commands.add_parser("backtest", help="Evaluate every date of every ticker")
+    backtest.add_argument("--universe", help="Universe file (one ticker per line); defaults to MARKET_UNIVERSE")
+    backtest.add_argument("--offline", action="store_true", help="Never fetch; run on the cache as-is")
+    backtest.add_argument("--metrics", nargs="?", const="data/metrics/run_report.json", help="Record stage timings and write a JSON run report")
+    backtest.add_argument("--memory", nargs="?", const="data/metrics/memory_report.json",
+                          help="Trace peak/retained memory per span and write a JSON memory report")
+    backtest.set_defaults(func=cmd_backtest)
+
+    serve = commands.add_parser("serve", help="Start the Flask API server")
+    serve.add_argument("--host", default="127.0.0.1")
+    serve.add_argument("--port", type=int, default=5001)
+    serve.set_defaults(func=cmd_serve)
+
+    bench = commands.add_parser("bench", help="Run a benchmark")
+    bench.add_argument("target", choices=("cache", "stages", "memory", "compact", "panel", "shared", "imports"),
+                       help="cache: CSV vs columnar loads; stages: per-stage timings vs baseline; "
+                            "memory: per-stage peak/retained memory; compact: float32 mode memory and error; "
+                            "panel: per-ticker frames vs the universe panel; shared: pickled vs shared-memory features "
+                            "for workers; imports: cold import cost per command")
+    bench.add_argument("--tickers", type=int, help="Synthetic universe size (cache: 10000, stages: 20, memory: 10000, compact: 1000, panel: 500, shared: 2000)")
+    bench.add_argument("--rows", type=int, help="Rows per synthetic ticker (default 1000)")
+    bench.add_argument("--repeat", type=int, help="Timing repeats (default 5)")
+    bench.set_defaults(func=cmd_bench)
+
+    return parser
+
+if __name__ == "__main__":
+    # `bench stages` / `memory` / `compact` / `panel` / `shared` forward their own flags (--update-baseline, --sample, ...)
+    args, extra = build_parser().parse_known_args()
+    if extra and getattr(args, "target", None) not in ("stages", "memory", "compact", "panel", "shared"):
+        build_parser().error(f"unrecognized arguments: {' '.join(extra)}")
+    args.extra = extra
+    args.func(args)
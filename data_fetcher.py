@@ -1,49 +1,242 @@
 """
 HISTORICAL DATA DATA FETCH
 --------------------------
-This module implements a one-time historical market data acquisition step.
-It fetches daily candles for the fixed market universe over a fixed window.
+This module implements historical market data acquisition.
+It fetches daily candles for the fixed market universe over a fixed window,
+either in full or incrementally on top of the local cache.
+
+Providers sit behind MarketDataProvider so the pipeline can run against a
+local stand-in instead of yfinance.
 """
 
-import yfinance as yf
-from system_constraints import MARKET_UNIVERSE, TIMEFRAME
+from abc import ABC, abstractmethod
+import random
+import threading
+import time
+import pandas as pd
+import data_persistence
+import fetch_engine
+# Fixed historical window (end date is exclusive)
+from system_constraints import MARKET_UNIVERSE, TIMEFRAME, START_DATE, END_DATE
+
+class MarketDataProvider(ABC):
+    """
+    Abstract source of daily OHLCV candles.
+
+    Providers able to serve several tickers in one request set
+    `supports_batch = True` and override fetch_batch.
+    """
+
+    supports_batch = False
+
+    @abstractmethod
+    def fetch(self, ticker: str, start: str, end: str) -> pd.DataFrame:
+        """
+        Fetches candles for one ticker.
+
+        Args:
+            ticker (str): The stock ticker (e.g., RELIANCE.NS).
+            start (str): First date to include (YYYY-MM-DD).
+            end (str): First date to exclude (YYYY-MM-DD).
+
+        Returns:
+            pd.DataFrame: OHLCV rows indexed by date; empty if none.
+        """
+        pass
+
+    def fetch_batch(self, tickers: list, start: str, end: str) -> dict:
+        """
+        Fetches candles for several tickers sharing one window.
+
+        Returns:
+            dict: { 'Ticker': pd.DataFrame }
+        """
+        return {ticker: self.fetch(ticker, start, end) for ticker in tickers}
+
+class YFinanceProvider(MarketDataProvider):
+    """
+    Live provider backed by yfinance. Imported lazily so offline runs
+    never load the network stack.
+    """
+
+    supports_batch = True
+
+    def fetch(self, ticker: str, start: str, end: str) -> pd.DataFrame:
+        import yfinance as yf
+
+        # Reproducible API call with explicit parameters
+        return yf.download(
+            tickers=ticker,
+            start=start,
+            end=end,
+            interval=TIMEFRAME,
+            progress=False,
+            auto_adjust=True
+        )
+
+    def fetch_batch(self, tickers: list, start: str, end: str) -> dict:
+        import yfinance as yf
+
+        if len(tickers) == 1:
+            return {tickers[0]: self.fetch(tickers[0], start, end)}
+
+        df = yf.download(
+            tickers=list(tickers),
+            start=start,
+            end=end,
+            interval=TIMEFRAME,
+            progress=False,
+            auto_adjust=True,
+            group_by="ticker"
+        )
+
+        # Columns are (Ticker, Field); split into one frame per ticker
+        frames = {}
+        for ticker in tickers:
+            if ticker in df.columns.get_level_values(0):
+                frames[ticker] = df[ticker].dropna(how="all")
+        return frames
+
+class LocalProvider(MarketDataProvider):
+    """
+    Offline stand-in serving pre-built frames, e.g. for tests.
+
+    Records every request in `calls` so callers can assert which ranges
+    were actually fetched. Latency and transient errors can be injected
+    to exercise the concurrent fetch engine.
+    """
+
+    def __init__(self, frames: dict, latency=0.0, failure_rate=0.0, supports_batch=False, seed=0):
+        """
+        Args:
+            frames (dict): { 'Ticker': pd.DataFrame } full histories to serve.
+            latency (float): Seconds each provider call sleeps.
+            failure_rate (float): Probability [0, 1] that a call raises ConnectionError.
+            supports_batch (bool): Whether to advertise batched requests.
+            seed (int): Seed for the injected failures.
+        """
+        self.frames = frames
+        self.latency = latency
+        self.failure_rate = failure_rate
+        self.supports_batch = supports_batch
+        self.calls = []
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
 
-def fetch_historical_data():
+    def _simulate_network(self, request):
+        with self._lock:
+            self.calls.append(request)
+            failed = self._rng.random() < self.failure_rate
+
+        if self.latency:
+            time.sleep(self.latency)
+        if failed:
+            raise ConnectionError(f"Injected failure for {request[0]}")
+
+    def fetch(self, ticker: str, start: str, end: str) -> pd.DataFrame:
+        self._simulate_network((ticker, start, end))
+        return self._slice(ticker, start, end)
+
+    def fetch_batch(self, tickers: list, start: str, end: str) -> dict:
+        self._simulate_network((tuple(tickers), start, end))
+        return {ticker: self._slice(ticker, start, end) for ticker in tickers}
+
+    def _slice(self, ticker, start, end):
+        df = self.frames.get(ticker)
+        if df is None:
+            return pd.DataFrame()
+
+        mask = (df.index >= pd.Timestamp(start)) & (df.index < pd.Timestamp(end))
+        return df.loc[mask].copy()
+
+def _default_provider():
+    return YFinanceProvider()
+
+def fetch_historical_data(provider=None, **engine_options):
     """
     Fetches historical OHLCV data for the defined market universe.
-    
+
     Constraints:
     - Fixed Start Date: 2020-01-01
     - Fixed End Date: 2024-01-01
     - Fixed Interval: Daily (1D)
-    - No caching or runtime updates.
-    
+    - Full window, ignoring the cache (see update_cache for deltas).
+
+    Args:
+        provider (MarketDataProvider, optional): Data source. Defaults to yfinance.
+        **engine_options: Forwarded to fetch_engine.ConcurrentFetcher
+            (max_workers, rate, burst, max_retries, backoff, batch_size).
+
     Returns:
         dict: A dictionary where keys are tickers and values are pandas DataFrames.
+              Tickers with no data (or that failed after retries) are omitted.
     """
-    START_DATE = "2020-01-01"
-    END_DATE = "2024-01-01"
-    
-    data_map = {}
-    
-    # Explicit loop to ensure one fetch per stock
-    for ticker in MARKET_UNIVERSE:
-        # Reproducible API call with explicit parameters
-        df = yf.download(
-            tickers=ticker,
-            start=START_DATE,
-            end=END_DATE,
-            interval=TIMEFRAME,
-            progress=False,
-            auto_adjust=True
-        )
-        
-        # Ensure we have data
-        if not df.empty:
-            data_map[ticker] = df
-            
+    provider = provider or _default_provider()
+    fetcher = fetch_engine.ConcurrentFetcher(provider, **engine_options)
+
+    windows = {ticker: (START_DATE, END_DATE) for ticker in MARKET_UNIVERSE}
+    data_map, _ = fetcher.fetch(windows)
     return data_map
 
+def missing_range(ticker, end=END_DATE):
+    """
+    Computes the date range not yet present in the cache.
+
+    Args:
+        ticker (str): The stock ticker.
+        end (str): Exclusive end of the window.
+
+    Returns:
+        tuple or None: (start, end) as YYYY-MM-DD strings, or None if up to date
+                       (no business day left before end).
+    """
+    last = data_persistence.last_cached_date(ticker)
+    if last is None:
+        return START_DATE, end
+
+    start = (last + pd.Timedelta(days=1)).strftime("%Y-%m-%d")
+    # Weekend-only gaps have no candles to fetch
+    if not data_persistence.has_business_days(start, end):
+        return None
+    return start, end
+
+def update_cache(tickers=MARKET_UNIVERSE, provider=None, end=END_DATE, **engine_options):
+    """
+    Incrementally refreshes the local cache.
+
+    For each ticker only the range after the last cached date is requested,
+    then append-merged into the cache (deduplicated on the date index).
+
+    Args:
+        tickers (iterable): Tickers to refresh.
+        provider (MarketDataProvider, optional): Data source. Defaults to yfinance.
+        end (str): Exclusive end of the window.
+        **engine_options: Forwarded to fetch_engine.ConcurrentFetcher.
+
+    Returns:
+        tuple: (added, report)
+            - added: { 'Ticker': number of newly cached rows }
+            - report: fetch_engine.FetchReport with per-ticker timing/failures.
+    """
+    provider = provider or _default_provider()
+    fetcher = fetch_engine.ConcurrentFetcher(provider, **engine_options)
+
+    added = {ticker: 0 for ticker in tickers}
+    windows = {}
+    for ticker in tickers:
+        window = missing_range(ticker, end)
+        if window is not None:
+            windows[ticker] = window
+
+    # Empty results (holidays/weekends) are simply absent from data_map
+    data_map, report = fetcher.fetch(windows)
+
+    # Cache writes stay sequential: one writer per ticker file
+    for ticker, df in data_map.items():
+        added[ticker] = data_persistence.append_to_cache(ticker, df)
+
+    return added, report
+
 if __name__ == "__main__":
     # verification execution
     data = fetch_historical_data()
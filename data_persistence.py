@@ -3,46 +3,330 @@ DATA PERSISTENCE LAYER
 ----------------------
 This module implements the deterministic local caching of historical data.
 It serves as the single source of truth for runtime execution.
+
+Two on-disk formats are kept side by side:
+- CSV (data/cache/<ticker>.csv): human-readable export, the canonical artifact.
+- Columnar (data/cache/columnar/<ticker>/): one raw .npy file per column plus
+  the date index, memory-mapped zero-copy by load_from_cache.
+The columnar copy is rebuilt automatically whenever its source CSV changes.
+
+pandas is imported inside the loaders only, so cache metadata checks
+(paths, signatures, freshness) stay cheap at CLI startup.
 """
 
 import os
-import pandas as pd
+import json
+import numpy as np
 
 CACHE_DIR = "data/cache"
+COLUMNAR_SUBDIR = "columnar"
+MANIFEST_FILE = "manifest.json"
+INDEX_FILE = "index.npy"
+
+def _csv_path(ticker):
+    return os.path.join(CACHE_DIR, f"{ticker}.csv")
+
+def _columnar_path(ticker):
+    return os.path.join(CACHE_DIR, COLUMNAR_SUBDIR, ticker)
+
+def _csv_signature(file_path):
+    """Size and mtime of the CSV, used to detect a stale columnar copy."""
+    stat = os.stat(file_path)
+    return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+def _save_array(file_path, array):
+    """
+    Writes an .npy file via rename so live memory maps of the old file stay valid.
+    """
+    # Per-process temp name: concurrent writers of one ticker must not share it
+    tmp_path = f"{file_path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        np.save(f, array)
+    os.replace(tmp_path, file_path)
+
+def _save_text(file_path, write):
+    """
+    Writes a text file (CSV, manifest) via rename: readers see the old or the
+    new file, never a partial one.
+
+    Args:
+        file_path (str): Destination.
+        write (callable): write(f) fills the open temp file.
+    """
+    tmp_path = f"{file_path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", newline="") as f:
+        write(f)
+    os.replace(tmp_path, file_path)
+
+def _save_manifest(ticker, manifest):
+    _save_text(os.path.join(_columnar_path(ticker), MANIFEST_FILE), lambda f: json.dump(manifest, f, indent=2))
+
+def _flatten_columns(df):
+    import pandas as pd
+    if isinstance(df.columns, pd.MultiIndex):
+        df.columns = df.columns.get_level_values(0)
 
 def save_to_cache(ticker, df):
     """
-    Saves raw OHLCV data to a fixed local CSV file.
-    
+    Saves raw OHLCV data to a fixed local CSV file and its columnar copy.
+
     Args:
         ticker (str): The stock ticker (e.g., RELIANCE.NS).
         df (pd.DataFrame): The raw data to persist.
     """
     # Ensure cache directory exists
     os.makedirs(CACHE_DIR, exist_ok=True)
-    
+
     # Fixed file path: data/cache/<ticker>.csv
-    file_path = os.path.join(CACHE_DIR, f"{ticker}.csv")
-    
+    file_path = _csv_path(ticker)
+
     # Flatten MultiIndex columns if present (common with yfinance)
-    if isinstance(df.columns, pd.MultiIndex):
-        df.columns = df.columns.get_level_values(0)
-    
+    _flatten_columns(df)
+
     # Save as human-readable CSV, no compression
-    df.to_csv(file_path)
+    _save_text(file_path, df.to_csv)
 
-def load_from_cache(ticker):
+    # Binary columnar copy for fast runtime loads
+    _write_columnar(ticker, df, _csv_signature(file_path))
+
+def _write_columnar(ticker, df, source):
+    """
+    Writes one .npy file per column plus the date index.
+
+    Only numeric frames are converted; anything else stays CSV-only.
+
+    Returns:
+        bool: True if the columnar copy was written.
+    """
+    if not all(np.issubdtype(dtype, np.number) for dtype in df.dtypes):
+        return False
+
+    target = _columnar_path(ticker)
+    os.makedirs(target, exist_ok=True)
+
+    # Invalidate the old copy first: while columns are replaced one by one,
+    # readers must fall back to the CSV rather than mix old and new columns
+    try:
+        os.remove(os.path.join(target, MANIFEST_FILE))
+    except FileNotFoundError:
+        pass
+
+    # Positional file names: column labels may not be valid file names
+    columns = []
+    for i, name in enumerate(df.columns):
+        file_name = f"col_{i}.npy"
+        _save_array(os.path.join(target, file_name), np.ascontiguousarray(df[name].to_numpy()))
+        columns.append({"name": str(name), "file": file_name})
+
+    _save_array(os.path.join(target, INDEX_FILE), df.index.to_numpy())
+
+    # Manifest is written last (atomically) so a partial conversion is never considered valid
+    _save_manifest(ticker, {
+        "index_name": df.index.name,
+        "columns": columns,
+        "source": source
+    })
+    return True
+
+def _read_manifest(ticker):
+    manifest_path = os.path.join(_columnar_path(ticker), MANIFEST_FILE)
+    try:
+        with open(manifest_path, "r") as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+def _load_csv(ticker):
+    # Load with date parsing for index
+    # Assumes standard yfinance CSV format where Date is the index/first column
+    import pandas as pd
+    return pd.read_csv(_csv_path(ticker), index_col=0, parse_dates=True)
+
+def _load_columnar(ticker, manifest, mmap=True):
+    import pandas as pd
+    target = _columnar_path(ticker)
+    mode = "r" if mmap else None
+
+    index = np.load(os.path.join(target, INDEX_FILE), mmap_mode=mode)
+    data = {
+        col["name"]: np.load(os.path.join(target, col["file"]), mmap_mode=mode)
+        for col in manifest["columns"]
+    }
+
+    # copy=False keeps every column backed by its memory-mapped file
+    return pd.DataFrame(
+        data,
+        index=pd.Index(index, name=manifest["index_name"]),
+        copy=False
+    )
+
+def load_from_cache(ticker, mmap=True):
     """
     Loads raw OHLCV data from the fixed local cache.
-    
+
+    Reads the columnar copy when it is up to date with the CSV. Otherwise the
+    CSV is parsed once and converted, so later loads skip CSV parsing.
+
     Args:
         ticker (str): The stock ticker to load.
-        
+        mmap (bool): Memory-map columns read-only instead of reading them into RAM.
+
     Returns:
         pd.DataFrame: The loaded raw data.
     """
-    file_path = os.path.join(CACHE_DIR, f"{ticker}.csv")
-    
-    # Load with date parsing for index
-    # Assumes standard yfinance CSV format where Date is the index/first column
-    return pd.read_csv(file_path, index_col=0, parse_dates=True)
+    file_path = _csv_path(ticker)
+    manifest = _read_manifest(ticker)
+
+    if manifest is not None:
+        # CSV is the canonical artifact: a missing or edited CSV invalidates the copy
+        if not os.path.exists(file_path) or manifest["source"] == _csv_signature(file_path):
+            return _load_columnar(ticker, manifest, mmap=mmap)
+
+    # One-time conversion of a legacy (or hand-edited) CSV
+    df = _load_csv(ticker)
+    _write_columnar(ticker, df, _csv_signature(file_path))
+    return df
+
+def _columnar_index(ticker):
+    """Memory-mapped date index of an up-to-date columnar copy, or None."""
+    manifest = _read_manifest(ticker)
+    file_path = _csv_path(ticker)
+    if manifest is not None and (not os.path.exists(file_path) or manifest["source"] == _csv_signature(file_path)):
+        return np.load(os.path.join(_columnar_path(ticker), INDEX_FILE), mmap_mode="r")
+    return None
+
+def last_cached_date(ticker):
+    """
+    Returns the most recent cached date for a ticker.
+
+    Only the date index is read (the columnar index.npy, or the CSV's first
+    column when there is no up-to-date columnar copy), so this is cheap even
+    for long histories and never converts the CSV.
+
+    Args:
+        ticker (str): The stock ticker to inspect.
+
+    Returns:
+        pd.Timestamp or None: Last cached date, or None if nothing is cached.
+    """
+    import pandas as pd
+
+    index = _columnar_index(ticker)
+    if index is None:
+        if not os.path.exists(_csv_path(ticker)):
+            return None
+        index = pd.read_csv(_csv_path(ticker), usecols=[0], index_col=0, parse_dates=True).index
+
+    if len(index) == 0:
+        return None
+    return pd.Index(index).max()
+
+def cached_through(ticker):
+    """
+    Last cached trading day, without loading the frame when possible.
+
+    With an up-to-date columnar copy only the memory-mapped date index is
+    touched (no pandas import).
+
+    Returns:
+        np.datetime64 or None: Last cached date (day precision), or None if nothing is cached.
+    """
+    index = _columnar_index(ticker)
+    if index is not None and index.dtype.kind == "M":
+        return index.max().astype("datetime64[D]") if len(index) else None
+
+    last = last_cached_date(ticker)
+    return None if last is None else np.datetime64(last.date(), "D")
+
+def has_business_days(start, end) -> bool:
+    """True if a weekday lies in [start, end) (dates as YYYY-MM-DD or datetime64)."""
+    start, end = np.datetime64(start, "D"), np.datetime64(end, "D")
+    return start < end and np.busday_count(start, end) > 0
+
+def is_fresh(ticker, end) -> bool:
+    """
+    Whether the cache already covers every business day before `end`.
+
+    Args:
+        ticker (str): The stock ticker.
+        end (str): Exclusive end of the window (YYYY-MM-DD).
+
+    Returns:
+        bool: False if nothing is cached or a weekday is missing.
+    """
+    last = cached_through(ticker)
+    return last is not None and not has_business_days(last + 1, end)
+
+def append_to_cache(ticker, df):
+    """
+    Append-merges new rows into the cached history.
+
+    Rows are deduplicated on the date index; on overlap the newly fetched
+    row wins, since providers may revise the most recent candle.
+
+    Args:
+        ticker (str): The stock ticker (e.g., RELIANCE.NS).
+        df (pd.DataFrame): Newly fetched raw data.
+
+    Returns:
+        int: Number of dates that were not cached before.
+    """
+    _flatten_columns(df)
+
+    if not os.path.exists(_csv_path(ticker)) and _read_manifest(ticker) is None:
+        save_to_cache(ticker, df)
+        return len(df)
+
+    # Read into RAM: the memory-mapped files are about to be replaced
+    cached = load_from_cache(ticker, mmap=False)
+    added = len(df.index.difference(cached.index))
+
+    import pandas as pd
+    merged = pd.concat([cached, df[cached.columns]])
+    merged = merged[~merged.index.duplicated(keep="last")].sort_index()
+    merged.index.name = cached.index.name
+
+    save_to_cache(ticker, merged)
+    return added
+
+def convert_cache():
+    """
+    Converts every CSV in the cache directory to the columnar format.
+
+    Returns:
+        list: Tickers whose columnar copy was (re)built.
+    """
+    converted = []
+    if not os.path.isdir(CACHE_DIR):
+        return converted
+
+    for file_name in sorted(os.listdir(CACHE_DIR)):
+        if not file_name.endswith(".csv"):
+            continue
+        ticker = file_name[:-len(".csv")]
+        manifest = _read_manifest(ticker)
+        signature = _csv_signature(_csv_path(ticker))
+        if manifest is not None and manifest["source"] == signature:
+            continue
+        if _write_columnar(ticker, _load_csv(ticker), signature):
+            converted.append(ticker)
+
+    return converted
+
+def export_csv(ticker):
+    """
+    Re-exports the human-readable CSV from the columnar copy.
+
+    Args:
+        ticker (str): The stock ticker to export.
+    """
+    manifest = _read_manifest(ticker)
+    if manifest is None:
+        raise FileNotFoundError(f"No columnar cache for {ticker}")
+
+    df = _load_columnar(ticker, manifest, mmap=True)
+    _save_text(_csv_path(ticker), df.to_csv)
+
+    # The fresh CSV is identical in content, so only the signature moves
+    manifest["source"] = _csv_signature(_csv_path(ticker))
+    _save_manifest(ticker, manifest)
@@ -5,9 +5,14 @@ This module implements the deterministic cleaning of cached market data.
 It prepares the data for analysis without altering the raw cache.
 """
 
+import numpy as np
 import pandas as pd
+from panel import Panel
 
-def clean_data(df):
+# Compact mode: floats are stored as float32, integer columns (Volume) keep int64
+COMPACT_FLOAT = np.float32
+
+def clean_data(df, compact=False):
     """
     Cleans the raw OHLCV data for deterministic simulation.
     
@@ -18,11 +23,17 @@ def clean_data(df):
     - No smoothing or imputation.
     
     Args:
-        df (pd.DataFrame): The raw dataframe loaded from cache.
+        df (pd.DataFrame or Panel): The raw data loaded from cache.
+        compact (bool): Low-memory mode (see clean_data_compact).
         
     Returns:
-        pd.DataFrame: The cleaned and prepared dataframe.
+        pd.DataFrame or Panel: The cleaned and prepared data.
     """
+    if isinstance(df, Panel):
+        return clean_panel(df)
+    if compact:
+        return clean_data_compact(df)
+
     # 1. Sort strictly by date (index)
     df = df.sort_index(ascending=True)
     
@@ -37,3 +48,67 @@ def clean_data(df):
     df = df.dropna()
     
     return df
+
+def clean_data_compact(df):
+    """
+    clean_data in one pass, with float columns stored as float32.
+    
+    Same rows and columns as clean_data, but no intermediate frames: the
+    valid rows are selected once and every column is cast and gathered
+    straight into the output. Daily_Return is computed from the float64
+    closes and only then rounded to float32.
+    
+    Args:
+        df (pd.DataFrame): The raw dataframe loaded from cache.
+        
+    Returns:
+        pd.DataFrame: Cleaned dataframe (float32 prices/returns, int64 volume).
+    """
+    # 1. Sort only if needed (the cache is already in date order)
+    if not df.index.is_monotonic_increasing:
+        df = df.sort_index(ascending=True)
+    
+    # 2. Rows without missing values; the first one has no return
+    valid = np.flatnonzero(df.notna().to_numpy().all(axis=1))
+    close = df['Close'].to_numpy(dtype=np.float64)[valid]
+    keep = valid[1:]
+    
+    # 3. Gather each column once, casting floats to float32 first
+    columns = {}
+    for name in df.columns:
+        values = df[name].to_numpy()
+        if values.dtype.kind == 'f':
+            values = values.astype(COMPACT_FLOAT, copy=False)
+        columns[name] = values[keep]
+    
+    # 4. Simple % change of Close (rows are already consecutive valid rows)
+    columns['Daily_Return'] = (close[1:] / close[:-1] - 1).astype(COMPACT_FLOAT)
+    
+    return pd.DataFrame(columns, index=df.index[keep], copy=False)
+
+def clean_panel(panel):
+    """
+    clean_data for every ticker of a Panel at once.
+    
+    Rows with a missing field leave the mask, Daily_Return is the % change
+    between each ticker's consecutive usable rows (computed on the compacted
+    Close column), and each ticker's first usable row is dropped.
+    
+    Args:
+        panel (Panel): Raw panel (Panel.from_cache).
+        
+    Returns:
+        Panel: Same calendar, with a 'Daily_Return' field and the cleaned mask.
+    """
+    # 1. Remove rows with any original missing values (calendar is already sorted)
+    valid = panel.mask & ~np.isnan(panel.values).any(axis=2)
+    
+    # 2. Daily returns over each ticker's own consecutive valid rows
+    order, counts = panel.compaction(valid)
+    close = panel.compact(panel.field('Close'), order, counts)
+    returns = np.full(close.shape, np.nan)
+    returns[1:] = close[1:] / close[:-1] - 1
+    returns = panel.scatter(returns, order, counts)
+    
+    # 3. Drop rows without a return (each ticker's first row)
+    return panel.with_fields({'Daily_Return': returns}, valid & ~np.isnan(returns))
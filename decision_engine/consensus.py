@@ -66,3 +66,62 @@ def compute_disagreement(agent_outputs: dict) -> float:
     # So raw STD is effectively [0, 1].
     
     return float(std_dev)
+
+def weight_vector(names) -> np.ndarray:
+    """
+    AGENT_WEIGHTS as a vector aligned with a matrix's agent columns.
+    
+    Args:
+        names: Agent names in column order (e.g. execution.AGENT_ORDER).
+        
+    Returns:
+        np.ndarray: Base weights, shape (len(names),).
+    """
+    return np.array([AGENT_WEIGHTS.get(name, 1.0) for name in names])
+
+def compute_consensus_batch(signals: np.ndarray, confidences: np.ndarray, names) -> np.ndarray:
+    """
+    Computes compute_consensus for every row of a (rows x agents) matrix.
+    
+    Bit-identical to the scalar function: the per-row sums are accumulated
+    left to right in column order, exactly like the scalar loop.
+    
+    Args:
+        signals: Signal matrix, agents on the last axis.
+        confidences: Confidence matrix, same shape.
+        names: Agent names in column order.
+        
+    Returns:
+        np.ndarray: Consensus Scores [-1.0, 1.0], one per row.
+    """
+    final_weights = weight_vector(names) * confidences
+    
+    # add.accumulate is strictly sequential (a plain sum may reorder)
+    weighted_sum = np.add.accumulate(signals * final_weights, axis=-1)[..., -1]
+    total_weight = np.add.accumulate(final_weights, axis=-1)[..., -1]
+    
+    # Zero total weight (all confidences 0) -> neutral 0.0, without dividing by zero
+    consensus = np.divide(
+        weighted_sum, total_weight,
+        out=np.zeros_like(weighted_sum),
+        where=total_weight != 0
+    )
+    
+    # Clamp safety
+    return np.maximum(-1.0, np.minimum(1.0, consensus))
+
+def compute_disagreement_batch(signals: np.ndarray) -> np.ndarray:
+    """
+    Computes compute_disagreement for every row of a (rows x agents) matrix.
+    
+    Args:
+        signals: Signal matrix, agents on the last axis.
+        
+    Returns:
+        np.ndarray: Disagreement Index [0.0, 1.0] (Normalized STD), one per row.
+    """
+    if signals.shape[-1] == 0:
+        return np.zeros(signals.shape[:-1])
+    
+    # Same reduction as np.std on each row's signal list
+    return np.std(signals, axis=-1)
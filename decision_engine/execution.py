@@ -5,6 +5,8 @@ Executes all agents independently and collects their outputs.
 No aggregation or interaction here.
 """
 
+import numpy as np
+import instrumentation
 from agents.structure_agent import StructureAgent
 from agents.risk_agent import RiskAgent
 from agents.sentiment_agent import SentimentAgent
@@ -31,39 +33,82 @@ if len(AGENTS) != EXPECTED_AGENT_COUNT:
 if set(AGENTS.keys()) != EXPECTED_AGENTS:
     raise RuntimeError(f"Architecture Violation: Agent set must be {EXPECTED_AGENTS}. Found {set(AGENTS.keys())}.")
 
-def execute_agents(feature_row: dict) -> dict:
+# Deterministic iteration order by sorting keys (column order of batch matrices)
+AGENT_ORDER = tuple(sorted(AGENTS.keys()))
+
+# Instrumentation span per agent (built once, not per call)
+_AGENT_SPANS = {name: f"agent.{name}" for name in AGENT_ORDER}
+
+def _check_contract(signals, confidences):
     """
-    Executes all agents on the given feature row.
+    Interface contract check over a whole batch in one vectorized pass.
+
+    Raises:
+        ValueError: On the first agent/value outside its range.
+    """
+    bad_signal = ~((signals >= -1.0) & (signals <= 1.0))
+    if bad_signal.any():
+        idx = np.argwhere(bad_signal)[0]
+        raise ValueError(f"Agent {AGENT_ORDER[idx[-1]]} violated signal range constraints[-1, 1]: {signals[tuple(idx)]}")
+
+    bad_confidence = ~((confidences >= 0.0) & (confidences <= 1.0))
+    if bad_confidence.any():
+        idx = np.argwhere(bad_confidence)[0]
+        raise ValueError(f"Agent {AGENT_ORDER[idx[-1]]} violated confidence range constraints [0, 1]: {confidences[tuple(idx)]}")
+
+def execute_agents_batch(features: dict) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Executes all agents on whole feature columns.
     
     Args:
-        feature_row (dict): Engineered features.
+        features (dict): { 'FeatureName': np.ndarray } of equal shape.
         
     Returns:
-        dict: { 'AgentName': (signal, confidence) }
+        tuple: (signals, confidences), each of shape features.shape + (5,)
+               with the last axis in AGENT_ORDER.
         
     Raises:
+        ValueError: If any agent violates its output range.
         RuntimeError: If execution fails to return results for all mandatory agents.
     """
-    results = {}
+    signals = []
+    confidences = []
     
-    # Deterministic Iteration Order by sorting keys (though constant dict is usually ordered in modern global python, relying on sort is safer for determinism)
-    sorted_names = sorted(AGENTS.keys())
-    
-    for name in sorted_names:
-        agent = AGENTS[name]
-        # Isolation Check: Agent receives ONLY feature_row
-        signal, confidence = agent.evaluate(feature_row)
-        
-        # Interface Contract Check
-        if not (-1.0 <= signal <= 1.0):
-             raise ValueError(f"Agent {name} violated signal range constraints[-1, 1]: {signal}")
-        if not (0.0 <= confidence <= 1.0):
-             raise ValueError(f"Agent {name} violated confidence range constraints [0, 1]: {confidence}")
-             
-        results[name] = (signal, confidence)
+    for name in AGENT_ORDER:
+        # Isolation Check: Agent receives ONLY the features
+        with instrumentation.span(_AGENT_SPANS[name]):
+            signal, confidence = AGENTS[name].evaluate_batch(features)
+        signals.append(signal)
+        confidences.append(confidence)
         
+    signals = np.stack(signals, axis=-1)
+    confidences = np.stack(confidences, axis=-1)
+    
     # Participation Check
-    if len(results) != EXPECTED_AGENT_COUNT:
+    if signals.shape[-1] != EXPECTED_AGENT_COUNT:
         raise RuntimeError("Architecture Violation: Not all agents executed successfully.")
+    
+    # Interface Contract Check (single pass over the batch)
+    _check_contract(signals, confidences)
         
-    return results
+    return signals, confidences
+
+def execute_agents(feature_row: dict) -> dict:
+    """
+    Executes all agents on the given feature row.
+    
+    Args:
+        feature_row (dict): Engineered features.
+        
+    Returns:
+        dict: { 'AgentName': (signal, confidence) }
+        
+    Raises:
+        RuntimeError: If execution fails to return results for all mandatory agents.
+    """
+    signals, confidences = execute_agents_batch(feature_row)
+    
+    return {
+        name: (float(signals[0, i]), float(confidences[0, i]))
+        for i, name in enumerate(AGENT_ORDER)
+    }
@@ -0,0 +1,172 @@
+"""
+FEATURE BANK
+------------
+Rolling statistics over many windows at once, in linear time.
+
+    bank = compute_bank({'Close': close}, windows=(5, 10, 20, 50, 100, 200),
+                        statistics=('mean', 'std', 'max', 'zscore', 'drawdown'))
+    bank['Close_zscore_20D']
+
+Each input series is preprocessed once: a prefix count of NaNs, run
+lengths of repeated values and, if any max-based statistic is requested,
+one sparse table covering the largest window. Means and variances come
+from feature_kernels.window_moments, once per window and shared by mean,
+std, zscore and trend; its block-local sums keep full precision when a
+series' level moves by orders of magnitude. Every (statistic, window)
+pair is then a single O(n) array expression, so the total cost is
+O(n x log(max window) + n x windows x statistics), independent of the
+window lengths.
+
+Statistics follow pandas rolling(window) semantics (see feature_kernels).
+The four compute_features columns are the CORE_FEATURES preset.
+"""
+
+import numpy as np
+
+import feature_kernels
+
+STATISTICS = ('mean', 'std', 'max', 'zscore', 'drawdown', 'trend')
+
+DEFAULT_WINDOWS = (5, 10, 20, 50, 100, 200)
+
+VOLATILITY_WINDOW = 20
+DRAWDOWN_WINDOW = 20
+TREND_WINDOW = 50
+VOLUME_WINDOW = 20
+
+# Preset: (output column, input column, statistic, window)
+CORE_FEATURES = (
+    ('Volatility_20D', 'Daily_Return', 'std', VOLATILITY_WINDOW),
+    ('Drawdown_20D', 'Close', 'drawdown', DRAWDOWN_WINDOW),
+    ('Trend_Strength_50D', 'Close', 'trend', TREND_WINDOW),
+    ('Volume_Anomaly_20D', 'Volume', 'zscore', VOLUME_WINDOW),
+)
+
+FEATURE_COLUMNS = tuple(spec[0] for spec in CORE_FEATURES)
+
+class SeriesBank:
+    """
+    Shared per-series state for any number of windowed statistics.
+
+    Statistics:
+    - mean / std:  rolling mean and std (ddof=1).
+    - max:         rolling maximum.
+    - zscore:      (x - mean) / std, NaN where std is 0.
+    - drawdown:    x / max - 1.
+    - trend:       (x - mean) / mean.
+
+    Args:
+        values (array-like): 1D or 2D (dates x series), ascending dates.
+        max_windows (iterable, optional): Windows that will query `max`;
+            more than one builds a sparse table instead of per-window passes.
+    """
+
+    def __init__(self, values, max_windows=()):
+        self.shape = np.shape(values)
+        self.x = feature_kernels.as_2d(values)
+        missing = np.isnan(self.x)
+        # Clean series (the common case) skip the NaN count and run lengths
+        self.missing = feature_kernels.prefix_sums(missing.astype(np.float64)) if missing.any() else None
+        self.runs = feature_kernels.run_lengths(self.x) if feature_kernels.has_repeats(self.x) else None
+        max_windows = sorted(set(max_windows))
+        self._table = feature_kernels.SparseMax(self.x, max_windows[-1]) if len(max_windows) > 1 else None
+        self._cache = {}
+
+    def _finish(self, window, values, constant_value):
+        """Applies the same-value rule and NaN windows."""
+        if self.runs is not None:
+            values = np.where(self.runs >= window, constant_value, values)
+        if self.missing is not None:
+            values[feature_kernels.window_diff(self.missing, window) != 0] = np.nan
+        return values
+
+    def _memo(self, statistic, window, func):
+        key = (statistic, window)
+        if key not in self._cache:
+            self._cache[key] = func(window)
+        return self._cache[key]
+
+    def _moments(self, window):
+        # (mean, M2) before the same-value and NaN rules
+        return self._memo('moments', window, lambda w: feature_kernels.window_moments(self.x, w))
+
+    def mean(self, window):
+        return self._memo('mean', window, lambda w: self._finish(w, self._moments(w)[0].copy(), self.x))
+
+    def std(self, window):
+        def compute(w):
+            var = self._moments(w)[1] / (w - 1)
+            np.maximum(var, 0.0, out=var)
+            return self._finish(w, np.sqrt(var, out=var), 0.0)
+        return self._memo('std', window, compute)
+
+    def max(self, window):
+        def compute(w):
+            if self._table is not None:
+                return feature_kernels.as_2d(self._table.rolling_max(w))
+            return feature_kernels.as_2d(feature_kernels.rolling_max(self.x, w))
+        return self._memo('max', window, compute)
+
+    def zscore(self, window):
+        std = self.std(window)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return (self.x - self.mean(window)) / np.where(std == 0, np.nan, std)
+
+    def drawdown(self, window):
+        return self.x / self.max(window) - 1.0
+
+    def trend(self, window):
+        mean = self.mean(window)
+        return (self.x - mean) / mean
+
+    def compute(self, statistic, window):
+        """One statistic as an array shaped like the input."""
+        if statistic not in STATISTICS:
+            raise ValueError(f"Unknown statistic '{statistic}'; expected one of {STATISTICS}")
+        return getattr(self, statistic)(window).reshape(self.shape)
+
+def _max_windows(requests):
+    return [window for statistic, window in requests if statistic in ('max', 'drawdown')]
+
+def compute_bank(columns, windows=DEFAULT_WINDOWS, statistics=STATISTICS):
+    """
+    Every (column, statistic, window) combination.
+
+    Args:
+        columns (dict): { name: 1D or 2D array }, ascending dates.
+        windows (iterable): Window lengths in rows.
+        statistics (iterable): Names from STATISTICS.
+
+    Returns:
+        dict: { '<column>_<statistic>_<window>D': np.ndarray }
+    """
+    requests = [(statistic, window) for statistic in statistics for window in windows]
+    out = {}
+    for name, values in columns.items():
+        bank = SeriesBank(values, _max_windows(requests))
+        for statistic, window in requests:
+            out[f"{name}_{statistic}_{window}D"] = bank.compute(statistic, window)
+    return out
+
+def compute_preset(columns, preset=CORE_FEATURES, dtype=np.float64):
+    """
+    Named features from a preset of (output, input column, statistic, window).
+
+    Args:
+        columns (dict): { name: 1D or 2D array } holding every input column.
+        preset (tuple): Feature specs; defaults to the compute_features columns.
+        dtype: Output dtype; each feature is cast as soon as it is computed.
+
+    Returns:
+        dict: { output column: np.ndarray }
+    """
+    by_input = {}
+    for output, column, statistic, window in preset:
+        by_input.setdefault(column, []).append((output, statistic, window))
+
+    out = {}
+    for column, specs in by_input.items():
+        bank = SeriesBank(columns[column], _max_windows([(s, w) for _, s, w in specs]))
+        for output, statistic, window in specs:
+            out[output] = bank.compute(statistic, window).astype(dtype, copy=False)
+    return {output: out[output] for output, _, _, _ in preset}
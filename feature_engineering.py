@@ -5,10 +5,12 @@ This module implements the deterministic calculation of explainable features.
 These features are computed at runtime from cleaned data and are not persisted.
 """
 
-import pandas as pd
 import numpy as np
+import pandas as pd
+import feature_bank
+from panel import Panel
 
-def compute_features(df):
+def compute_features(df, compact=False):
     """
     Computes a fixed set of features for market analysis.
     
@@ -19,36 +21,114 @@ def compute_features(df):
     4. Volume_Anomaly_20D: (Volume - 20-day Mean Volume) / 20-day Std Volume.
     
     Args:
-        df (pd.DataFrame): Cleaned OHLCV data with 'Daily_Return'.
+        df (pd.DataFrame or Panel): Cleaned OHLCV data with 'Daily_Return'.
+        compact (bool): Low-memory mode (see compute_features_compact).
         
     Returns:
-        pd.DataFrame: DataFrame with added feature columns.
+        pd.DataFrame or Panel: Data with added feature columns.
     """
+    if isinstance(df, Panel):
+        return compute_features_panel(df)
+    if compact:
+        return compute_features_compact(df)
+
     # Work on a copy to avoid side effects
     df = df.copy()
     
-    # 1. Rolling Volatility (20D)
-    # Using 'Daily_Return' calculated in data cleaning
-    df['Volatility_20D'] = df['Daily_Return'].rolling(window=20).std()
+    # All four rolling features from the feature bank's CORE_FEATURES preset:
+    # 1. Volatility_20D from the 20-day std of 'Daily_Return' (data cleaning)
+    # 2. Drawdown_20D from the 20-day rolling high
+    # 3. Trend_Strength_50D: normalized deviation from the 50-day SMA
+    # 4. Volume_Anomaly_20D: 20-day z-score; zero std -> NaN (no division by zero)
+    features = feature_bank.compute_preset(
+        {column: df[column].to_numpy() for column in ('Close', 'Volume', 'Daily_Return')}
+    )
+    for column, values in features.items():
+        df[column] = values
     
-    # 2. Rolling Drawdown (20D)
-    # Drawdown from the 20-day rolling high
-    rolling_max = df['Close'].rolling(window=20).max()
-    df['Drawdown_20D'] = (df['Close'] / rolling_max) - 1.0
+    # Drop NaN rows generated by rolling windows (requires at least 50 days)
+    df = df.dropna()
     
-    # 3. Trend Strength (50D)
-    # Normalized deviation from 50-day SMA
-    sma_50 = df['Close'].rolling(window=50).mean()
-    df['Trend_Strength_50D'] = (df['Close'] - sma_50) / sma_50
+    return df
+
+def compute_features_compact(df):
+    """
+    compute_features without the defensive copy, with float32 features.
     
-    # 4. Volume Anomaly (20D Z-Score)
-    vol_mean_20 = df['Volume'].rolling(window=20).mean()
-    vol_std_20 = df['Volume'].rolling(window=20).std()
+    The features are computed in float64 (the kernels' prefix sums need it)
+    and stored as float32. No df.copy(), column-by-column assignment or
+    dropna copy: when the complete rows are one contiguous block (the usual
+    case: everything after the 50-day warm-up), the input columns and index
+    are returned as zero-copy views of df; otherwise they are gathered once.
     
-    # Avoid division by zero
-    df['Volume_Anomaly_20D'] = (df['Volume'] - vol_mean_20) / vol_std_20.replace(0, np.nan)
+    Args:
+        df (pd.DataFrame): Cleaned OHLCV data with 'Daily_Return'.
+        
+    Returns:
+        pd.DataFrame: Input columns plus float32 feature columns, complete rows only.
+    """
+    features = feature_bank.compute_preset(
+        {column: df[column].to_numpy() for column in ('Close', 'Volume', 'Daily_Return')},
+        dtype=np.float32
+    )
     
-    # Drop NaN rows generated by rolling windows (requires at least 50 days)
-    df = df.dropna()
+    # Rows dropna would keep (requires at least 50 days)
+    complete = df.notna().to_numpy().all(axis=1)
+    for values in features.values():
+        complete &= ~np.isnan(values)
+    keep = np.flatnonzero(complete)
+    if len(keep) and keep[-1] - keep[0] + 1 == len(keep):
+        keep = slice(keep[0], keep[-1] + 1)
     
-    return df
+    # Row slices are copy-on-write views of df; a row gather copies once
+    out = df.iloc[keep]
+    for column, values in features.items():
+        out[column] = values[keep]
+    
+    return out
+
+def compute_features_panel(panel):
+    """
+    compute_features for every ticker of a cleaned Panel in one call.
+    
+    Each ticker's usable rows are compacted (rolling windows count rows,
+    not calendar days), the CORE_FEATURES preset runs on the dense
+    (rows x tickers) block, and the features are scattered back.
+    
+    Args:
+        panel (Panel): Output of data_processor.clean_data(panel).
+        
+    Returns:
+        Panel: Feature fields appended; the mask drops warm-up rows (dropna).
+    """
+    order, counts = panel.compaction()
+    dense = feature_bank.compute_preset({
+        column: panel.compact(panel.field(column), order, counts)
+        for column in ('Close', 'Volume', 'Daily_Return')
+    })
+    
+    features = {column: panel.scatter(values, order, counts) for column, values in dense.items()}
+    mask = panel.mask.copy()
+    for values in features.values():
+        mask &= ~np.isnan(values)
+    return panel.with_fields(features, mask)
+
+def compute_feature_bank(df, windows=feature_bank.DEFAULT_WINDOWS, statistics=feature_bank.STATISTICS,
+                         columns=('Close',)):
+    """
+    Research features: every statistic over every window, in linear time.
+    
+    Args:
+        df (pd.DataFrame): Cleaned OHLCV data (ascending dates).
+        windows (iterable): Window lengths in days.
+        statistics (iterable): Names from feature_bank.STATISTICS.
+        columns (iterable): Input columns.
+        
+    Returns:
+        pd.DataFrame: Columns '<column>_<statistic>_<window>D' on df's index
+                      (warm-up rows are NaN, nothing is dropped).
+    """
+    bank = feature_bank.compute_bank(
+        {column: df[column].to_numpy() for column in columns}, windows, statistics
+    )
+    return pd.DataFrame(bank, index=df.index)
@@ -0,0 +1,199 @@
+"""
+FEATURE KERNELS
+---------------
+NumPy rolling-window kernels behind the feature bank (feature_bank.py).
+
+Means and variances come from block-local prefix sums (window_moments),
+maxima from a van Herk / Gil-Werman sliding maximum or, for many windows
+at once, a sparse table; each costs O(n) regardless of the window length.
+Inputs may be 1D (one ticker) or 2D (dates x series), so a panel computes
+in one call.
+
+pandas rolling(window) semantics are reproduced:
+- NaN until the window is full, and for any window containing a NaN.
+- std with ddof=1, negative variance (rounding) clamped to 0.
+- A window holding one repeated value has exactly its mean and std 0.
+Because sums are centered per block of `window` rows, rounding error is
+relative to the values near each window rather than to the series' whole
+history, so a series whose level moves by orders of magnitude (volume
+growing 1e3 -> 1e9) keeps full precision. Ratios built on the moments
+(a z-score of a near-constant window, the trend near a zero crossing)
+are exact only to floating-point tolerance.
+"""
+
+import numpy as np
+
+def as_2d(x):
+    """float64 view of x as (dates x series); 1D input becomes one column."""
+    x = np.asarray(x, dtype=np.float64)
+    return x.reshape(len(x), -1)
+
+def prefix_sums(x):
+    """Cumulative sums over axis 0 with a leading zero row (shape n + 1)."""
+    c = np.zeros((x.shape[0] + 1,) + x.shape[1:])
+    np.cumsum(x, axis=0, out=c[1:])
+    return c
+
+def window_diff(prefix, window):
+    """
+    Trailing-window sums from prefix_sums output.
+
+    Returns:
+        np.ndarray: n rows; rows before the first full window are NaN.
+    """
+    n = prefix.shape[0] - 1
+    out = np.full((n,) + prefix.shape[1:], np.nan)
+    if n >= window:
+        out[window - 1:] = prefix[window:] - prefix[:-window]
+    return out
+
+def run_lengths(x):
+    """
+    Length of the run of identical values ending at each row (axis 0).
+
+    A trailing window holds one repeated value (pandas' same-value rule)
+    exactly where run_lengths(x) >= window.
+    """
+    n = x.shape[0]
+    changed = np.ones(x.shape, dtype=bool)
+    changed[1:] = x[1:] != x[:-1]
+    # Position of the last change at or before each row
+    rows = np.arange(n).reshape((n,) + (1,) * (x.ndim - 1))
+    last_change = np.where(changed, rows, 0)
+    np.maximum.accumulate(last_change, axis=0, out=last_change)
+    return rows - last_change + 1
+
+def has_repeats(x):
+    """True if any value equals the one before it (run_lengths would exceed 1)."""
+    return bool((x[1:] == x[:-1]).any())
+
+def window_moments(x, window):
+    """
+    Trailing-window mean and sum of squared deviations (M2) over axis 0.
+
+    Rows are split into blocks of `window` rows, each centered on its own
+    mean, with prefix sums restarting at every block. A window covers the
+    tail of one block and the head of the next; the moments of the two
+    parts come from their blocks' sums and are merged with the pairwise
+    (Chan et al.) update. Rounding therefore scales with the spread of the
+    values near the window, not with how far the series' level moves over
+    its whole history.
+
+    Args:
+        x (np.ndarray): 2D (dates x series) values; NaN rows are treated as
+            0 deviations, so windows containing them must be masked by the caller.
+        window (int): Window length.
+
+    Returns:
+        tuple: (mean, m2) arrays shaped like x; rows before the first full
+               window are NaN. The variance is m2 / (window - ddof).
+    """
+    n, k = x.shape
+    mean = np.full(x.shape, np.nan)
+    m2 = np.full(x.shape, np.nan)
+    if n < window:
+        return mean, m2
+
+    # 1. Per-block centers and restarted prefix sums of the deviations
+    blocks = -(-n // window)
+    padded = np.full((blocks * window, k), np.nan)
+    padded[:n] = x
+    padded = padded.reshape(blocks, window, k)
+    valid = ~np.isnan(padded)
+    count = valid.sum(axis=1)
+    center = np.where(valid, padded, 0.0).sum(axis=1) / np.maximum(count, 1)
+    dev = np.where(valid, padded - center[:, None, :], 0.0)
+    p1 = np.cumsum(dev, axis=1).reshape(-1, k)
+    p2 = np.cumsum(dev * dev, axis=1).reshape(-1, k)
+    t1 = p1[window - 1::window]
+    t2 = p2[window - 1::window]
+
+    # 2. Window [i - window + 1, i]: head of block b (rows up to i), tail of block b - 1
+    rows = np.arange(window - 1, n)
+    block = rows // window
+    n_head = (rows % window + 1.0)[:, None]
+    n_tail = window - n_head
+    prev_block = np.maximum(block - 1, 0)
+    prev_row = np.maximum(rows - window, 0)
+    has_tail = n_tail > 0
+
+    s1_head, s2_head = p1[rows], p2[rows]
+    s1_tail = np.where(has_tail, t1[prev_block] - p1[prev_row], 0.0)
+    s2_tail = np.where(has_tail, t2[prev_block] - p2[prev_row], 0.0)
+    tail_div = np.where(has_tail, n_tail, 1.0)
+
+    mean_head = center[block] + s1_head / n_head
+    mean_tail = center[prev_block] + s1_tail / tail_div
+    m2_head = s2_head - s1_head * s1_head / n_head
+    m2_tail = s2_tail - s1_tail * s1_tail / tail_div
+
+    # 3. Pairwise merge (a full-block window has no tail: delta is unused)
+    delta = np.where(has_tail, mean_tail - mean_head, 0.0)
+    mean[window - 1:] = mean_head + delta * (n_tail / window)
+    m2[window - 1:] = m2_head + m2_tail + delta * delta * (n_head * n_tail / window)
+    return mean, m2
+
+def rolling_max(x, window):
+    """
+    Rolling maximum over axis 0 (van Herk / Gil-Werman, O(n) for any window).
+
+    The series is split into blocks of `window` rows; each window's maximum
+    is max(suffix max of its first block, prefix max of its last block).
+
+    Returns:
+        np.ndarray: Shape of x; NaN before the first full window and for
+                    windows containing a NaN.
+    """
+    shape = np.shape(x)
+    x = as_2d(x)
+    n, k = x.shape
+    out = np.full(x.shape, np.nan)
+    if n < window:
+        return out.reshape(shape)
+
+    blocks = -(-n // window)
+    padded = np.full((blocks * window, k), -np.inf)
+    padded[:n] = x
+    padded = padded.reshape(blocks, window, k)
+
+    prefix = np.maximum.accumulate(padded, axis=1).reshape(-1, k)
+    suffix = np.maximum.accumulate(padded[:, ::-1], axis=1)[:, ::-1].reshape(-1, k)
+
+    out[window - 1:] = np.maximum(suffix[:n - window + 1], prefix[window - 1:n])
+    return out.reshape(shape)
+
+class SparseMax:
+    """
+    Sparse table of power-of-two block maxima over axis 0.
+
+    Built once in O(n log W); the rolling maximum for any window <= W is
+    then one O(n) query (max of two overlapping power-of-two blocks), so
+    many windows share one structure.
+
+    Args:
+        x (array-like): 1D or 2D (dates x series) values.
+        max_window (int): Largest window that will be queried.
+    """
+
+    def __init__(self, x, max_window):
+        self.shape = np.shape(x)
+        x = as_2d(x)
+        self.levels = [x]   # levels[j][i] = max(x[i : i + 2**j])
+        span = 1
+        while span * 2 <= max_window and span * 2 <= len(x):
+            prev = self.levels[-1]
+            self.levels.append(np.maximum(prev[:-span], prev[span:]))
+            span *= 2
+
+    def rolling_max(self, window):
+        """Trailing-window maximum, NaN-propagating like rolling_max()."""
+        n = self.levels[0].shape[0]
+        out = np.full(self.levels[0].shape, np.nan)
+        if n >= window:
+            j = window.bit_length() - 1
+            if j >= len(self.levels):
+                raise ValueError(f"Window {window} exceeds the table's max_window")
+            level = self.levels[j]
+            # Window [i - window + 1, i] = block at its start  U  block ending at i
+            out[window - 1:] = np.maximum(level[:n - window + 1], level[window - 2 ** j:n - 2 ** j + 1])
+        return out.reshape(self.shape)
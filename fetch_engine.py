@@ -0,0 +1,227 @@
+"""
+CONCURRENT FETCH ENGINE
+-----------------------
+Fetches many tickers through a MarketDataProvider in parallel.
+
+- Thread pool with a configurable concurrency limit.
+- Token-bucket rate limiting shared by all workers.
+- Retry with exponential backoff on provider errors.
+- Coalescing of tickers into batched provider calls when supported.
+- Per-ticker timing and failure stats.
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+
+# Engine Defaults
+DEFAULT_MAX_WORKERS = 4
+DEFAULT_RATE = 2.0          # Provider calls per second (steady state)
+DEFAULT_BURST = 4           # Calls allowed back-to-back before throttling
+DEFAULT_MAX_RETRIES = 3
+DEFAULT_BACKOFF = 0.5       # Seconds; doubled after every failed attempt
+DEFAULT_BATCH_SIZE = 20
+
+class TokenBucket:
+    """
+    Thread-safe token bucket. Refills at `rate` tokens per second up to `capacity`.
+
+    Capacity must hold at least one token: a bucket that can never hold a
+    request's tokens would block acquire() forever.
+    """
+
+    def __init__(self, rate: float, capacity: float, clock=time.monotonic, sleep=time.sleep):
+        if rate <= 0:
+            raise ValueError(f"Token bucket rate must be positive: {rate}")
+        if capacity < 1:
+            raise ValueError(f"Token bucket capacity must be >= 1: {capacity}")
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self._clock = clock
+        self._sleep = sleep
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def acquire(self, tokens: float = 1.0) -> float:
+        """
+        Blocks until `tokens` are available and consumes them.
+
+        Returns:
+            float: Seconds spent waiting.
+
+        Raises:
+            ValueError: If `tokens` exceeds the capacity (never satisfiable).
+        """
+        if tokens > self.capacity:
+            raise ValueError(f"Cannot acquire {tokens} tokens from a bucket of capacity {self.capacity}")
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = self._clock()
+                self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+                self._updated = now
+
+                if self.tokens >= tokens:
+                    self.tokens -= tokens
+                    return waited
+
+                deficit = (tokens - self.tokens) / self.rate
+
+            # Sleep outside the lock so other workers can refill/consume
+            self._sleep(deficit)
+            waited += deficit
+
+@dataclass
+class FetchStats:
+    """Outcome of fetching one ticker."""
+    ticker: str
+    attempts: int = 0
+    elapsed: float = 0.0        # Wall time of the provider call(s), incl. retries
+    throttled: float = 0.0      # Time spent waiting on the rate limiter
+    rows: int = 0
+    batch_size: int = 1
+    error: str = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+class FetchReport:
+    """
+    Per-ticker stats for one engine run.
+    """
+
+    def __init__(self):
+        self.stats = {}
+        self.provider_calls = 0
+        self.wall_time = 0.0
+
+    def failures(self) -> list:
+        return [s for s in self.stats.values() if not s.ok]
+
+    def summary(self) -> str:
+        stats = list(self.stats.values())
+        failed = self.failures()
+        lines = [
+            f"Fetched {len(stats) - len(failed)}/{len(stats)} tickers in {self.wall_time:.2f}s "
+            f"({self.provider_calls} provider calls)"
+        ]
+        for s in sorted(stats, key=lambda s: s.ticker):
+            status = "OK" if s.ok else f"FAILED: {s.error}"
+            lines.append(
+                f"  {s.ticker:<16} rows={s.rows:<6} attempts={s.attempts} "
+                f"batch={s.batch_size:<3} time={s.elapsed:.3f}s wait={s.throttled:.3f}s {status}"
+            )
+        return "\n".join(lines)
+
+class ConcurrentFetcher:
+    """
+    Fetches ticker windows concurrently through a provider.
+
+    Providers that set `supports_batch = True` receive coalesced
+    `fetch_batch(tickers, start, end)` calls for tickers sharing a window.
+    """
+
+    def __init__(self, provider, max_workers=DEFAULT_MAX_WORKERS, rate=DEFAULT_RATE,
+                 burst=DEFAULT_BURST, max_retries=DEFAULT_MAX_RETRIES,
+                 backoff=DEFAULT_BACKOFF, batch_size=DEFAULT_BATCH_SIZE, sleep=time.sleep):
+        if max_workers < 1:
+            raise ValueError(f"max_workers must be >= 1: {max_workers}")
+        self.provider = provider
+        self.max_workers = max_workers
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.batch_size = max(1, batch_size)
+        self.bucket = TokenBucket(rate, burst, sleep=sleep)
+        self._sleep = sleep
+
+    def _plan(self, windows: dict) -> list:
+        """
+        Groups tickers into provider calls: [(tickers, start, end), ...].
+        """
+        if not getattr(self.provider, "supports_batch", False):
+            return [([ticker], start, end) for ticker, (start, end) in windows.items()]
+
+        # Coalesce tickers that request the same window
+        groups = {}
+        for ticker, window in windows.items():
+            groups.setdefault(window, []).append(ticker)
+
+        tasks = []
+        for (start, end), tickers in groups.items():
+            for i in range(0, len(tickers), self.batch_size):
+                tasks.append((tickers[i:i + self.batch_size], start, end))
+        return tasks
+
+    def _call(self, tickers, start, end) -> dict:
+        if len(tickers) == 1 and not getattr(self.provider, "supports_batch", False):
+            return {tickers[0]: self.provider.fetch(tickers[0], start, end)}
+        return self.provider.fetch_batch(tickers, start, end)
+
+    def _run_task(self, tickers, start, end):
+        stats = {t: FetchStats(ticker=t, batch_size=len(tickers)) for t in tickers}
+        started = time.perf_counter()
+        calls = 0
+
+        for attempt in range(self.max_retries + 1):
+            throttled = self.bucket.acquire()
+            for s in stats.values():
+                s.attempts += 1
+                s.throttled += throttled
+
+            calls += 1
+            try:
+                frames = self._call(tickers, start, end)
+                break
+            except Exception as e:
+                error = f"{type(e).__name__}: {e}"
+                if attempt < self.max_retries:
+                    self._sleep(self.backoff * (2 ** attempt))
+        else:
+            frames = {}
+            for s in stats.values():
+                s.error = error
+
+        elapsed = time.perf_counter() - started
+        for ticker, s in stats.items():
+            s.elapsed = elapsed
+            df = frames.get(ticker)
+            if df is not None:
+                s.rows = len(df)
+
+        return frames, stats, calls
+
+    def fetch(self, windows: dict):
+        """
+        Fetches every requested window.
+
+        Args:
+            windows (dict): { 'Ticker': (start, end) }
+
+        Returns:
+            tuple: (data_map, report)
+                - data_map: { 'Ticker': pd.DataFrame } for non-empty results.
+                - report: FetchReport with per-ticker stats.
+        """
+        report = FetchReport()
+        data_map = {}
+        started = time.perf_counter()
+
+        tasks = self._plan(windows)
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            futures = [pool.submit(self._run_task, *task) for task in tasks]
+            for future in futures:
+                frames, stats, calls = future.result()
+                report.stats.update(stats)
+                report.provider_calls += calls
+                for ticker, df in frames.items():
+                    if df is not None and not df.empty:
+                        data_map[ticker] = df
+
+        report.wall_time = time.perf_counter() - started
+
+        # Deterministic ordering regardless of completion order
+        data_map = {t: data_map[t] for t in windows if t in data_map}
+        return data_map, report
@@ -0,0 +1,290 @@
+"""
+INCREMENTAL FEATURE ENGINE
+--------------------------
+Streaming counterpart of data_processor.clean_data + feature_engineering.compute_features.
+
+Each new daily bar updates all four features in O(1):
+- Volatility_20D / Volume_Anomaly_20D: sliding Welford mean/variance.
+- Trend_Strength_50D: running (compensated) sum for the 50-day SMA.
+- Drawdown_20D: monotonic deque for the 20-day rolling max.
+
+Rows that the batch path would drop (missing values, warm-up, zero volume
+std) yield None. The state is plain JSON so it survives restarts.
+"""
+
+import json
+import math
+from collections import deque
+import pandas as pd
+
+from feature_bank import VOLATILITY_WINDOW, DRAWDOWN_WINDOW, TREND_WINDOW, VOLUME_WINDOW
+
+PRICE_COLUMNS = ('Close', 'High', 'Low', 'Open', 'Volume')
+
+class RollingMoments:
+    """
+    Fixed-size window mean/std via sliding Welford updates.
+
+    Mirrors pandas rolling(window).std() (ddof=1): NaN until the window is
+    full, negative variance clamped to 0, and exactly 0 when the whole window
+    holds one repeated value.
+    """
+
+    def __init__(self, window):
+        self.window = window
+        self.values = deque()
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.same_count = 0       # Length of the current run of identical values
+
+    def push(self, x):
+        if self.values and x == self.values[-1]:
+            self.same_count += 1
+        else:
+            self.same_count = 1
+
+        self.values.append(x)
+        n = len(self.values)
+        delta = x - self.mean
+        self.mean += delta / n
+        self.m2 += delta * (x - self.mean)
+
+        if n > self.window:
+            old = self.values.popleft()
+            n -= 1
+            delta = old - self.mean
+            self.mean -= delta / n
+            self.m2 -= delta * (old - self.mean)
+
+    @property
+    def full(self):
+        return len(self.values) == self.window
+
+    def std(self):
+        if not self.full or self.window < 2:
+            return math.nan
+        if self.same_count >= self.window:
+            return 0.0
+        return math.sqrt(max(0.0, self.m2 / (self.window - 1)))
+
+    def to_dict(self):
+        return {"values": list(self.values), "mean": self.mean, "m2": self.m2, "same_count": self.same_count}
+
+    def load(self, state):
+        self.values = deque(state["values"])
+        self.mean = state["mean"]
+        self.m2 = state["m2"]
+        self.same_count = state["same_count"]
+
+class RollingSum:
+    """
+    Fixed-size window sum with Kahan compensation (pandas-style rolling mean).
+    """
+
+    def __init__(self, window):
+        self.window = window
+        self.values = deque()
+        self.total = 0.0
+        self.compensation = 0.0
+
+    def _add(self, x):
+        y = x - self.compensation
+        t = self.total + y
+        self.compensation = (t - self.total) - y
+        self.total = t
+
+    def push(self, x):
+        self.values.append(x)
+        self._add(x)
+        if len(self.values) > self.window:
+            self._add(-self.values.popleft())
+
+    @property
+    def full(self):
+        return len(self.values) == self.window
+
+    def mean(self):
+        if not self.full:
+            return math.nan
+        return self.total / self.window
+
+    def to_dict(self):
+        return {"values": list(self.values), "total": self.total, "compensation": self.compensation}
+
+    def load(self, state):
+        self.values = deque(state["values"])
+        self.total = state["total"]
+        self.compensation = state["compensation"]
+
+class RollingMax:
+    """
+    Fixed-size window maximum via a monotonic (decreasing) deque.
+    """
+
+    def __init__(self, window):
+        self.window = window
+        self.candidates = deque()  # (position, value), values strictly decreasing
+        self.count = 0
+
+    def push(self, x):
+        while self.candidates and self.candidates[-1][1] <= x:
+            self.candidates.pop()
+        self.candidates.append((self.count, x))
+        self.count += 1
+
+        # Evict the head once it slides out of the window
+        if self.candidates[0][0] <= self.count - 1 - self.window:
+            self.candidates.popleft()
+
+    @property
+    def full(self):
+        return self.count >= self.window
+
+    def max(self):
+        if not self.full:
+            return math.nan
+        return self.candidates[0][1]
+
+    def to_dict(self):
+        return {"candidates": [list(c) for c in self.candidates], "count": self.count}
+
+    def load(self, state):
+        self.candidates = deque(tuple(c) for c in state["candidates"])
+        self.count = state["count"]
+
+class IncrementalFeatureEngine:
+    """
+    Stateful per-ticker feature engine fed one OHLCV bar at a time.
+
+    Output matches feature_engineering.compute_features(clean_data(df))
+    row for row, to floating-point tolerance.
+    """
+
+    def __init__(self):
+        self.last_timestamp = None
+        self.prev_close = None
+        self.returns = RollingMoments(VOLATILITY_WINDOW)
+        self.close_max = RollingMax(DRAWDOWN_WINDOW)
+        self.close_sum = RollingSum(TREND_WINDOW)
+        self.volume = RollingMoments(VOLUME_WINDOW)
+
+    def update(self, timestamp, open_, high, low, close, volume):
+        """
+        Ingests one bar and returns its feature row.
+
+        Args:
+            timestamp: Bar date (anything pd.Timestamp accepts); must increase.
+            open_, high, low, close, volume: Raw OHLCV values.
+
+        Returns:
+            dict or None: Columns of compute_features for this bar, or None if
+                          the batch path would drop the row.
+
+        Raises:
+            ValueError: If bars arrive out of order.
+        """
+        timestamp = pd.Timestamp(timestamp)
+        if self.last_timestamp is not None and timestamp <= self.last_timestamp:
+            raise ValueError(f"Bars must arrive in increasing date order: {timestamp} <= {self.last_timestamp}")
+
+        bar = (close, high, low, open_, volume)
+
+        # clean_data: rows with missing values are dropped before returns
+        if any(v is None or (isinstance(v, float) and math.isnan(v)) for v in bar):
+            return None
+        self.last_timestamp = timestamp
+
+        # clean_data: the first valid bar has no return and is dropped
+        if self.prev_close is None:
+            self.prev_close = close
+            return None
+
+        daily_return = (close / self.prev_close) - 1
+        self.prev_close = close
+
+        self.returns.push(daily_return)
+        self.close_max.push(close)
+        self.close_sum.push(close)
+        self.volume.push(volume)
+
+        volatility = self.returns.std()
+        drawdown = (close / self.close_max.max()) - 1.0
+        sma = self.close_sum.mean()
+        trend = (close - sma) / sma
+
+        vol_std = self.volume.std()
+        # Avoid division by zero (zero std -> NaN -> row dropped)
+        if vol_std == 0:
+            vol_std = math.nan
+        anomaly = (volume - self.volume.mean) / vol_std
+
+        features = (volatility, drawdown, trend, anomaly)
+        if any(math.isnan(f) for f in features):
+            return None
+
+        return {
+            "Close": close,
+            "High": high,
+            "Low": low,
+            "Open": open_,
+            "Volume": volume,
+            "Daily_Return": daily_return,
+            "Volatility_20D": volatility,
+            "Drawdown_20D": drawdown,
+            "Trend_Strength_50D": trend,
+            "Volume_Anomaly_20D": anomaly
+        }
+
+    @classmethod
+    def from_history(cls, df):
+        """
+        Primes an engine by replaying a raw OHLCV history (one-time O(history)).
+
+        Args:
+            df (pd.DataFrame): Raw cache frame (Close, High, Low, Open, Volume).
+
+        Returns:
+            tuple: (engine, pd.DataFrame of emitted feature rows)
+        """
+        engine = cls()
+        rows = {}
+        df = df.sort_index(ascending=True)
+        columns = [df[c].tolist() for c in PRICE_COLUMNS]
+        for timestamp, close, high, low, open_, volume in zip(df.index, *columns):
+            row = engine.update(timestamp, open_, high, low, close, volume)
+            if row is not None:
+                rows[timestamp] = row
+        return engine, pd.DataFrame.from_dict(rows, orient="index")
+
+    def to_dict(self):
+        """Serializable engine state."""
+        return {
+            "last_timestamp": None if self.last_timestamp is None else self.last_timestamp.isoformat(),
+            "prev_close": self.prev_close,
+            "returns": self.returns.to_dict(),
+            "close_max": self.close_max.to_dict(),
+            "close_sum": self.close_sum.to_dict(),
+            "volume": self.volume.to_dict()
+        }
+
+    @classmethod
+    def from_dict(cls, state):
+        """Restores an engine from to_dict output."""
+        engine = cls()
+        if state["last_timestamp"] is not None:
+            engine.last_timestamp = pd.Timestamp(state["last_timestamp"])
+        engine.prev_close = state["prev_close"]
+        engine.returns.load(state["returns"])
+        engine.close_max.load(state["close_max"])
+        engine.close_sum.load(state["close_sum"])
+        engine.volume.load(state["volume"])
+        return engine
+
+    def save(self, path):
+        with open(path, "w") as f:
+            json.dump(self.to_dict(), f)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "r") as f:
+            return cls.from_dict(json.load(f))
@@ -0,0 +1,182 @@
+"""
+PIPELINE INSTRUMENTATION
+------------------------
+Lightweight timing spans with counts, totals and latency histograms.
+
+    with instrumentation.span("stage.features"):
+        ...
+
+Disabled by default: span() then returns a shared no-op context manager,
+so instrumented code pays one function call and one flag check. Enable
+with instrumentation.enable() or PIPELINE_METRICS=1.
+
+Recorded spans are exported as a JSON run report (report / write_report)
+or in the Prometheus text format (prometheus_text) for the server's /metrics.
+"""
+
+import bisect
+import json
+import os
+import threading
+import time
+
+# Upper bounds (seconds) of the latency histogram buckets; +Inf is implicit
+BUCKETS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0, 30.0)
+
+METRIC_NAME = "pipeline_span_seconds"
+
+_enabled = os.getenv("PIPELINE_METRICS", "") not in ("", "0")
+_lock = threading.Lock()
+_spans = {}     # name -> SpanStats
+_listeners = [] # Objects with enter(name)/exit(name), e.g. memory_profiling.MemoryProfiler
+
+class SpanStats:
+    """Count, total/max time and bucket counts of one span name."""
+
+    __slots__ = ("count", "total", "max", "buckets")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.buckets = [0] * (len(BUCKETS) + 1)
+
+    def observe(self, seconds):
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+        self.buckets[bisect.bisect_left(BUCKETS, seconds)] += 1
+
+    def to_dict(self):
+        return {"count": self.count, "total": self.total, "max": self.max, "buckets": list(self.buckets)}
+
+    def merge(self, state):
+        self.count += state["count"]
+        self.total += state["total"]
+        self.max = max(self.max, state["max"])
+        self.buckets = [a + b for a, b in zip(self.buckets, state["buckets"])]
+
+class _Span:
+    __slots__ = ("name", "start")
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        for listener in _listeners:
+            listener.enter(self.name)
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        observe(self.name, time.perf_counter() - self.start)
+        for listener in reversed(_listeners):
+            listener.exit(self.name)
+        return False
+
+class _NoopSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+_NOOP = _NoopSpan()
+
+def enable(on=True):
+    global _enabled
+    _enabled = on
+
+def enabled() -> bool:
+    return _enabled
+
+def add_listener(listener):
+    """Calls listener.enter(name) / listener.exit(name) around every span."""
+    _listeners.append(listener)
+
+def remove_listener(listener):
+    if listener in _listeners:
+        _listeners.remove(listener)
+
+def span(name):
+    """Context manager timing its body under `name` (no-op while disabled)."""
+    if not _enabled:
+        return _NOOP
+    return _Span(name)
+
+def observe(name, seconds):
+    """Records one externally measured duration."""
+    with _lock:
+        stats = _spans.get(name)
+        if stats is None:
+            stats = _spans[name] = SpanStats()
+        stats.observe(seconds)
+
+def reset():
+    with _lock:
+        _spans.clear()
+
+def snapshot() -> dict:
+    """Raw state of every span, mergeable into another process via merge()."""
+    with _lock:
+        return {name: stats.to_dict() for name, stats in _spans.items()}
+
+def merge(state):
+    """Adds a snapshot() taken elsewhere (e.g. in a worker process)."""
+    with _lock:
+        for name, span_state in state.items():
+            stats = _spans.get(name)
+            if stats is None:
+                stats = _spans[name] = SpanStats()
+            stats.merge(span_state)
+
+def report() -> dict:
+    """
+    JSON-friendly run report.
+
+    Returns:
+        dict: { "buckets": [...], "spans": { name: {count, total, mean, max, buckets} } }
+    """
+    spans = {}
+    for name, state in sorted(snapshot().items()):
+        state["mean"] = state["total"] / state["count"] if state["count"] else 0.0
+        spans[name] = state
+    return {"buckets": list(BUCKETS), "spans": spans}
+
+def write_report(path):
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(report(), f, indent=2)
+
+def summary() -> str:
+    """Human-readable table of the recorded spans."""
+    lines = [f"{'Span':<28} {'count':>8} {'total':>10} {'mean':>10} {'max':>10}"]
+    for name, s in report()["spans"].items():
+        lines.append(
+            f"{name:<28} {s['count']:>8} {s['total']:>9.3f}s {s['mean'] * 1e3:>8.3f}ms {s['max'] * 1e3:>8.3f}ms"
+        )
+    return "\n".join(lines)
+
+def prometheus_text() -> str:
+    """
+    Spans in the Prometheus text exposition format (cumulative histogram).
+    """
+    lines = [
+        f"# HELP {METRIC_NAME} Duration of instrumented pipeline and server spans.",
+        f"# TYPE {METRIC_NAME} histogram"
+    ]
+    for name, state in sorted(snapshot().items()):
+        label = name.replace("\\", "\\\\").replace('"', '\\"')
+        cumulative = 0
+        for bound, count in zip(BUCKETS + (float("inf"),), state["buckets"]):
+            cumulative += count
+            le = "+Inf" if bound == float("inf") else repr(bound)
+            lines.append(f'{METRIC_NAME}_bucket{{span="{label}",le="{le}"}} {cumulative}')
+        lines.append(f'{METRIC_NAME}_sum{{span="{label}"}} {state["total"]}')
+        lines.append(f'{METRIC_NAME}_count{{span="{label}"}} {state["count"]}')
+    return "\n".join(lines) + "\n"
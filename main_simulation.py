@@ -9,73 +9,260 @@ import json
 import datetime
 import system_constraints
 from config import settings
-import data_fetcher
 import data_persistence
-import data_processor
-import feature_engineering
+import instrumentation
+import memory_profiling
 import regime_detection
+import pipeline_dag
+import verdict_store
 from decision_engine import execution, consensus, risk_assessment, final_verdict
 
-def run_simulation():
-    # 1. Ensure Data
-    # In a real sim, we might fetch fresh. Here we rely on cache/fetch logic.
-    print("--- 🚀 STARTING SIMULATION ---")
-    data_map = data_fetcher.fetch_historical_data()
-    for t, d in data_map.items():
-        data_persistence.save_to_cache(t, d)
-        
-    results = []
+METRICS_REPORT_PATH = "data/metrics/run_report.json"
+
+# pandas-backed stages (data_processor, feature_engineering, backtest), the
+# process pool and the network layer (data_fetcher) are imported where used,
+# so a run over a fresh, fully memoized cache starts in a few hundred ms.
+
+def build_verdict(ticker, df_feat):
+    """
+    Runs regime, agents, consensus, risk and verdict on the latest feature row.
     
-    for ticker in system_constraints.MARKET_UNIVERSE:
-        # Pipeline
-        df = data_persistence.load_from_cache(ticker)
-        df_clean = data_processor.clean_data(df)
-        df_feat = feature_engineering.compute_features(df_clean)
+    Args:
+        ticker (str): The stock ticker.
+        df_feat (pd.DataFrame): Output of feature_engineering.compute_features.
         
-        # Get latest state
-        latest_row = df_feat.iloc[-1]
-        timestamp = latest_row.name.isoformat()
-        
-        # 1. Regime
-        regime, regime_conf = regime_detection.detect_regime(latest_row)
-        
-        # 2. Agents
-        agent_outputs = execution.execute_agents(latest_row)
+    Returns:
+        dict: Verdict matching output_schema.json.
+    """
+    # Get latest state
+    latest_row = df_feat.iloc[-1]
+    return build_verdict_row(ticker, latest_row.name.isoformat(), latest_row)
+
+def build_verdict_row(ticker, timestamp, latest_row):
+    """
+    build_verdict on one feature row given as any mapping (Series or dict).
+    
+    Args:
+        ticker (str): The stock ticker.
+        timestamp (str): ISO timestamp of the row.
+        latest_row (Mapping): { feature column: value }.
         
-        # 3. Consensus & Logic
-        cons_score = consensus.compute_consensus(agent_outputs)
-        disagreement = consensus.compute_disagreement(agent_outputs)
-        risk = risk_assessment.assess_risk(regime, disagreement, latest_row)
+    Returns:
+        dict: Verdict matching output_schema.json.
+    """
+    # 1. Regime
+    regime, regime_conf = regime_detection.detect_regime(latest_row)
+    
+    # 2. Agents (reuse the regime instead of re-detecting it per agent)
+    features = dict(latest_row)
+    features[regime_detection.REGIME_CODE_COLUMN] = regime_detection.REGIMES.index(regime)
+    agent_outputs = execution.execute_agents(features)
+    
+    # 3. Consensus & Logic
+    cons_score = consensus.compute_consensus(agent_outputs)
+    disagreement = consensus.compute_disagreement(agent_outputs)
+    risk = risk_assessment.assess_risk(regime, disagreement, latest_row)
+    
+    # 4. Verdict
+    action, exec_allowed, reason = final_verdict.decide_verdict(cons_score, risk)
+    
+    # 5. Assemble JSON
+    return {
+        "ticker": ticker,
+        "timestamp": timestamp,
+        "action": action,
+        "confidence": regime_conf,
+        "is_simulation": True,
+        "execution_allowed": exec_allowed,
+        "consensus_score": round(cons_score, 4),
+        "disagreement_index": round(disagreement, 4),
+        "risk_level": risk,
+        "regime": regime,
+        "regime_confidence": regime_conf,
+        "reason": reason
+    }
+
+def evaluate_ticker(ticker, compact=False):
+    """
+    Full per-ticker pipeline on cached data: load, clean, features, verdict.
+    
+    Args:
+        ticker (str): Ticker symbol.
+        compact (bool): Low-memory clean / features (float32 columns).
         
-        # 4. Verdict
-        action, exec_allowed, reason = final_verdict.decide_verdict(cons_score, risk)
+    Returns:
+        dict: Verdict matching output_schema.json.
+    """
+    import data_processor
+    import feature_engineering
+
+    with memory_profiling.ticker(ticker):
+        with instrumentation.span("stage.load"):
+            df = data_persistence.load_from_cache(ticker)
+        with instrumentation.span("stage.clean"):
+            df_clean = data_processor.clean_data(df, compact=compact)
+        with instrumentation.span("stage.features"):
+            df_feat = feature_engineering.compute_features(df_clean, compact=compact)
+        with instrumentation.span("stage.verdict"):
+            return build_verdict(ticker, df_feat)
+
+def refresh_cache(tickers, offline=False):
+    """
+    Cache-first refresh: only tickers missing business days reach the network layer.
+    
+    Args:
+        tickers (iterable): Tickers to check.
+        offline (bool): Never fetch; stale tickers are served from the cache as-is.
         
-        # 5. Assemble JSON
-        verdict = {
-            "ticker": ticker,
-            "timestamp": timestamp,
-            "action": action,
-            "confidence": regime_conf,
-            "is_simulation": True,
-            "execution_allowed": exec_allowed,
-            "consensus_score": round(cons_score, 4),
-            "disagreement_index": round(disagreement, 4),
-            "risk_level": risk,
-            "regime": regime,
-            "regime_confidence": regime_conf,
-            "reason": reason
-        }
+    Returns:
+        list: Tickers that were stale.
+    """
+    end = system_constraints.END_DATE
+    stale = [ticker for ticker in tickers if not data_persistence.is_fresh(ticker, end)]
+    if not stale:
+        print(f"Cache fresh through {end} for {len(tickers)} tickers; no fetch needed")
+    elif offline:
+        print(f"Offline: {len(stale)} stale tickers served from cache: {', '.join(stale)}")
+    else:
+        import data_fetcher
+        with instrumentation.span("simulation.fetch"):
+            _, fetch_report = data_fetcher.update_cache(stale)
+        print(fetch_report.summary())
+    return stale
+
+def run_simulation(tickers=None, workers=1, memoize=True, offline=False, shared=False, compact=False):
+    """
+    Runs the pipeline for every ticker and writes server/data.json.
+    
+    Args:
+        tickers (iterable, optional): Universe to run. Defaults to MARKET_UNIVERSE.
+        workers (int): Processes to use; > 1 shards tickers over a process pool.
+        memoize (bool): Reuse cached stage outputs whose inputs are unchanged.
+        offline (bool): Never fetch, even if the cache is stale.
+        shared (bool): With workers > 1, compute features once in this process
+            and share them with the pool (bypasses the stage cache).
+        compact (bool): Low-memory clean / features (float32 columns) in the
+            per-ticker pipeline; the shared Panel path is unaffected.
         
-        results.append(verdict)
+    Returns:
+        list: Verdicts in universe order (failed tickers omitted).
+    """
+    tickers = tuple(tickers or system_constraints.MARKET_UNIVERSE)
+    
+    # 1. Ensure Data
+    # Cache-first: only dates missing from a stale cache are fetched.
+    print("--- 🚀 STARTING SIMULATION ---")
+    with instrumentation.span("simulation.refresh_cache"):
+        refresh_cache(tickers, offline=offline)
+    
+    dag_report = None
+    with instrumentation.span("simulation.pipeline"):
+        if workers > 1:
+            import parallel_runner
+            if shared:
+                results, errors, dag_report = parallel_runner.run_parallel_shared(tickers, max_workers=workers)
+            else:
+                results, errors, dag_report = parallel_runner.run_parallel(
+                    tickers, max_workers=workers, memoize=memoize, compact=compact
+                )
+        else:
+            results, errors, dag_report = pipeline_dag.run_pipeline(tickers, memoize=memoize, compact=compact)
+    
+    # Failed tickers are reported and skipped, whatever the worker count
+    for ticker, error in errors.items():
+        print(f"❌ {ticker}: {error}")
+    
+    if dag_report is not None:
+        print(dag_report.summary())
         
-    # Output
+    # Output: append to the verdict history, then export this run's verdicts for the frontend
+    # (a ticker that failed now is left out rather than served from older history)
     output_path = "server/data.json"
-    with open(output_path, "w") as f:
-        json.dump(results, f, indent=2)
+    with instrumentation.span("simulation.store"), verdict_store.VerdictStore() as store:
+        store.insert_many(results)
+        store.export_json(output_path, verdicts=results)
     
     print(json.dumps(results, indent=2))
     print(f"\\n✅ Simulation data saved to {output_path}")
     return results
 
+def write_metrics(path=None):
+    """Prints the recorded spans and writes them as a JSON run report."""
+    path = path or METRICS_REPORT_PATH
+    print(instrumentation.summary())
+    instrumentation.write_report(path)
+    print(f"Run report saved to {path}")
+
+def write_memory_report(profiler, path=None):
+    """Prints the per-stage memory table and writes the JSON memory report."""
+    path = path or memory_profiling.MEMORY_REPORT_PATH
+    print(profiler.summary())
+    profiler.write_report(path)
+    print(f"Memory report saved to {path}")
+
+def run_backtest(tickers=None, offline=False):
+    """
+    Backtest mode: evaluates every date of every ticker (vectorized).
+
+    Args:
+        tickers (iterable, optional): Universe to backtest. Defaults to MARKET_UNIVERSE.
+        offline (bool): Never fetch, even if the cache is stale.
+
+    Returns:
+        dict: { 'Ticker': backtest DataFrame } (see backtest.backtest_features)
+    """
+    import backtest
+
+    tickers = tuple(tickers or system_constraints.MARKET_UNIVERSE)
+
+    print("--- 📈 STARTING BACKTEST ---")
+    with instrumentation.span("simulation.refresh_cache"):
+        refresh_cache(tickers, offline=offline)
+
+    with instrumentation.span("backtest.run"):
+        frames = backtest.run_backtest(tickers)
+
+    with verdict_store.VerdictStore() as store:
+        for ticker, frame in frames.items():
+            counts = frame['Action'].value_counts().to_dict()
+            print(f"{ticker}: {len(frame)} days {frame.index[0].date()} -> {frame.index[-1].date()} | {counts}")
+            store.insert_many(backtest.verdict_records(ticker, frame))
+        print(f"Verdict store: {store.count()} verdicts in {store.path}")
+
+    return frames
+
 if __name__ == "__main__":
-    run_simulation()
+    import argparse
+    parser = argparse.ArgumentParser(description="Deterministic market simulation")
+    parser.add_argument("--backtest", action="store_true", help="Evaluate the full history instead of the latest day")
+    parser.add_argument("--universe", help="Universe file (one ticker per line); defaults to MARKET_UNIVERSE")
+    parser.add_argument("--workers", type=int, default=1, help="Worker processes for the per-ticker pipeline")
+    parser.add_argument("--no-cache", action="store_true", help="Recompute every stage instead of reusing cached outputs")
+    parser.add_argument("--shared", action="store_true", help="With --workers: compute features once and share them with workers")
+    parser.add_argument("--offline", action="store_true", help="Never fetch; run on the cache as-is")
+    parser.add_argument("--compact", action="store_true", help="Low-memory clean/features (float32 columns)")
+    parser.add_argument("--metrics", nargs="?", const=METRICS_REPORT_PATH, help="Record stage timings and write a JSON run report")
+    parser.add_argument("--memory", nargs="?", const=memory_profiling.MEMORY_REPORT_PATH,
+                        help="Trace peak/retained memory per stage and ticker (single process; combine with --no-cache)")
+    args = parser.parse_args()
+
+    if args.metrics:
+        instrumentation.enable()
+    if args.memory:
+        # tracemalloc only sees this process
+        args.workers = 1
+        memory_profiling.start()
+
+    if args.backtest:
+        run_backtest(system_constraints.load_universe(args.universe), offline=args.offline)
+    else:
+        run_simulation(
+            system_constraints.load_universe(args.universe), workers=args.workers,
+            memoize=not args.no_cache, offline=args.offline, shared=args.shared,
+            compact=args.compact
+        )
+
+    if args.memory:
+        write_memory_report(memory_profiling.stop(), args.memory)
+    if args.metrics:
+        write_metrics(args.metrics)
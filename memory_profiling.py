@@ -0,0 +1,225 @@
+"""
+MEMORY PROFILING MODE
+---------------------
+tracemalloc-based peak/retained memory per pipeline stage and per ticker.
+
+The profiler listens to the instrumentation spans (stage.load, stage.clean,
+stage.features, stage.verdict, ...), so no extra hooks are needed in the
+pipeline. For every span it records:
+- peak:     highest traced memory above the span's starting level,
+- retained: memory still allocated at exit (e.g. the stage's output frame).
+
+Nested spans are handled by folding each child's peak into its parent
+before tracemalloc's peak counter is reset. Allocation sites are listed for
+the whole run (retained at the end) and, for each of the first `sample` tickers,
+per stage (allocations alive at stage exit).
+
+Retained memory includes garbage still waiting for the cycle collector,
+so single-ticker values are noisy; the run-level listing is the leak check.
+tracemalloc slows Python allocations down noticeably; use it for
+diagnosis runs, not for timing.
+"""
+
+import json
+import os
+import tracemalloc
+from contextlib import contextmanager
+
+import instrumentation
+
+MEMORY_REPORT_PATH = "data/metrics/memory_report.json"
+
+_profiler = None
+
+# The profiler's own bookkeeping is not reported as an allocation site
+_IGNORED = (
+    tracemalloc.Filter(False, __file__),
+    tracemalloc.Filter(False, tracemalloc.__file__),
+)
+
+class _Frame:
+    __slots__ = ("name", "start", "peak", "snapshot")
+
+    def __init__(self, name, start):
+        self.name = name
+        self.start = start
+        self.peak = start
+        self.snapshot = None
+
+def _take_snapshot():
+    return tracemalloc.take_snapshot().filter_traces(_IGNORED)
+
+def _sites(stats, top):
+    return [
+        {"site": f"{s.traceback[0].filename}:{s.traceback[0].lineno}", "size": s.size_diff, "count": s.count_diff}
+        for s in [s for s in stats if s.size_diff > 0][:top]
+    ]
+
+class MemoryProfiler:
+    """
+    Span listener recording peak and retained traced memory.
+
+    Args:
+        top (int): Allocation sites to keep per listing.
+        sample (int): Tickers (in run order) whose stages get per-stage site listings.
+        nframes (int): Traceback depth stored by tracemalloc.
+    """
+
+    def __init__(self, top=10, sample=1, nframes=1):
+        self.top = top
+        self.sample = sample
+        self.nframes = nframes
+        self.stages = {}        # name -> {count, peak_max, peak_total, retained_total}
+        self.tickers = {}       # ticker -> {peak, retained, stages: {name: peak}}
+        self.stage_sites = {}   # name -> { sampled ticker: [sites] }
+        self.run_sites = []
+        self._stack = []
+        self._ticker = None
+        self._ticker_index = 0
+        self._baseline = None
+
+    # Lifecycle
+
+    def start(self):
+        tracemalloc.start(self.nframes)
+        self._baseline = _take_snapshot()
+        instrumentation.add_listener(self)
+        instrumentation.enable()
+
+    def stop(self):
+        final = _take_snapshot()
+        self.run_sites = _sites(final.compare_to(self._baseline, "lineno"), self.top)
+        instrumentation.remove_listener(self)
+        tracemalloc.stop()
+
+    # Frames
+
+    def _push(self, name, snapshot=False):
+        current, peak = tracemalloc.get_traced_memory()
+        if self._stack:
+            parent = self._stack[-1]
+            parent.peak = max(parent.peak, peak)
+        tracemalloc.reset_peak()
+        frame = _Frame(name, current)
+        if snapshot:
+            frame.snapshot = _take_snapshot()
+        self._stack.append(frame)
+
+    def _pop(self):
+        current, peak = tracemalloc.get_traced_memory()
+        frame = self._stack.pop()
+        frame.peak = max(frame.peak, peak)
+        if self._stack:
+            parent = self._stack[-1]
+            parent.peak = max(parent.peak, frame.peak)
+        return frame, frame.peak - frame.start, current - frame.start
+
+    def _sampled(self):
+        return self._ticker is not None and self._ticker_index <= self.sample
+
+    # Span listener
+
+    def enter(self, name):
+        self._push(name, snapshot=self._sampled())
+
+    def exit(self, name):
+        frame, peak, retained = self._pop()
+
+        stats = self.stages.setdefault(name, {"count": 0, "peak_max": 0, "peak_total": 0, "retained_total": 0})
+        stats["count"] += 1
+        stats["peak_max"] = max(stats["peak_max"], peak)
+        stats["peak_total"] += peak
+        stats["retained_total"] += retained
+
+        if self._ticker is not None:
+            self.tickers[self._ticker]["stages"][name] = peak
+
+        if frame.snapshot is not None:
+            diff = _take_snapshot().compare_to(frame.snapshot, "lineno")
+            self.stage_sites.setdefault(name, {})[self._ticker] = _sites(diff, self.top)
+
+    # Tickers
+
+    @contextmanager
+    def ticker(self, name):
+        self._ticker = name
+        self._ticker_index += 1
+        self.tickers[name] = {"peak": 0, "retained": 0, "stages": {}}
+        self._push(f"ticker:{name}")
+        try:
+            yield
+        finally:
+            _, peak, retained = self._pop()
+            self.tickers[name]["peak"] = peak
+            self.tickers[name]["retained"] = retained
+            self._ticker = None
+
+    # Reporting
+
+    def report(self) -> dict:
+        stages = {
+            name: dict(s, peak_mean=s["peak_total"] / s["count"])
+            for name, s in sorted(self.stages.items())
+        }
+        return {
+            "stages": stages,
+            "tickers": self.tickers,
+            "top_tickers": sorted(self.tickers, key=lambda t: self.tickers[t]["peak"], reverse=True)[:self.top],
+            "stage_sites": self.stage_sites,
+            "run_sites": self.run_sites
+        }
+
+    def summary(self) -> str:
+        report = self.report()
+        lines = [f"{'Stage':<28} {'count':>7} {'peak max':>11} {'peak mean':>11} {'retained/call':>14}"]
+        for name, s in report["stages"].items():
+            lines.append(
+                f"{name:<28} {s['count']:>7} {_kb(s['peak_max']):>11} {_kb(s['peak_mean']):>11} "
+                f"{_kb(s['retained_total'] / s['count']):>14}"
+            )
+        if report["top_tickers"]:
+            lines.append("Top tickers by peak:")
+            for t in report["top_tickers"][:5]:
+                lines.append(f"  {t:<16} peak={_kb(self.tickers[t]['peak'])} retained={_kb(self.tickers[t]['retained'])}")
+        lines.append("Top allocation sites (retained at end of run):")
+        for site in report["run_sites"][:5]:
+            lines.append(f"  {_kb(site['size']):>10}  {site['site']}")
+        for name, by_ticker in report["stage_sites"].items():
+            ticker, sites = next(iter(by_ticker.items()))
+            if sites and name.startswith("stage."):
+                lines.append(f"Top site alive after {name} ({ticker}): {_kb(sites[0]['size'])} {sites[0]['site']}")
+        return "\n".join(lines)
+
+    def write_report(self, path=MEMORY_REPORT_PATH):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, "w") as f:
+            json.dump(self.report(), f, indent=2)
+
+def _kb(size) -> str:
+    return f"{size / 1024:.1f}KB"
+
+def start(**options) -> MemoryProfiler:
+    """Starts the process-wide profiler (see MemoryProfiler for options)."""
+    global _profiler
+    _profiler = MemoryProfiler(**options)
+    _profiler.start()
+    return _profiler
+
+def stop() -> MemoryProfiler:
+    global _profiler
+    profiler, _profiler = _profiler, None
+    if profiler is not None:
+        profiler.stop()
+    return profiler
+
+@contextmanager
+def _noop():
+    yield
+
+def ticker(name):
+    """Attributes the enclosed spans to one ticker (no-op unless profiling)."""
+    if _profiler is None:
+        return _noop()
+    return _profiler.ticker(name)
@@ -0,0 +1,161 @@
+"""
+PANEL DATA STORE
+----------------
+The whole universe as one aligned (dates x tickers x fields) float64 array.
+
+- dates:  shared trading calendar (union of every ticker's dates).
+- mask:   (dates x tickers) True where the ticker has a usable row.
+- values: row-major, so "all tickers on date D" (values[d]) is one
+          contiguous block; a ticker or a field is a strided view.
+
+Per-ticker semantics are preserved by compaction: rolling windows count a
+ticker's own rows, not calendar days, so stages that need history first
+move each ticker's valid rows to the top of its column (a stable argsort
+of the mask keeps them in date order), compute on that dense
+(rows x tickers) block and scatter the results back onto the calendar.
+
+data_processor.clean_data and feature_engineering.compute_features accept
+a Panel directly; backtest.backtest_panel runs the agents on it.
+"""
+
+import numpy as np
+import pandas as pd
+
+PRICE_FIELDS = ('Close', 'High', 'Low', 'Open', 'Volume')
+
+class Panel:
+    """
+    Aligned dates x tickers x fields store.
+
+    Args:
+        dates (np.ndarray): Sorted datetime64[ns] calendar.
+        tickers (iterable): Ticker names (axis 1).
+        fields (iterable): Field names (axis 2).
+        values (np.ndarray): float64 array (dates, tickers, fields); NaN where missing.
+        mask (np.ndarray): bool array (dates, tickers); True for usable rows.
+    """
+
+    def __init__(self, dates, tickers, fields, values, mask):
+        self.dates = np.asarray(dates, dtype="datetime64[ns]")
+        self.tickers = tuple(tickers)
+        self.fields = tuple(fields)
+        self.values = values
+        self.mask = mask
+        self._ticker_pos = {t: i for i, t in enumerate(self.tickers)}
+        self._field_pos = {f: j for j, f in enumerate(self.fields)}
+
+        expected = (len(self.dates), len(self.tickers), len(self.fields))
+        if values.shape != expected or mask.shape != expected[:2]:
+            raise ValueError(f"Panel shape mismatch: values {values.shape}, mask {mask.shape}, expected {expected}")
+
+    # Construction
+
+    @classmethod
+    def from_frames(cls, frames, fields=PRICE_FIELDS):
+        """
+        Aligns per-ticker frames on their union calendar.
+
+        Args:
+            frames (dict): { ticker: pd.DataFrame indexed by date }.
+            fields (iterable): Columns to keep (axis 2 order).
+
+        Returns:
+            Panel: mask is True wherever the ticker has a row.
+        """
+        tickers = tuple(frames)
+        fields = tuple(fields)
+        indexes = [frames[t].index.to_numpy(dtype="datetime64[ns]") for t in tickers]
+        dates = np.unique(np.concatenate(indexes)) if indexes else np.array([], dtype="datetime64[ns]")
+
+        values = np.full((len(dates), len(tickers), len(fields)), np.nan)
+        mask = np.zeros((len(dates), len(tickers)), dtype=bool)
+        for i, (ticker, index) in enumerate(zip(tickers, indexes)):
+            rows = np.searchsorted(dates, index)
+            values[rows, i, :] = frames[ticker][list(fields)].to_numpy(dtype=np.float64)
+            mask[rows, i] = True
+        return cls(dates, tickers, fields, values, mask)
+
+    @classmethod
+    def from_cache(cls, tickers, fields=PRICE_FIELDS):
+        """Loads cached tickers into one panel (see from_frames)."""
+        import data_persistence
+        return cls.from_frames({t: data_persistence.load_from_cache(t) for t in tickers}, fields)
+
+    # Views
+
+    @property
+    def shape(self):
+        return self.values.shape
+
+    def date_position(self, date):
+        """Calendar row of a date (KeyError if it is not a trading date)."""
+        date = np.datetime64(pd.Timestamp(date), "ns")
+        row = int(np.searchsorted(self.dates, date))
+        if row == len(self.dates) or self.dates[row] != date:
+            raise KeyError(f"{date} is not in the panel calendar")
+        return row
+
+    def field(self, name):
+        """(dates x tickers) view of one field."""
+        return self.values[:, :, self._field_pos[name]]
+
+    def ticker(self, name):
+        """(dates x fields) view of one ticker (calendar rows; see mask)."""
+        return self.values[:, self._ticker_pos[name], :]
+
+    def on_date(self, date):
+        """
+        All tickers on one date.
+
+        Returns:
+            tuple: ((tickers x fields) contiguous view, (tickers,) mask row)
+        """
+        row = self.date_position(date)
+        return self.values[row], self.mask[row]
+
+    def ticker_frame(self, name):
+        """One ticker's usable rows as a DataFrame (a copy), like the per-ticker pipeline's."""
+        rows = self.mask[:, self._ticker_pos[name]]
+        return pd.DataFrame(
+            self.ticker(name)[rows], index=pd.DatetimeIndex(self.dates[rows], name="Date"), columns=list(self.fields)
+        )
+
+    def with_fields(self, new_fields, mask):
+        """
+        New panel with extra (dates x tickers) fields appended and a new mask.
+
+        Args:
+            new_fields (dict): { name: (dates x tickers) array }.
+            mask (np.ndarray): Mask of the new panel.
+        """
+        extra = np.stack([np.asarray(v, dtype=np.float64) for v in new_fields.values()], axis=-1)
+        return Panel(
+            self.dates, self.tickers, self.fields + tuple(new_fields),
+            np.concatenate((self.values, extra), axis=-1), mask
+        )
+
+    # Compaction
+
+    def compaction(self, mask=None):
+        """
+        Row order moving each ticker's usable rows to the top, in date order.
+
+        Returns:
+            tuple: (order (dates x tickers) int array, counts per ticker)
+        """
+        mask = self.mask if mask is None else mask
+        # Stable: usable rows (False < True on ~mask) keep their date order
+        return np.argsort(~mask, axis=0, kind="stable"), mask.sum(axis=0)
+
+    def compact(self, values, order, counts):
+        """Gathers (dates x tickers) values into compacted order; rows past each count are NaN."""
+        dense = np.take_along_axis(np.asarray(values, dtype=np.float64), order, axis=0)
+        dense[np.arange(len(dense))[:, None] >= counts] = np.nan
+        return dense
+
+    def scatter(self, dense, order, counts):
+        """Inverse of compact: back to calendar rows, NaN outside the compacted rows."""
+        out = np.full(dense.shape, np.nan)
+        valid = np.arange(len(dense))[:, None] < counts
+        np.put_along_axis(out, order, np.where(valid, dense, np.nan), axis=0)
+        return out
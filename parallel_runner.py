@@ -0,0 +1,201 @@
+"""
+PARALLEL PIPELINE RUNNER
+------------------------
+Shards a ticker universe across a process pool.
+
+Scheduling keeps DataFrames inside the workers: only ticker names are sent
+out and only the small verdict dicts come back, so nothing large is
+pickled between processes. Each worker reads its own tickers from the
+local cache.
+
+run_parallel_shared is the alternative when features should be computed
+once: the parent builds the universe Panel, publishes its feature matrices
+in shared memory (shared_features) and workers attach read-only views by
+name, so tasks carry a segment descriptor and column indices, not data.
+"""
+
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+# Chunks per worker: enough to balance uneven tickers, few enough to keep IPC low
+CHUNKS_PER_WORKER = 4
+
+def _evaluate_chunk(tickers, memoize=False, metrics=False, compact=False):
+    """
+    Worker entry point: pipeline_dag.evaluate_tickers on one chunk (errors
+    isolated per ticker, exactly as in the serial run).
+
+    Returns:
+        tuple: (results, spans)
+            - results: [(ticker, verdict or None, error or None, stage outcomes or None), ...]
+              in input order.
+            - spans: instrumentation.snapshot() of this chunk, or None if metrics is off.
+    """
+    # Imported in the worker so the parent can stay light
+    import instrumentation
+    import pipeline_dag
+
+    # Workers record their own spans; the parent merges them
+    instrumentation.enable(metrics)
+    instrumentation.reset()
+
+    cache = pipeline_dag.StageCache() if memoize else None
+    results = pipeline_dag.evaluate_tickers(tickers, cache, compact)
+    return results, instrumentation.snapshot() if metrics else None
+
+def _chunks(tickers, chunksize):
+    return [tickers[i:i + chunksize] for i in range(0, len(tickers), chunksize)]
+
+def run_parallel(tickers, max_workers=None, chunksize=None, memoize=False, compact=False):
+    """
+    Evaluates the latest verdict of every ticker on a process pool.
+
+    Args:
+        tickers (iterable): Universe to process.
+        max_workers (int, optional): Pool size. Defaults to all cores.
+        chunksize (int, optional): Tickers per task. Defaults to an even split
+            into CHUNKS_PER_WORKER tasks per worker.
+        memoize (bool): Evaluate through the pipeline_dag stage cache.
+        compact (bool): Low-memory clean / features in the workers.
+
+    Returns:
+        tuple: (verdicts, errors, report)
+            - verdicts: list in universe order (failed tickers omitted), identical
+              to evaluating the tickers serially.
+            - errors: { 'Ticker': error message }
+            - report: pipeline_dag.DagReport when memoize, else None.
+    """
+    import instrumentation
+    import pipeline_dag
+
+    tickers = list(tickers)
+    max_workers = max_workers or os.cpu_count() or 1
+    if chunksize is None:
+        chunksize = max(1, math.ceil(len(tickers) / (max_workers * CHUNKS_PER_WORKER)))
+
+    verdicts = []
+    errors = {}
+    report = pipeline_dag.DagReport() if memoize else None
+    if not tickers:
+        return verdicts, errors, report
+
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        chunks = _chunks(tickers, chunksize)
+        metrics = instrumentation.enabled()
+        futures = [pool.submit(_evaluate_chunk, chunk, memoize, metrics, compact) for chunk in chunks]
+
+        # Collect in submission order for deterministic output
+        for chunk, future in zip(chunks, futures):
+            try:
+                chunk_results, spans = future.result()
+            except Exception as e:
+                # A crashed worker fails the affected chunks, not the whole run
+                chunk_results = [(ticker, None, f"{type(e).__name__}: {e}", None) for ticker in chunk]
+                spans = None
+
+            if spans:
+                instrumentation.merge(spans)
+
+            pipeline_dag.collect_results(chunk_results, verdicts, errors, report)
+
+    # Evicted once by the parent, after every worker is done with the store
+    if memoize:
+        report.evicted = pipeline_dag.StageCache().prune()
+    return verdicts, errors, report
+
+def _evaluate_shared_chunk(descriptor, columns, metrics=False):
+    """
+    Worker entry point for run_parallel_shared: verdicts from the shared matrices.
+
+    Returns:
+        tuple: (results, spans) as in _evaluate_chunk (outcomes are always None).
+    """
+    import instrumentation
+    import main_simulation
+    import shared_features
+
+    instrumentation.enable(metrics)
+    instrumentation.reset()
+
+    results = []
+    with shared_features.SharedArrays.attach(descriptor) as shared:
+        for ticker, timestamp, row in shared_features.latest_rows(shared, columns):
+            if row is None:
+                results.append((ticker, None, "ValueError: no usable feature rows", None))
+                continue
+            try:
+                with instrumentation.span("stage.verdict"):
+                    results.append((ticker, main_simulation.build_verdict_row(ticker, timestamp, row), None, None))
+            except Exception as e:
+                results.append((ticker, None, f"{type(e).__name__}: {e}", None))
+    return results, instrumentation.snapshot() if metrics else None
+
+def run_parallel_shared(tickers, max_workers=None, chunksize=None):
+    """
+    Like run_parallel, but features are computed once in the parent and shared.
+
+    The parent loads the universe as a Panel, cleans it and computes its
+    features, then publishes the feature matrices in one shared-memory
+    segment for the pool. The segment is unlinked when the run ends, fails
+    or the parent is interrupted (see shared_features for crash cleanup).
+
+    Args:
+        tickers (iterable): Universe to process.
+        max_workers (int, optional): Pool size. Defaults to all cores.
+        chunksize (int, optional): Tickers per task (see run_parallel).
+
+    Returns:
+        tuple: (verdicts, errors, None)
+    """
+    import data_persistence
+    import data_processor
+    import feature_engineering
+    import instrumentation
+    import pipeline_dag
+    import shared_features
+    from panel import Panel
+
+    tickers = list(tickers)
+    max_workers = max_workers or os.cpu_count() or 1
+
+    verdicts = []
+    errors = {}
+    frames = {}
+    for ticker in tickers:
+        try:
+            frames[ticker] = data_persistence.load_from_cache(ticker)
+        except Exception as e:
+            errors[ticker] = f"{type(e).__name__}: {e}"
+    if not frames:
+        return verdicts, errors, None
+
+    with instrumentation.span("stage.panel_features"):
+        panel = feature_engineering.compute_features(data_processor.clean_data(Panel.from_frames(frames)))
+
+    columns = list(range(len(panel.tickers)))
+    if chunksize is None:
+        chunksize = max(1, math.ceil(len(columns) / (max_workers * CHUNKS_PER_WORKER)))
+
+    with shared_features.publish_panel(panel) as shared:
+        del panel
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            chunks = _chunks(columns, chunksize)
+            metrics = instrumentation.enabled()
+            futures = [pool.submit(_evaluate_shared_chunk, shared.descriptor, chunk, metrics) for chunk in chunks]
+
+            for chunk, future in zip(chunks, futures):
+                try:
+                    chunk_results, spans = future.result()
+                except Exception as e:
+                    chunk_results = [
+                        (shared.meta["tickers"][i], None, f"{type(e).__name__}: {e}", None) for i in chunk
+                    ]
+                    spans = None
+
+                if spans:
+                    instrumentation.merge(spans)
+
+                pipeline_dag.collect_results(chunk_results, verdicts, errors)
+
+    return verdicts, errors, None
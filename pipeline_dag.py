@@ -0,0 +1,376 @@
+"""
+MEMOIZED STAGE DAG
+------------------
+Expresses the per-ticker pipeline as a chain of stages whose outputs are
+cached on disk under a hash of their inputs:
+
+    load (cached CSV) -> clean -> features -> verdict
+
+A stage key combines the upstream key, the stage code version (hash of the
+source files it depends on), the settings it reads and the run options it
+takes (e.g. compact). Keys are derivable
+without running anything, so a ticker whose final key is already cached is
+answered straight from disk, and only chains with changed inputs execute.
+
+Outputs whose keys are no longer produced (after a code, settings or data
+change) are never read again; the store is capped at
+STAGE_CACHE_MAX_BYTES and evicts least recently used outputs after
+each run.
+"""
+
+import hashlib
+import importlib.util
+import json
+import os
+import pickle
+from dataclasses import dataclass, field
+
+import data_persistence
+import instrumentation
+import memory_profiling
+from config import settings
+
+STAGE_CACHE_DIR = "data/stage_cache"
+STAGE_CACHE_MAX_BYTES = 1 << 30     # Pickled outputs kept across runs (LRU beyond this)
+
+HIT = "hit"
+COMPUTED = "computed"
+SKIPPED = "skipped"     # Not needed: a downstream stage was a hit
+
+@dataclass(frozen=True)
+class Stage:
+    """One memoized pipeline step: func(ticker, upstream_output, **options) -> output."""
+    name: str
+    func: object
+    modules: tuple = ()
+    settings: tuple = ()
+    options: tuple = ()     # Run options passed to func and part of the key
+
+# Stage bodies import their modules lazily: a fully cached run never loads pandas
+def _clean(ticker, _, compact=False):
+    import data_processor
+    with instrumentation.span("stage.load"):
+        df = data_persistence.load_from_cache(ticker)
+    with instrumentation.span("stage.clean"):
+        return data_processor.clean_data(df, compact=compact)
+
+def _features(ticker, df_clean, compact=False):
+    import feature_engineering
+    with instrumentation.span("stage.features"):
+        return feature_engineering.compute_features(df_clean, compact=compact)
+
+def _verdict(ticker, df_feat):
+    # Imported lazily: main_simulation imports this module
+    import main_simulation
+    with instrumentation.span("stage.verdict"):
+        return main_simulation.build_verdict(ticker, df_feat)
+
+_DECISION_MODULES = (
+    'regime_detection', 'agent_interface',
+    'agents.structure_agent', 'agents.risk_agent', 'agents.sentiment_agent',
+    'agents.macro_agent', 'agents.skeptic_agent',
+    'decision_engine.execution', 'decision_engine.consensus',
+    'decision_engine.risk_assessment', 'decision_engine.final_verdict',
+    'main_simulation'
+)
+
+# Ordered chain; the source stage ("load") is the cached CSV itself
+STAGES = (
+    Stage('clean', _clean, modules=('data_persistence', 'data_processor', 'panel'), options=('compact',)),
+    Stage('features', _features, modules=('feature_engineering', 'feature_bank', 'feature_kernels', 'panel'),
+          options=('compact',)),
+    Stage('verdict', _verdict, modules=_DECISION_MODULES, settings=(
+        'VOLATILITY_THRESHOLD_HIGH', 'VOLATILITY_THRESHOLD_LOW', 'MAX_DRAWDOWN_LIMIT',
+        'CONSENSUS_SCORE_BUY', 'CONSENSUS_SCORE_SELL', 'DISAGREEMENT_THRESHOLD'
+    )),
+)
+
+def _sha256(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+_code_versions = {}
+
+def code_version(stage: Stage) -> str:
+    """Hash of the source files a stage depends on (memoized per process, nothing imported)."""
+    if stage.name not in _code_versions:
+        digest = hashlib.sha256()
+        for module_name in stage.modules:
+            with open(importlib.util.find_spec(module_name).origin, "rb") as f:
+                digest.update(module_name.encode())
+                digest.update(f.read())
+        _code_versions[stage.name] = digest.hexdigest()
+    return _code_versions[stage.name]
+
+@dataclass
+class DagReport:
+    """Per-ticker stage outcomes for one run."""
+    outcomes: dict = field(default_factory=dict)    # { ticker: { stage: HIT/COMPUTED/SKIPPED } }
+    evicted: int = 0                                # Outputs removed by StageCache.prune
+
+    def recomputed(self) -> list:
+        return [t for t, stages in self.outcomes.items() if COMPUTED in stages.values()]
+
+    def summary(self) -> str:
+        lines = []
+        for stage in STAGES:
+            counts = {HIT: 0, COMPUTED: 0, SKIPPED: 0}
+            for stages in self.outcomes.values():
+                counts[stages[stage.name]] += 1
+            lines.append(
+                f"  {stage.name:<10} hits={counts[HIT]:<6} recomputed={counts[COMPUTED]:<6} skipped={counts[SKIPPED]}"
+            )
+        recomputed = self.recomputed()
+        header = f"Stage cache: {len(self.outcomes) - len(recomputed)}/{len(self.outcomes)} tickers fully cached"
+        if recomputed:
+            header += f"; recomputed: {', '.join(recomputed)}"
+        if self.evicted:
+            lines.append(f"  evicted {self.evicted} least recently used outputs")
+        return "\n".join([header] + lines)
+
+class StageCache:
+    """
+    On-disk store of stage outputs keyed by content hash.
+
+    A file's mtime is its last use (written or read), so prune() can evict
+    least recently used outputs once the store exceeds max_bytes.
+    """
+
+    def __init__(self, root=STAGE_CACHE_DIR, max_bytes=STAGE_CACHE_MAX_BYTES):
+        self.root = root
+        self.max_bytes = max_bytes
+
+    def _path(self, stage_name, key):
+        return os.path.join(self.root, stage_name, f"{key}.pkl")
+
+    def has(self, stage_name, key) -> bool:
+        return os.path.exists(self._path(stage_name, key))
+
+    def get(self, stage_name, key):
+        path = self._path(stage_name, key)
+        with open(path, "rb") as f:
+            value = pickle.load(f)
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            # Pruned by a concurrent run after the read
+            pass
+        return value
+
+    def put(self, stage_name, key, value):
+        path = self._path(stage_name, key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        # Atomic publish: concurrent workers never see a partial file
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+
+    def prune(self) -> int:
+        """
+        Evicts least recently used outputs until the store fits max_bytes.
+
+        Returns:
+            int: Number of outputs removed.
+        """
+        entries = []
+        for stage in STAGES:
+            try:
+                with os.scandir(os.path.join(self.root, stage.name)) as it:
+                    for entry in it:
+                        if entry.name.endswith(".pkl"):
+                            stat = entry.stat()
+                            entries.append((stat.st_mtime_ns, stat.st_size, entry.path))
+            except FileNotFoundError:
+                continue
+
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+                removed += 1
+            except FileNotFoundError:
+                pass
+            total -= size
+        return removed
+
+    def _source_path(self, ticker):
+        return os.path.join(self.root, "sources", f"{ticker}.json")
+
+    def source_hash(self, ticker) -> str:
+        """
+        Content hash of a ticker's cached CSV.
+
+        A ticker with only the columnar copy (which load_from_cache serves)
+        is identified by its manifest, rewritten with every columnar write.
+        Hashes are remembered per (file, size, mtime) so unchanged files are
+        not reread. Each ticker has its own record, so concurrent workers
+        never overwrite each other's entries.
+        """
+        file_path = data_persistence._csv_path(ticker)
+        if not os.path.exists(file_path):
+            file_path = os.path.join(data_persistence._columnar_path(ticker), data_persistence.MANIFEST_FILE)
+        signature = {"file": os.path.basename(file_path), **data_persistence._csv_signature(file_path)}
+        source_path = self._source_path(ticker)
+        try:
+            with open(source_path, "r") as f:
+                entry = json.load(f)
+            if entry["signature"] == signature:
+                return entry["hash"]
+        except (FileNotFoundError, json.JSONDecodeError, KeyError):
+            pass
+
+        with open(file_path, "rb") as f:
+            digest = _sha256(f.read())
+
+        os.makedirs(os.path.dirname(source_path), exist_ok=True)
+        tmp_path = f"{source_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"signature": signature, "hash": digest}, f)
+        os.replace(tmp_path, source_path)
+        return digest
+
+def _stage_options(stage: Stage, options: dict) -> dict:
+    return {name: options.get(name, False) for name in stage.options}
+
+def stage_keys(ticker, cache: StageCache, options=None) -> list:
+    """
+    Computes every stage key of a ticker's chain without running it.
+
+    Args:
+        ticker (str): Ticker symbol.
+        cache (StageCache): Stage store (source hashes).
+        options (dict, optional): Run options, e.g. { 'compact': True }.
+
+    Returns:
+        list: Keys aligned with STAGES.
+    """
+    options = options or {}
+    upstream = cache.source_hash(ticker)
+    keys = []
+    for stage in STAGES:
+        payload = {
+            "stage": stage.name,
+            "upstream": upstream,
+            "code": code_version(stage),
+            "settings": {name: getattr(settings, name) for name in stage.settings},
+            "options": _stage_options(stage, options)
+        }
+        upstream = _sha256(json.dumps(payload, sort_keys=True).encode())
+        keys.append(upstream)
+    return keys
+
+def evaluate(ticker, cache: StageCache, compact=False):
+    """
+    Produces a ticker's final stage output, executing only stale stages.
+
+    Args:
+        ticker (str): Ticker symbol.
+        cache (StageCache): Stage store.
+        compact (bool): Low-memory clean / features (float32); cached
+            separately from full-precision outputs.
+
+    Returns:
+        tuple: (verdict, { stage: HIT/COMPUTED/SKIPPED })
+    """
+    with memory_profiling.ticker(ticker):
+        with instrumentation.span("stage.cache_keys"):
+            options = {'compact': compact}
+            keys = stage_keys(ticker, cache, options)
+        outcomes = {stage.name: SKIPPED for stage in STAGES}
+
+        # Deepest cached stage; everything above it is not needed
+        start = 0
+        value = None
+        for i in range(len(STAGES) - 1, -1, -1):
+            if cache.has(STAGES[i].name, keys[i]):
+                value = cache.get(STAGES[i].name, keys[i])
+                outcomes[STAGES[i].name] = HIT
+                start = i + 1
+                break
+
+        for stage, key in zip(STAGES[start:], keys[start:]):
+            value = stage.func(ticker, value, **_stage_options(stage, options))
+            cache.put(stage.name, key, value)
+            outcomes[stage.name] = COMPUTED
+
+        return value, outcomes
+
+def evaluate_tickers(tickers, cache: StageCache = None, compact=False):
+    """
+    Evaluates tickers in order, isolating errors per ticker.
+
+    Shared by the serial run and every parallel_runner worker, so a failing
+    ticker is handled the same way whatever the worker count.
+
+    Args:
+        tickers (iterable): Tickers to evaluate.
+        cache (StageCache, optional): Evaluate through the memoized DAG;
+            without one every stage runs (main_simulation.evaluate_ticker).
+        compact (bool): Low-memory clean / features (see evaluate).
+
+    Returns:
+        list: [(ticker, verdict or None, error or None, stage outcomes or None), ...]
+              in input order.
+    """
+    # Imported lazily: main_simulation imports this module
+    import main_simulation
+
+    results = []
+    for ticker in tickers:
+        try:
+            if cache is not None:
+                verdict, outcomes = evaluate(ticker, cache, compact)
+            else:
+                verdict, outcomes = main_simulation.evaluate_ticker(ticker, compact), None
+            results.append((ticker, verdict, None, outcomes))
+        except Exception as e:
+            results.append((ticker, None, f"{type(e).__name__}: {e}", None))
+    return results
+
+def collect_results(results, verdicts, errors, report=None):
+    """
+    Splits evaluate_tickers results into verdicts, errors and stage outcomes.
+
+    Args:
+        results (list): Output of evaluate_tickers.
+        verdicts (list): Appended with successful verdicts, in order.
+        errors (dict): Updated with { ticker: error message }.
+        report (DagReport, optional): Updated with stage outcomes.
+    """
+    for ticker, verdict, error, outcomes in results:
+        if error is None:
+            verdicts.append(verdict)
+        else:
+            errors[ticker] = error
+        if outcomes is not None and report is not None:
+            report.outcomes[ticker] = outcomes
+
+def run_pipeline(tickers, memoize=True, cache: StageCache = None, compact=False):
+    """
+    Runs the pipeline for every ticker in this process.
+
+    Serial counterpart of parallel_runner.run_parallel: same error isolation
+    and same return value.
+
+    Args:
+        tickers (iterable): Tickers to evaluate (must be cached).
+        memoize (bool): Evaluate through the stage cache.
+        cache (StageCache, optional): Stage store. Defaults to STAGE_CACHE_DIR.
+        compact (bool): Low-memory clean / features (see evaluate).
+
+    Returns:
+        tuple: (verdicts in ticker order (failed tickers omitted),
+                { ticker: error message }, DagReport or None)
+    """
+    cache = (cache or StageCache()) if memoize else None
+    report = DagReport() if memoize else None
+    verdicts = []
+    errors = {}
+    collect_results(evaluate_tickers(tickers, cache, compact), verdicts, errors, report)
+    if cache is not None:
+        report.evicted = cache.prune()
+    return verdicts, errors, report
@@ -5,6 +5,7 @@ This module implements priority-based deterministic market regime detection.
 It uses frozen thresholds to classify the market state into 4 regimes.
 """
 
+import numpy as np
 from config import settings
 
 # Regime Constants
@@ -13,6 +14,14 @@ REGIME_VOLATILE = "VOLATILE"
 REGIME_CALM = "CALM"
 REGIME_TRANSITION = "TRANSITION"
 
+# Compact integer codes for batch evaluation (index into REGIMES)
+REGIMES = (REGIME_STRESS, REGIME_VOLATILE, REGIME_CALM, REGIME_TRANSITION)
+CODE_STRESS, CODE_VOLATILE, CODE_CALM, CODE_TRANSITION = range(len(REGIMES))
+REGIME_CONFIDENCE = np.array([1.0, 1.0, 1.0, 0.5])
+
+# Optional feature column carrying precomputed codes, so agents skip re-detection
+REGIME_CODE_COLUMN = "Regime_Code"
+
 def detect_regime(feature_row):
     """
     Detects the market regime for a single timestamp based on features.
@@ -49,3 +58,46 @@ def detect_regime(feature_row):
         
     # 4. DEFAULT TO TRANSITION
     return REGIME_TRANSITION, 0.5
+
+def detect_regimes(features):
+    """
+    Detects the regime of every row of a feature column set in one pass.
+
+    Same priority logic as detect_regime: STRESS > VOLATILE > CALM > TRANSITION.
+
+    Args:
+        features (pd.DataFrame or dict): Columns 'Drawdown_20D' and 'Volatility_20D'
+            (arrays of any matching shape, or scalars).
+
+    Returns:
+        tuple: (Regime codes (np.int8 array, index into REGIMES), Confidences (float array))
+    """
+    drawdown = np.asarray(features['Drawdown_20D'], dtype=np.float64)
+    volatility = np.asarray(features['Volatility_20D'], dtype=np.float64)
+
+    codes = np.select(
+        [
+            drawdown < settings.MAX_DRAWDOWN_LIMIT,
+            volatility > settings.VOLATILITY_THRESHOLD_HIGH,
+            volatility < settings.VOLATILITY_THRESHOLD_LOW
+        ],
+        [CODE_STRESS, CODE_VOLATILE, CODE_CALM],
+        default=CODE_TRANSITION
+    ).astype(np.int8)
+    return codes, REGIME_CONFIDENCE[codes]
+
+def regime_codes(features):
+    """
+    Returns regime codes for a feature batch, reusing a precomputed
+    REGIME_CODE_COLUMN when the caller already classified the rows.
+
+    Args:
+        features (pd.DataFrame, pd.Series or dict): Feature columns/row.
+
+    Returns:
+        np.ndarray: Regime codes (np.int8, at least 1-D).
+    """
+    codes = features.get(REGIME_CODE_COLUMN)
+    if codes is None:
+        codes, _ = detect_regimes(features)
+    return np.atleast_1d(np.asarray(codes).astype(np.int8))
@@ -1,36 +1,39 @@
 import json
 import os
+import threading
+import time
 from dotenv import load_dotenv
-from langchain_google_genai import ChatGoogleGenerativeAI
-from langchain.tools import tool
 import warnings
 warnings.filterwarnings('ignore', category=DeprecationWarning)
-from langgraph.prebuilt import create_react_agent
+from verdict_index import VerdictIndex
+import repo_root  # noqa: F401  (repo-level modules below)
+import instrumentation
+from intent_router import IntentRouter, FALLBACK
+from response_cache import ResponseCache
 
 load_dotenv()
 
-# Initialize the Gemini model
-llm = ChatGoogleGenerativeAI(
-    model="gemini-2.0-flash",
-    temperature=0.7
-)
+# Ticker-indexed verdicts, re-read only when data.json changes
+verdict_index = VerdictIndex()
 
-# Define the tool
-@tool(description="Get stock data from backend JSON")
+# Define the tool (wrapped with langchain's @tool when the agent is built)
 def get_data(stock_name: str) -> dict:
     try:
-        file_path = "server/data.json" if os.path.exists("server/data.json") else "data.json"
-        with open(file_path, "r") as file:
-            data = json.load(file)
-        return {
-            "stock_name": stock_name,
-            "data": data
-        }
+        record = verdict_index.lookup(stock_name)
     except FileNotFoundError:
         return {"error": "data.json not found"}
 
-# Create tools list
-tools = [get_data]
+    if record is None:
+        return {
+            "stock_name": stock_name,
+            "error": "No simulation data for this stock",
+            "universe_size": len(verdict_index.tickers()),
+            "closest_tickers": verdict_index.suggestions(stock_name)
+        }
+    return {
+        "stock_name": stock_name,
+        "data": record
+    }
 
 # Create agent using LangGraph (modern standard)
 # We need to define the system message for the react agent
@@ -47,25 +50,136 @@ Example Response:
 "The simulation verdict for TCS is HOLD (High Risk). The disagreement index is 0.48, indicating conflict among agents. Please note this is a simulation output, not financial advice."
 """
 
-agent_executor = create_react_agent(llm, tools)
+def _text(content) -> str:
+    """Plain text of a message content (Gemini may return a list of parts)."""
+    if isinstance(content, str):
+        return content
+    return "".join(p if isinstance(p, str) else p.get("text", "") for p in content)
+
+class AgentModel:
+    """
+    LangGraph ReAct agent over Gemini, built on first use.
+
+    Args:
+        llm (optional): Chat model to use instead of Gemini.
+    """
+
+    def __init__(self, llm=None):
+        self.llm = llm
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def _agent(self):
+        with self._lock:
+            if self._executor is None:
+                from langchain.tools import tool
+                from langgraph.prebuilt import create_react_agent
+
+                llm = self.llm
+                if llm is None:
+                    from langchain_google_genai import ChatGoogleGenerativeAI
+                    # Initialize the Gemini model
+                    llm = ChatGoogleGenerativeAI(
+                        model="gemini-2.0-flash",
+                        temperature=0.7
+                    )
+                description = "Get the simulation verdict for one stock (ticker or company name)"
+                self._executor = create_react_agent(llm, [tool(description=description)(get_data)])
+            return self._executor
+
+    def _messages(self, user_message):
+        # Pass system message as the first message in the list
+        return {
+            "messages": [
+                ("system", system_message),
+                ("user", user_message)
+            ]
+        }
+
+    def invoke(self, user_message: str):
+        # LangGraph returns a dictionary with 'messages'
+        with instrumentation.span("chat.llm"):
+            result = self._agent().invoke(self._messages(user_message))
+
+        # Extract the last message content (AI response)
+        return result["messages"][-1].content
+
+    def stream(self, user_message: str):
+        """Yields answer text as the model produces it (tool calls are skipped)."""
+        for chunk, metadata in self._agent().stream(self._messages(user_message), stream_mode="messages"):
+            if metadata.get("langgraph_node") == "agent":
+                text = _text(chunk.content)
+                if text:
+                    yield text
+
+# Anything with invoke(question) and stream(question); tests swap in a local fake via set_model
+model = AgentModel()
+
+def set_model(new_model):
+    global model
+    model = new_model
+
+# Model answers keyed by (normalized question, data version); CHAT_CACHE_DB enables the shared disk tier
+response_cache = ResponseCache(disk_path=os.getenv("CHAT_CACHE_DB"))
+
+def _data_version():
+    """Version for response cache keys; None without data.json (answers are not cached)."""
+    try:
+        return verdict_index.version
+    except FileNotFoundError:
+        return None
+
+def ask_agent(user_message: str):
+    version = _data_version()
+    if version is None:
+        return model.invoke(user_message)
+    return response_cache.get_or_compute(user_message, version, model.invoke)
+
+# Simple lookup/compare/list questions are answered from templates, the rest by the agent
+router = IntentRouter(verdict_index, fallback=ask_agent)
 
 # Main function
 def chat(user_message: str):
-    # LangGraph returns a dictionary with 'messages'
-    # Pass system message as the first message in the list
-    result = agent_executor.invoke({
-        "messages": [
-            ("system", system_message),
-            ("user", user_message)
-        ]
-    })
-    
-    # Extract the last message content (AI response)
-    last_message = result["messages"][-1].content
-    
-    return {
-        "response": last_message
-    }
+    with instrumentation.span("chat"):
+        return router.route(user_message)
+
+def stream_chat(user_message: str):
+    """
+    Streaming counterpart of chat().
+
+    Returns:
+        tuple: (intent, iterator of text chunks). Closing the iterator early
+               (client gone) stops the model stream and skips caching.
+    """
+    start = time.perf_counter()
+    intent, text = router.answer(user_message)
+    if intent is not None:
+        router.metrics.record(intent, time.perf_counter() - start)
+        return intent, iter([text])
+
+    version = _data_version()
+    cached = response_cache.get(user_message, version) if version is not None else None
+    if cached is not None:
+        router.metrics.record(FALLBACK, time.perf_counter() - start)
+        return FALLBACK, iter([_text(cached)])
+
+    def chunks():
+        parts = []
+        tokens = model.stream(user_message)
+        try:
+            for part in tokens:
+                parts.append(part)
+                yield part
+            if version is not None:
+                response_cache.put(user_message, version, "".join(parts))
+            router.metrics.record(FALLBACK, time.perf_counter() - start)
+            instrumentation.observe("chat.llm_stream", time.perf_counter() - start)
+        finally:
+            close = getattr(tokens, "close", None)
+            if close is not None:
+                close()
+
+    return FALLBACK, chunks()
 
 # chat1 = chat("should I buy Amazon stock today?")
 # print(chat1)
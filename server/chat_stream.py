@@ -0,0 +1,80 @@
+"""
+CHAT STREAMING
+--------------
+Server-sent events and admission control for the chat endpoints.
+
+- ConcurrencyLimiter caps in-flight chat requests so slow model calls
+  cannot take every server thread; /api/health never goes through it.
+- sse_events turns a chunk iterator into an SSE body and closes the
+  iterator when the client disconnects, which cancels the model stream.
+"""
+
+import json
+import os
+import threading
+
+MAX_CONCURRENT_CHATS = int(os.getenv("CHAT_MAX_CONCURRENT", "8"))
+ADMISSION_TIMEOUT = float(os.getenv("CHAT_ADMISSION_TIMEOUT", "2.0"))   # Seconds to wait for a slot
+
+class ConcurrencyLimiter:
+    """
+    Bounded slot pool with counters (thread-safe).
+    """
+
+    def __init__(self, limit=MAX_CONCURRENT_CHATS, timeout=ADMISSION_TIMEOUT):
+        self.limit = limit
+        self.timeout = timeout
+        self._slots = threading.BoundedSemaphore(limit)
+        self._lock = threading.Lock()
+        self.active = 0
+        self.admitted = 0
+        self.rejected = 0
+
+    def acquire(self) -> bool:
+        if not self._slots.acquire(timeout=self.timeout):
+            with self._lock:
+                self.rejected += 1
+            return False
+        with self._lock:
+            self.active += 1
+            self.admitted += 1
+        return True
+
+    def release(self):
+        with self._lock:
+            self.active -= 1
+        self._slots.release()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "limit": self.limit,
+                "active": self.active,
+                "admitted": self.admitted,
+                "rejected": self.rejected
+            }
+
+def sse(data, event=None) -> str:
+    """Formats one server-sent event (data is JSON-encoded)."""
+    lines = [f"event: {event}"] if event else []
+    lines.append(f"data: {json.dumps(data)}")
+    return "\n".join(lines) + "\n\n"
+
+def sse_events(intent, chunks):
+    """
+    SSE body: one 'token' event per chunk, then 'done' (or 'error').
+
+    The generator is closed by the server when the client goes away; the
+    finally block then closes `chunks`, stopping the upstream model call.
+    """
+    try:
+        yield sse({"intent": intent}, event="start")
+        for chunk in chunks:
+            yield sse({"text": chunk}, event="token")
+        yield sse({"intent": intent}, event="done")
+    except Exception as e:
+        yield sse({"error": str(e)}, event="error")
+    finally:
+        close = getattr(chunks, "close", None)
+        if close is not None:
+            close()
@@ -0,0 +1,223 @@
+"""
+INTENT ROUTER
+-------------
+Deterministic fast path in front of the LLM agent.
+
+Simple questions that the verdict records answer completely are matched
+with regular expressions and rendered from templates:
+- lookup:  "What is the verdict for TCS?", "Should I buy Reliance?"
+- compare: "Compare TCS and Reliance", "TCS vs HDFC Bank"
+- list:    "Which stocks do you cover?", "Which stocks are a BUY?"
+
+Anything else falls through to the fallback model, including lookups whose
+name does not resolve but still mentions a covered symbol, a conjunction
+("TCS or Reliance") or only a pronoun ("Should I buy it?"), and compares
+with a name outside the simulated universe. Hit rate and latency are tracked
+per intent.
+"""
+
+import re
+import threading
+import time
+
+DISCLAIMER = "Please note this is a simulation output, not financial advice."
+
+LOOKUP = "lookup"
+COMPARE = "compare"
+LIST = "list"
+FALLBACK = "fallback"
+
+# Each pattern must match the whole question (after trimming punctuation)
+_LOOKUP_PATTERNS = (
+    re.compile(r"^(?:what(?:'s| is)(?: the)?|show(?: me)?(?: the)?|get(?: the)?)\s+(?:latest\s+|simulation\s+)*"
+               r"(?:verdict|signal|recommendation|rating|call)\s+(?:for|on|of)\s+(?P<name>.+)$", re.I),
+    re.compile(r"^should i (?:buy|sell|hold)\s+(?P<name>.+?)(?:\s+(?:stock|shares))?(?:\s+(?:today|now))?$", re.I),
+    re.compile(r"^(?:is|are)\s+(?P<name>.+?)\s+a\s+(?:buy|sell|hold)(?:\s+(?:today|now))?$", re.I),
+    re.compile(r"^(?P<name>[\w.&\- ]+?)\s+(?:verdict|signal|recommendation)$", re.I),
+)
+
+_COMPARE_PATTERNS = (
+    re.compile(r"^compare\s+(?:the\s+)?(?:verdicts?\s+(?:for|of)\s+)?(?P<a>.+?)\s+(?:and|with|vs\.?|versus)\s+(?P<b>.+)$", re.I),
+    re.compile(r"^(?P<a>[\w.&\- ]+?)\s+(?:vs\.?|versus)\s+(?P<b>[\w.&\- ]+)$", re.I),
+)
+
+_LIST_PATTERNS = (
+    re.compile(r"^(?:which|what)\s+(?:stocks|tickers|companies)\s+(?:are|have)\s+(?:a\s+|rated\s+)?(?P<action>buy|sell|hold)s?$", re.I),
+    re.compile(r"^(?:list|show)(?: me)?(?: all)?(?: the)?\s+(?P<action>buy|sell|hold)\s+(?:stocks|tickers|verdicts|signals)$", re.I),
+    re.compile(r"^(?:which|what)\s+(?:stocks|tickers|companies)\s+(?:do you|can you)\s+(?:cover|have|track|support)$", re.I),
+    re.compile(r"^(?:list|show)(?: me)?(?: all)?(?: the)?\s+(?:stocks|tickers|verdicts|universe)$", re.I),
+)
+
+# Trimmed from captured lookup names: "TCS today", "more TCS"
+_TRAILING_TIME = re.compile(r"(?:\s+(?:today|now|right now|currently|at the moment))+$", re.I)
+_LEADING_QUANTIFIER = re.compile(r"^(?:(?:more|some|any|a few|a little)\s+)+", re.I)
+
+# Unresolved names that are not a single company name
+_CONJUNCTION = re.compile(r"\b(?:and|or|vs|versus)\b", re.I)
+_PRONOUN = re.compile(r"^(?:it|this|that|them|these|those|one)(?:\s+(?:one|stock|share|shares|company))?$", re.I)
+
+def _clean(question: str) -> str:
+    return re.sub(r"\s+", " ", question).strip().rstrip("?!. ")
+
+def _trim_name(name: str) -> str:
+    return _LEADING_QUANTIFIER.sub("", _TRAILING_TIME.sub("", name.strip())).strip()
+
+def render_verdict(record) -> str:
+    """One-paragraph template answer for a single verdict record."""
+    execution = "allowed" if record["execution_allowed"] else "not allowed"
+    return (
+        f"The simulation verdict for {record['ticker']} is {record['action']} "
+        f"({record['risk_level']} risk, {record['regime']} regime, as of {record['timestamp'][:10]}). "
+        f"Confidence is {record['confidence']:.0%}, the consensus score is {record['consensus_score']} "
+        f"and the disagreement index is {record['disagreement_index']}; execution is {execution}. "
+        f"Reason: {record['reason']}"
+    )
+
+class RouterMetrics:
+    """
+    Per-intent hit counts and cumulative latency (thread-safe).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.counts = {LOOKUP: 0, COMPARE: 0, LIST: 0, FALLBACK: 0}
+        self.seconds = {LOOKUP: 0.0, COMPARE: 0.0, LIST: 0.0, FALLBACK: 0.0}
+
+    def record(self, intent, seconds):
+        with self._lock:
+            self.counts[intent] += 1
+            self.seconds[intent] += seconds
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            total = sum(self.counts.values())
+            hits = total - self.counts[FALLBACK]
+            return {
+                "requests": total,
+                "fast_path_hits": hits,
+                "hit_rate": hits / total if total else 0.0,
+                "intents": {
+                    intent: {
+                        "count": count,
+                        "avg_latency_ms": 1000.0 * self.seconds[intent] / count if count else 0.0
+                    }
+                    for intent, count in self.counts.items()
+                }
+            }
+
+class IntentRouter:
+    """
+    Answers simple verdict questions from the VerdictIndex, else calls the fallback.
+
+    Args:
+        index (VerdictIndex): Source of verdict records.
+        fallback (callable): fallback(question) -> str, normally the LLM agent.
+    """
+
+    def __init__(self, index, fallback):
+        self.index = index
+        self.fallback = fallback
+        self.metrics = RouterMetrics()
+
+    def match(self, question: str):
+        """
+        Classifies a question without answering it.
+
+        Returns:
+            tuple: (intent, params) or (None, None) if no template applies.
+        """
+        text = _clean(question)
+        for pattern in _COMPARE_PATTERNS:
+            m = pattern.match(text)
+            if m:
+                return COMPARE, {"names": (m.group("a"), m.group("b"))}
+        for pattern in _LIST_PATTERNS:
+            m = pattern.match(text)
+            if m:
+                action = m.groupdict().get("action")
+                return LIST, {"action": action.upper() if action else None}
+        for pattern in _LOOKUP_PATTERNS:
+            m = pattern.match(text)
+            if m:
+                return LOOKUP, {"name": _trim_name(m.group("name"))}
+        return None, None
+
+    def _lookup(self, name):
+        record = self.index.lookup(name)
+        if record is None:
+            # Only a single unknown company name gets the "not covered" template;
+            # longer or compound questions, pronouns and text that mentions a
+            # covered symbol ("TCS and why") are left to the model
+            if (len(name.split()) > 3 or _CONJUNCTION.search(name) or _PRONOUN.match(name)
+                    or self.index.mentions(name)):
+                return None
+            universe = ", ".join(self.index.tickers())
+            return (
+                f"I only have simulation data for the simulated universe ({universe}); "
+                f"'{name}' is not part of it."
+            )
+        return render_verdict(record)
+
+    def _compare(self, names):
+        records = [self.index.lookup(name) for name in names]
+        if any(r is None for r in records):
+            return None
+        if records[0]["ticker"] == records[1]["ticker"]:
+            return render_verdict(records[0])
+
+        lines = [render_verdict(r) for r in records]
+        a, b = records
+        if a["consensus_score"] != b["consensus_score"]:
+            stronger = a if a["consensus_score"] > b["consensus_score"] else b
+            lines.append(f"{stronger['ticker']} has the stronger consensus score.")
+        return "\n".join(lines)
+
+    def _list(self, action):
+        records = [self.index.lookup(t) for t in self.index.tickers()]
+        if action is None:
+            summary = ", ".join(f"{r['ticker']} ({r['action']})" for r in records)
+            return f"The simulated universe covers {len(records)} stocks: {summary}."
+
+        matching = [r["ticker"] for r in records if r["action"] == action]
+        if not matching:
+            return f"No stock in the simulated universe currently has a {action} verdict."
+        return f"Stocks with a {action} verdict in the simulation: {', '.join(matching)}."
+
+    def answer(self, question: str):
+        """
+        Template answer for a simple question.
+
+        Returns:
+            tuple: (intent, text) or (None, None) if the question needs the model.
+        """
+        intent, params = self.match(question)
+        if intent is None:
+            return None, None
+
+        try:
+            if intent == LOOKUP:
+                text = self._lookup(params["name"])
+            elif intent == COMPARE:
+                text = self._compare(params["names"])
+            else:
+                text = self._list(params["action"])
+        except FileNotFoundError:
+            return None, None
+
+        if text is None:
+            return None, None
+        return intent, f"{text}\n{DISCLAIMER}"
+
+    def route(self, question: str) -> dict:
+        """
+        Answers a chat question via template or fallback.
+
+        Returns:
+            dict: {"response": str, "intent": str}
+        """
+        start = time.perf_counter()
+        intent, text = self.answer(question)
+        if intent is None:
+            intent, text = FALLBACK, self.fallback(question)
+        self.metrics.record(intent, time.perf_counter() - start)
+        return {"response": text, "intent": intent}
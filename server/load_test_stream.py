@@ -0,0 +1,175 @@
+"""
+Load test of the streaming chat endpoint against a local fake model.
+
+Starts the Flask app in-process on a free port, fires concurrent
+/api/chat/stream requests while probing /api/health, then checks that a
+client disconnect cancels the model stream and frees its slot.
+
+    python load_test_stream.py --clients 20 --latency 1.0 --limit 8
+"""
+import argparse
+import http.client
+import json
+import logging
+import statistics
+import threading
+import time
+
+from werkzeug.serving import make_server
+
+import chat_bot
+import main
+from chat_stream import ConcurrencyLimiter
+
+class FakeModel:
+    """Stand-in for the agent: waits `latency`, then yields tokens `token_delay` apart."""
+
+    def __init__(self, latency=1.0, token_delay=0.05, tokens=20):
+        self.latency = latency
+        self.token_delay = token_delay
+        self.tokens = tokens
+        self._lock = threading.Lock()
+        self.started = 0
+        self.completed = 0
+        self.cancelled = 0
+
+    def invoke(self, question):
+        return "".join(self.stream(question))
+
+    def stream(self, question):
+        with self._lock:
+            self.started += 1
+        try:
+            time.sleep(self.latency)
+            for i in range(self.tokens):
+                yield f"token{i} "
+                time.sleep(self.token_delay)
+        except GeneratorExit:
+            with self._lock:
+                self.cancelled += 1
+            raise
+        with self._lock:
+            self.completed += 1
+
+def _post_stream(port, question):
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=60)
+    conn.request("POST", "/api/chat/stream", body=json.dumps({"question": question}),
+                 headers={"Content-Type": "application/json"})
+    return conn, conn.getresponse()
+
+def stream_client(port, question, results):
+    start = time.perf_counter()
+    conn, resp = _post_stream(port, question)
+    if resp.status != 200:
+        results.append({"status": resp.status})
+        conn.close()
+        return
+
+    first_token = None
+    tokens = 0
+    for line in resp:
+        if line.startswith(b"event: token"):
+            tokens += 1
+            if first_token is None:
+                first_token = time.perf_counter() - start
+    results.append({
+        "status": 200,
+        "first_token": first_token,
+        "total": time.perf_counter() - start,
+        "tokens": tokens
+    })
+    conn.close()
+
+def health_prober(port, stop, latencies):
+    while not stop.is_set():
+        conn = http.client.HTTPConnection("127.0.0.1", port, timeout=10)
+        start = time.perf_counter()
+        conn.request("GET", "/api/health")
+        conn.getresponse().read()
+        latencies.append(time.perf_counter() - start)
+        conn.close()
+        time.sleep(0.05)
+
+def _pct(values, q):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))]
+
+def main_load_test(args):
+    fake = FakeModel(args.latency, args.token_delay, args.tokens)
+    chat_bot.set_model(fake)
+    main.chat_limiter = ConcurrencyLimiter(limit=args.limit, timeout=args.admission_timeout)
+
+    logging.getLogger("werkzeug").setLevel(logging.ERROR)
+    server = make_server("127.0.0.1", 0, main.app, threaded=True)
+    port = server.server_port
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    # 1. Concurrent streams + health probes
+    stop = threading.Event()
+    health = []
+    prober = threading.Thread(target=health_prober, args=(port, stop, health))
+    prober.start()
+
+    results = []
+    clients = [
+        threading.Thread(target=stream_client, args=(port, f"Explain load scenario {i} in detail", results))
+        for i in range(args.clients)
+    ]
+    wall = time.perf_counter()
+    for c in clients:
+        c.start()
+    for c in clients:
+        c.join()
+    wall = time.perf_counter() - wall
+    stop.set()
+    prober.join()
+
+    ok = [r for r in results if r["status"] == 200]
+    busy = [r for r in results if r["status"] == 503]
+    print(f"Streams: {len(ok)} ok, {len(busy)} rejected (503) of {args.clients} in {wall:.2f}s "
+          f"(limit={args.limit}, model latency={args.latency}s)")
+    if ok:
+        ttft = [r["first_token"] for r in ok]
+        total = [r["total"] for r in ok]
+        print(f"  time to first token: p50={statistics.median(ttft):.3f}s p95={_pct(ttft, 0.95):.3f}s")
+        print(f"  full response:       p50={statistics.median(total):.3f}s p95={_pct(total, 0.95):.3f}s")
+    print(f"Health: {len(health)} probes during load, p50={statistics.median(health) * 1000:.1f}ms "
+          f"max={max(health) * 1000:.1f}ms")
+
+    # 2. Client disconnect mid-stream cancels the model call
+    cancelled_before = fake.cancelled
+    conn, resp = _post_stream(port, "Explain the disconnect scenario")
+    while not resp.readline().startswith(b"event: token"):
+        pass
+    resp.close()     # Drops the connection mid-stream
+    conn.close()
+
+    deadline = time.time() + 10
+    while (fake.cancelled == cancelled_before or main.chat_limiter.active) and time.time() < deadline:
+        time.sleep(0.05)
+    print(f"Disconnect: model stream cancelled={fake.cancelled > cancelled_before}, "
+          f"active slots after={main.chat_limiter.active}")
+
+    print(f"Model: started={fake.started} completed={fake.completed} cancelled={fake.cancelled}")
+    print(f"Limiter: {main.chat_limiter.stats()}")
+    server.shutdown()
+
+    passed = (
+        len(ok) + len(busy) == args.clients
+        and all(r["tokens"] == args.tokens for r in ok)
+        and max(health) < args.latency
+        and fake.cancelled > cancelled_before
+        and main.chat_limiter.active == 0
+    )
+    print("\nLoad test passed." if passed else "\nLoad test FAILED.")
+    return passed
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Streaming chat load test with a fake model")
+    parser.add_argument("--clients", type=int, default=20)
+    parser.add_argument("--latency", type=float, default=1.0, help="Fake model latency before the first token (s)")
+    parser.add_argument("--token-delay", type=float, default=0.02)
+    parser.add_argument("--tokens", type=int, default=20)
+    parser.add_argument("--limit", type=int, default=8, help="Max concurrent chat requests")
+    parser.add_argument("--admission-timeout", type=float, default=2.0)
+    main_load_test(parser.parse_args())
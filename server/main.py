@@ -1,6 +1,19 @@
-from flask import Flask, jsonify, request
+from flask import Flask, Response, jsonify, request, stream_with_context
 from flask_cors import CORS
-from chat_bot import chat
+import repo_root  # noqa: F401  (repo-level modules below)
+import instrumentation
+from chat_bot import chat, stream_chat, router, response_cache, verdict_index
+from chat_stream import ConcurrencyLimiter, sse_events
+from verdict_payloads import VerdictPayloads
+
+# The server is long-lived: always record spans for /metrics
+instrumentation.enable()
+
+# Shared by both chat endpoints; health checks are never queued behind model calls
+chat_limiter = ConcurrencyLimiter()
+
+# Encoded once per simulation run, shared by every verdict request
+verdict_payloads = VerdictPayloads(verdict_index)
 
 app = Flask(__name__)
 CORS(app)
@@ -13,14 +26,95 @@ def home():
 def health():
   return jsonify({"status": "healthy"}), 200
 
+def payload_response(payload):
+  # Each encoding is a different representation, so it gets its own strong ETag
+  gzip = bool(request.accept_encodings["gzip"])
+  etag = f"{payload.etag}-gzip" if gzip else payload.etag
+  headers = {"ETag": f'"{etag}"', "Vary": "Accept-Encoding", "Cache-Control": "no-cache"}
+  if etag in request.if_none_match:
+    return Response(status=304, headers=headers)
+  if gzip:
+    headers["Content-Encoding"] = "gzip"
+    return Response(payload.gzip_body, mimetype='application/json', headers=headers)
+  return Response(payload.body, mimetype='application/json', headers=headers)
+
+@app.route('/api/verdicts', methods=['GET'])
+def verdicts_api():
+  try:
+    return payload_response(verdict_payloads.all())
+  except FileNotFoundError:
+    return jsonify({"error": "data.json not found"}), 503
+
+@app.route('/api/verdicts/<ticker>', methods=['GET'])
+def verdict_api(ticker):
+  try:
+    payload = verdict_payloads.ticker(ticker)
+  except FileNotFoundError:
+    return jsonify({"error": "data.json not found"}), 503
+  if payload is None:
+    return jsonify({
+      "error": f"No simulation data for '{ticker}'",
+      "closest_tickers": verdict_index.suggestions(ticker)
+    }), 404
+  return payload_response(payload)
+
 @app.route('/api/chat', methods=['POST'])
 def chat_api():
   data = request.get_json()
   user_question = data.get('question')
   if not user_question:
     return jsonify({"error": "Missing 'question' in request body"}), 400
-  response = chat(user_question)
+  if not chat_limiter.acquire():
+    return jsonify({"error": "Server busy, retry shortly"}), 503
+  try:
+    response = chat(user_question)
+  finally:
+    chat_limiter.release()
   return jsonify(response), 200
 
+@app.route('/api/chat/stream', methods=['POST'])
+def chat_stream_api():
+  data = request.get_json()
+  user_question = data.get('question')
+  if not user_question:
+    return jsonify({"error": "Missing 'question' in request body"}), 400
+  if not chat_limiter.acquire():
+    return jsonify({"error": "Server busy, retry shortly"}), 503
+
+  try:
+    intent, chunks = stream_chat(user_question)
+  except Exception:
+    chat_limiter.release()
+    raise
+  response = Response(
+    stream_with_context(sse_events(intent, chunks)),
+    mimetype='text/event-stream',
+    headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+  )
+  # Runs even if the client disconnects before the body is consumed
+  response.call_on_close(chat_limiter.release)
+  return response
+
+@app.route('/api/chat/metrics', methods=['GET'])
+def chat_metrics():
+  metrics = router.metrics.snapshot()
+  metrics["response_cache"] = response_cache.stats()
+  metrics["concurrency"] = chat_limiter.stats()
+  return jsonify(metrics), 200
+
+@app.route('/metrics', methods=['GET'])
+def prometheus_metrics():
+  lines = [instrumentation.prometheus_text().rstrip("\n")]
+  lines.append("# TYPE chat_router_requests_total counter")
+  for intent, m in router.metrics.snapshot()["intents"].items():
+    lines.append(f'chat_router_requests_total{{intent="{intent}"}} {m["count"]}')
+  cache = response_cache.stats()
+  lines.append("# TYPE chat_response_cache_lookups_total counter")
+  for outcome in ("hits", "disk_hits", "misses"):
+    lines.append(f'chat_response_cache_lookups_total{{outcome="{outcome}"}} {cache[outcome]}')
+  lines.append("# TYPE chat_active_requests gauge")
+  lines.append(f"chat_active_requests {chat_limiter.stats()['active']}")
+  return Response("\n".join(lines) + "\n", mimetype="text/plain; version=0.0.4")
+
 if __name__ == '__main__':
-  app.run(debug=True, port=5001)
\ No newline at end of file
+  app.run(debug=True, port=5001, threaded=True)
\ No newline at end of file
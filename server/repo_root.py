@@ -0,0 +1,16 @@
+"""
+REPOSITORY ROOT ON SYS.PATH
+---------------------------
+Server modules run as top-level modules from server/ (python server/main.py,
+python cli.py serve) but also use repo-level modules such as
+instrumentation. Importing this module is the one place that puts the
+repository root on sys.path; every server module that needs a repo-level
+module imports it first, so no module depends on another having run.
+"""
+
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.append(ROOT)
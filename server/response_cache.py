@@ -0,0 +1,149 @@
+"""
+RESPONSE CACHE
+--------------
+Caches model answers keyed by (normalized question, verdict data version).
+
+- Memory tier: LRU bounded by entry count, entries expire after a TTL.
+- Disk tier (optional): SQLite file shared by every worker process
+  (responses stored as JSON, since model content may be a list of parts).
+- A new simulation run changes the data version, so older entries are
+  never served again and simply age out.
+"""
+
+import hashlib
+import json
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+DEFAULT_MAX_ENTRIES = 1024
+DEFAULT_TTL = 24 * 60 * 60      # Seconds; most repeats arrive within a day
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    response TEXT NOT NULL,
+    created REAL NOT NULL
+) WITHOUT ROWID;
+"""
+
+def normalize_question(question: str) -> str:
+    """Lower-case, collapse whitespace, drop trailing punctuation."""
+    return re.sub(r"\s+", " ", question).strip().rstrip("?!. ").lower()
+
+def cache_key(question: str, version: str) -> str:
+    return hashlib.sha256(f"{version}\n{normalize_question(question)}".encode()).hexdigest()
+
+class ResponseCache:
+    """
+    LRU + TTL cache of chat responses with an optional SQLite tier.
+
+    Args:
+        max_entries (int): Memory tier capacity.
+        ttl (float): Entry lifetime in seconds (both tiers).
+        disk_path (str, optional): SQLite file for the shared tier.
+        clock (callable): Time source, injectable for tests.
+    """
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES, ttl=DEFAULT_TTL, disk_path=None, clock=time.time):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()   # key -> (created, response)
+
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+        self._conn = None
+        if disk_path:
+            self._conn = sqlite3.connect(disk_path, timeout=5.0, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(_SCHEMA)
+
+    def _fresh(self, created) -> bool:
+        return self.clock() - created < self.ttl
+
+    def _remember(self, key, created, response):
+        self._entries[key] = (created, response)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def get(self, question: str, version: str):
+        """
+        Returns the cached response, or None on a miss.
+        """
+        key = cache_key(question, version)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if self._fresh(entry[0]):
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return entry[1]
+                del self._entries[key]
+                self.expirations += 1
+
+            if self._conn is not None:
+                row = self._conn.execute(
+                    "SELECT created, response FROM responses WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None and self._fresh(row[0]):
+                    response = json.loads(row[1])
+                    self._remember(key, row[0], response)
+                    self.disk_hits += 1
+                    return response
+
+            self.misses += 1
+            return None
+
+    def put(self, question: str, version: str, response):
+        key = cache_key(question, version)
+        created = self.clock()
+        with self._lock:
+            self._remember(key, created, response)
+            if self._conn is not None:
+                with self._conn:
+                    self._conn.execute(
+                        "INSERT OR REPLACE INTO responses (key, response, created) VALUES (?, ?, ?)",
+                        (key, json.dumps(response), created)
+                    )
+                    self._conn.execute("DELETE FROM responses WHERE created <= ?", (created - self.ttl,))
+
+    def get_or_compute(self, question: str, version: str, compute):
+        """
+        Cached response, computing and storing it on a miss.
+
+        Args:
+            question (str): Raw user question.
+            version (str): Verdict data version (VerdictIndex.version).
+            compute (callable): compute(question) -> response (JSON-serializable).
+
+        Returns:
+            object: The response.
+        """
+        response = self.get(question, version)
+        if response is None:
+            response = compute(question)
+            self.put(question, version, response)
+        return response
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.disk_hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": (self.hits + self.disk_hits) / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations
+            }
@@ -0,0 +1,108 @@
+"""
+Offline check of the intent router: template answers for simple questions,
+fallthrough to a local stub model (no Gemini / API key needed) for the rest.
+Runs on a fixture verdict file, not the live data.json; exits 1 on any failure.
+"""
+import json
+import os
+import sys
+import tempfile
+from verdict_index import VerdictIndex
+from intent_router import IntentRouter, DISCLAIMER, LOOKUP, COMPARE, LIST, FALLBACK
+
+def fixture_verdict(ticker, action, regime):
+    return {
+        "ticker": ticker,
+        "timestamp": "2023-12-29T00:00:00",
+        "action": action,
+        "confidence": 1.0,
+        "is_simulation": True,
+        "execution_allowed": action != "HOLD",
+        "consensus_score": 0.1,
+        "disagreement_index": 0.2,
+        "risk_level": "LOW" if action != "HOLD" else "MEDIUM",
+        "regime": regime,
+        "regime_confidence": 1.0,
+        "reason": "Fixture verdict."
+    }
+
+FIXTURE = [
+    fixture_verdict("RELIANCE.NS", "HOLD", "CALM"),
+    fixture_verdict("TCS.NS", "BUY", "CALM"),
+    fixture_verdict("HDFCBANK.NS", "SELL", "VOLATILE"),
+]
+
+class StubModel:
+    """Stands in for the LLM agent; records every question it receives."""
+
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, question):
+        self.calls.append(question)
+        return f"[stub] {question}"
+
+fixture_dir = tempfile.TemporaryDirectory()
+fixture_path = os.path.join(fixture_dir.name, "data.json")
+with open(fixture_path, "w") as f:
+    json.dump(FIXTURE, f)
+
+stub = StubModel()
+index = VerdictIndex(paths=(fixture_path,))
+router = IntentRouter(index, fallback=stub)
+
+cases = [
+    ("What is the verdict for TCS?", LOOKUP),
+    ("should I buy Reliance stock today?", LOOKUP),
+    ("Is HDFC Bank a buy", LOOKUP),
+    ("Should I buy Amazon?", LOOKUP),
+    ("What is the verdict for TCS today?", LOOKUP),
+    ("Should I buy more TCS?", LOOKUP),
+    ("Compare TCS and HDFC Bank", COMPARE),
+    ("TCS vs Reliance", COMPARE),
+    ("Which stocks do you cover?", LIST),
+    ("Which stocks are a HOLD?", LIST),
+    ("Compare TCS with Amazon", FALLBACK),
+    ("Why did the consensus for TCS drop after the last earnings call?", FALLBACK),
+    ("Explain how the skeptic agent works", FALLBACK),
+    ("Should I buy TCS or Reliance?", FALLBACK),
+    ("What is the verdict for TCS and why?", FALLBACK),
+    ("Should I buy it?", FALLBACK),
+]
+
+failures = 0
+for question, expected in cases:
+    result = router.route(question)
+    ok = result["intent"] == expected
+    if expected == FALLBACK:
+        ok = ok and stub.calls and stub.calls[-1] == question
+    else:
+        ok = ok and result["response"].endswith(DISCLAIMER)
+    failures += not ok
+    print(f"[{'OK' if ok else 'FAIL'}] {expected:<8} {question}", flush=True)
+    if not ok:
+        print(f"       got {result}", flush=True)
+
+# Trailing time words and leading quantifiers are not part of the name
+for question in ("What is the verdict for TCS today?", "Should I buy more TCS?"):
+    response = router.route(question)["response"]
+    ok = response.startswith("The simulation verdict for TCS.NS ")
+    failures += not ok
+    print(f"[{'OK' if ok else 'FAIL'}] TCS.NS   {question}", flush=True)
+    if not ok:
+        print(f"       got {response!r}", flush=True)
+
+# Other companies whose names merely start with a covered symbol stay unresolved
+for name in ("Reliance Power", "Reliance Capital", "Reliance Infrastructure"):
+    ok = index.resolve(name) is None
+    failures += not ok
+    print(f"[{'OK' if ok else 'FAIL'}] resolve  {name!r} -> {index.resolve(name)}", flush=True)
+
+metrics = router.metrics.snapshot()
+print(f"\nHit rate: {metrics['hit_rate']:.0%} ({metrics['fast_path_hits']}/{metrics['requests']})")
+for intent, m in metrics["intents"].items():
+    print(f"  {intent:<8} count={m['count']:<3} avg={m['avg_latency_ms']:.3f} ms")
+
+fixture_dir.cleanup()
+print("\nAll router checks passed." if not failures else f"\n{failures} router check(s) failed.")
+sys.exit(1 if failures else 0)
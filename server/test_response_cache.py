@@ -0,0 +1,81 @@
+"""
+Offline check of the chat response cache: normalization, LRU/TTL eviction,
+data-version invalidation, the shared SQLite tier and chat without a
+data.json (answered, not cached). Exits 1 on any failure.
+"""
+import os
+import sys
+import tempfile
+from response_cache import ResponseCache
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+calls = []
+def model(question):
+    calls.append(question)
+    return f"answer {len(calls)}"
+
+clock = FakeClock()
+cache = ResponseCache(max_entries=2, ttl=60, clock=clock)
+
+checks = []
+a1 = cache.get_or_compute("What is the outlook for TCS?", "v1", model)
+a2 = cache.get_or_compute("  what is the outlook   for tcs ", "v1", model)
+checks.append(("normalized repeat is a hit", a1 == a2 and len(calls) == 1))
+
+cache.get_or_compute("What is the outlook for TCS?", "v2", model)
+checks.append(("new data version misses", len(calls) == 2))
+
+cache.get_or_compute("q3", "v2", model)
+cache.get_or_compute("What is the outlook for TCS?", "v1", model)
+checks.append(("LRU evicts the oldest entry", len(calls) == 4 and cache.evictions >= 1))
+
+clock.now = 61
+cache.get_or_compute("q3", "v2", model)
+checks.append(("TTL expires entries", len(calls) == 5 and cache.expirations == 1))
+
+with tempfile.TemporaryDirectory() as tmp:
+    db = os.path.join(tmp, "chat_cache.sqlite")
+    worker_a = ResponseCache(disk_path=db, clock=clock)
+    worker_b = ResponseCache(disk_path=db, clock=clock)
+    worker_a.put("Explain the skeptic agent", "v2", [{"type": "text", "text": "parts"}])
+    shared = worker_b.get("explain the skeptic agent?", "v2")
+    checks.append(("disk tier is shared across workers", shared == [{"type": "text", "text": "parts"}] and worker_b.disk_hits == 1))
+
+# Without data.json there is no data version: fallback questions still reach
+# the model (plain and streamed) and nothing is cached
+import chat_bot
+
+class FakeModel:
+    def invoke(self, question):
+        return f"model: {question}"
+
+    def stream(self, question):
+        yield "model: "
+        yield question
+
+with tempfile.TemporaryDirectory() as tmp:
+    chat_bot.verdict_index.paths = (os.path.join(tmp, "data.json"),)
+    chat_bot.set_model(FakeModel())
+    question = "Explain how the skeptic agent works"
+    try:
+        answer = chat_bot.chat(question)
+        _, chunks = chat_bot.stream_chat(question)
+        streamed = "".join(chunks)
+        ok = (answer["response"] == f"model: {question}" and streamed == f"model: {question}"
+              and chat_bot.response_cache.stats()["entries"] == 0)
+    except FileNotFoundError:
+        ok = False
+    checks.append(("chat without data.json answers and skips the cache", ok))
+
+for name, ok in checks:
+    print(f"[{'OK' if ok else 'FAIL'}] {name}", flush=True)
+print(cache.stats())
+failed = [name for name, ok in checks if not ok]
+print("\nAll cache checks passed." if not failed else f"\n{len(failed)} cache check(s) failed.")
+sys.exit(1 if failed else 0)
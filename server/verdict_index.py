@@ -0,0 +1,157 @@
+"""
+VERDICT INDEX
+-------------
+In-process, ticker-indexed view of the simulation verdicts in data.json.
+
+The file is re-parsed only when its mtime or size changes, and lookups
+resolve loose names ("TCS", "Reliance", "hdfc bank") to universe symbols
+so tools can return a single compact record instead of the whole file.
+"""
+
+import difflib
+import hashlib
+import json
+import os
+import re
+import threading
+
+DATA_PATHS = ("server/data.json", "data.json")
+
+# Exchange suffixes and company-name noise stripped before matching
+_SUFFIXES = (".NS", ".BO")
+_NOISE_WORDS = ("LIMITED", "LTD", "INDUSTRIES", "STOCK", "SHARES", "SHARE")
+
+# Common names that do not reduce to the symbol by normalization alone
+ALIASES = {
+    "TATACONSULTANCYSERVICES": "TCS",
+    "TATACONSULTANCY": "TCS",
+    "HDFC": "HDFCBANK",
+    "RIL": "RELIANCE",
+}
+
+def normalize(name: str) -> str:
+    """Upper-case, drop exchange suffix and noise words, keep alphanumerics."""
+    name = name.strip().upper()
+    for suffix in _SUFFIXES:
+        if name.endswith(suffix):
+            name = name[:-len(suffix)]
+    words = [w for w in re.split(r"[^A-Z0-9&]+", name) if w and w not in _NOISE_WORDS]
+    return re.sub(r"[^A-Z0-9]", "", "".join(words))
+
+class VerdictIndex:
+    """
+    Ticker -> latest verdict, reloaded lazily when data.json changes.
+    """
+
+    def __init__(self, paths=DATA_PATHS):
+        self.paths = paths
+        self._lock = threading.Lock()
+        self._signature = None
+        self._digest = None
+        self._records = {}       # ticker -> verdict
+        self._symbols = {}       # normalized symbol -> ticker
+        self.reloads = 0
+
+    def _path(self):
+        for path in self.paths:
+            if os.path.exists(path):
+                return path
+        return None
+
+    def _refresh(self):
+        path = self._path()
+        if path is None:
+            raise FileNotFoundError("data.json not found")
+
+        stat = os.stat(path)
+        signature = (path, stat.st_mtime_ns, stat.st_size)
+        if signature == self._signature:
+            return
+
+        with self._lock:
+            if signature == self._signature:
+                return
+            with open(path, "rb") as f:
+                raw = f.read()
+            verdicts = json.loads(raw)
+
+            records = {v["ticker"]: v for v in verdicts}
+            self._symbols = {normalize(ticker): ticker for ticker in records}
+            self._records = records
+            self._digest = hashlib.sha256(raw).hexdigest()[:16]
+            self._signature = signature
+            self.reloads += 1
+
+    @property
+    def version(self) -> str:
+        """Content hash of the loaded data; changes whenever a new run lands."""
+        self._refresh()
+        return self._digest
+
+    def tickers(self) -> list:
+        self._refresh()
+        return list(self._records)
+
+    def resolve(self, name: str):
+        """
+        Resolves a loose stock name to a universe ticker.
+
+        Matches, in order: exact symbol, ALIASES, unique symbol prefix.
+
+        Returns:
+            str or None: Ticker symbol, or None if nothing matches.
+        """
+        self._refresh()
+        if name in self._records:
+            return name
+
+        key = normalize(name)
+        if not key:
+            return None
+
+        # Real symbols win over aliases (a universe may list both HDFC and HDFCBANK)
+        if key in self._symbols:
+            return self._symbols[key]
+        key = ALIASES.get(key, key)
+        if key in self._symbols:
+            return self._symbols[key]
+
+        # Unique abbreviation of a symbol ("HDFCB"). Longer names are not
+        # matched against shorter symbols: "Reliance Power" is not RELIANCE.
+        # Anything else is unknown; callers offer suggestions() instead.
+        prefixed = [t for s, t in self._symbols.items() if s.startswith(key)]
+        return prefixed[0] if len(prefixed) == 1 else None
+
+    def mentions(self, text: str) -> list:
+        """
+        Universe tickers named by a single word of text (exact symbol or alias).
+
+        Returns:
+            list: Tickers in order of first mention.
+        """
+        self._refresh()
+        found = []
+        for word in re.split(r"[^\w.&]+", text):
+            key = normalize(word)
+            if key not in self._symbols:
+                key = ALIASES.get(key, key)
+            ticker = self._symbols.get(key)
+            if ticker is not None and ticker not in found:
+                found.append(ticker)
+        return found
+
+    def lookup(self, name: str):
+        """
+        Returns the verdict record for a loose stock name.
+
+        Returns:
+            dict or None: The latest verdict, or None if unknown.
+        """
+        ticker = self.resolve(name)
+        return None if ticker is None else self._records[ticker]
+
+    def suggestions(self, name: str, n: int = 3) -> list:
+        """Closest known tickers, for 'not found' replies."""
+        self._refresh()
+        close = difflib.get_close_matches(normalize(name), self._symbols.keys(), n=n, cutoff=0.0)
+        return [self._symbols[s] for s in close]
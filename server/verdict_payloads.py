@@ -0,0 +1,69 @@
+"""
+VERDICT PAYLOADS
+----------------
+Pre-serialized HTTP bodies for the verdict read API.
+
+For each data version (a new simulation run) every response body is
+encoded once: the full list and one document per ticker, each as raw JSON
+bytes, gzip bytes and a strong ETag. Requests then only pick bytes.
+"""
+
+import gzip
+import hashlib
+import json
+import threading
+from dataclasses import dataclass
+
+@dataclass(frozen=True)
+class Payload:
+    body: bytes
+    gzip_body: bytes
+    etag: str
+
+def _payload(document) -> Payload:
+    body = json.dumps(document, separators=(",", ":")).encode()
+    return Payload(
+        body=body,
+        # mtime=0 keeps the compressed bytes identical across rebuilds
+        gzip_body=gzip.compress(body, compresslevel=6, mtime=0),
+        etag=hashlib.sha256(body).hexdigest()[:32]
+    )
+
+class VerdictPayloads:
+    """
+    Per-version cache of encoded verdict documents.
+
+    Args:
+        index (VerdictIndex): Source of verdict records and data version.
+    """
+
+    def __init__(self, index):
+        self.index = index
+        self._lock = threading.Lock()
+        self._built = (None, None, {})    # (version, all, { ticker: Payload }), swapped atomically
+        self.builds = 0
+
+    def _current(self):
+        version = self.index.version
+        if version != self._built[0]:
+            with self._lock:
+                if version != self._built[0]:
+                    records = [self.index.lookup(t) for t in self.index.tickers()]
+                    by_ticker = {r["ticker"]: _payload(r) for r in records}
+                    self._built = (version, _payload(records), by_ticker)
+                    self.builds += 1
+        return self._built
+
+    def all(self) -> Payload:
+        return self._current()[1]
+
+    def ticker(self, name: str):
+        """
+        Payload for one ticker (loose names are resolved).
+
+        Returns:
+            Payload or None: None if the name is not in the universe.
+        """
+        _, _, by_ticker = self._current()
+        ticker = self.index.resolve(name)
+        return None if ticker is None else by_ticker.get(ticker)
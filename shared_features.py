@@ -0,0 +1,192 @@
+"""
+SHARED FEATURE MATRICES
+-----------------------
+Hands feature matrices to worker processes through one
+multiprocessing.shared_memory segment instead of pickling DataFrames.
+
+    with SharedArrays.create({'Volatility_20D': matrix, ...}, meta) as shared:
+        pool.submit(worker, shared.descriptor, ...)       # a few hundred bytes
+
+    def worker(descriptor, ...):
+        with SharedArrays.attach(descriptor) as shared:
+            shared['Volatility_20D']                       # read-only view, no copy
+
+The parent (owner) writes every array once; workers map the same pages.
+Cleanup:
+- owner: close + unlink on exit of the with block, and a finalizer unlinks
+  the segment if the owner is garbage-collected or the interpreter exits
+  without reaching it;
+- hard crash of the owner (e.g. SIGKILL): multiprocessing's resource
+  tracker unlinks segments that were never unlinked;
+- workers only close their mapping; they never unlink, and their mappings
+  are untracked so no worker's tracker unlinks the segment when the worker
+  exits (SharedMemory(track=False) on Python 3.13+, resource_tracker.unregister
+  right after attaching before that). Before 3.13 a forked worker shares
+  the owner's tracker, so that unregister also drops the owner's entry;
+  the owner registers the name again before unlinking, and a SIGKILLed
+  owner whose workers already attached can leave the segment behind.
+"""
+
+import sys
+import weakref
+from multiprocessing import resource_tracker, shared_memory
+
+import numpy as np
+
+from feature_bank import FEATURE_COLUMNS
+
+ALIGNMENT = 64      # Byte alignment of each array inside the segment
+
+def _attach_segment(name):
+    """Maps a segment without letting the worker's resource tracker unlink it."""
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name=name, track=False)
+    # Before 3.13 attaching always registers the name
+    shm = shared_memory.SharedMemory(name=name)
+    resource_tracker.unregister(shm._name, "shared_memory")
+    return shm
+
+def _release(shm, unlink):
+    """Finalizer: close the mapping (if no views remain) and unlink if owner."""
+    try:
+        shm.close()
+    except BufferError:
+        # Views still exported; the mapping goes away with them
+        pass
+    if unlink:
+        if sys.version_info < (3, 13):
+            # A worker sharing this tracker may have unregistered the name;
+            # unlink() unregisters it again
+            resource_tracker.register(shm._name, "shared_memory")
+        try:
+            shm.unlink()
+        except FileNotFoundError:
+            pass
+
+class SharedArrays:
+    """
+    Named NumPy arrays in one shared-memory segment.
+
+    Use SharedArrays.create in the parent and SharedArrays.attach(descriptor)
+    in workers; do not call the constructor directly.
+    """
+
+    def __init__(self, shm, layout, meta, owner):
+        self.shm = shm
+        self.layout = layout        # { name: (offset, shape, dtype str) }
+        self.meta = meta
+        self.owner = owner
+        self._views = {}
+        self._finalizer = weakref.finalize(self, _release, shm, owner)
+
+    @classmethod
+    def create(cls, arrays, meta=None):
+        """
+        Copies arrays into a new segment (the one copy of the handoff).
+
+        Args:
+            arrays (dict): { name: np.ndarray }.
+            meta (dict, optional): Small picklable metadata (e.g. tickers).
+
+        Returns:
+            SharedArrays: Owner handle.
+        """
+        layout = {}
+        offset = 0
+        for name, array in arrays.items():
+            array = np.asarray(array)
+            layout[name] = (offset, array.shape, array.dtype.str)
+            offset += -(-array.nbytes // ALIGNMENT) * ALIGNMENT
+
+        shm = shared_memory.SharedMemory(create=True, size=max(offset, 1))
+        try:
+            for name, array in arrays.items():
+                start, shape, dtype = layout[name]
+                np.ndarray(shape, dtype=dtype, buffer=shm.buf, offset=start)[...] = array
+        except BaseException:
+            shm.close()
+            shm.unlink()
+            raise
+        return cls(shm, layout, dict(meta or {}), owner=True)
+
+    @classmethod
+    def attach(cls, descriptor):
+        """Maps an existing segment from its descriptor; arrays are read-only."""
+        shm = _attach_segment(descriptor["name"])
+        return cls(shm, descriptor["layout"], descriptor["meta"], owner=False)
+
+    @property
+    def descriptor(self) -> dict:
+        """Picklable handle for attach() (name, layout, meta)."""
+        return {"name": self.shm.name, "layout": self.layout, "meta": self.meta}
+
+    @property
+    def nbytes(self) -> int:
+        return self.shm.size
+
+    def keys(self):
+        return self.layout.keys()
+
+    def __getitem__(self, name):
+        view = self._views.get(name)
+        if view is None:
+            offset, shape, dtype = self.layout[name]
+            view = np.ndarray(shape, dtype=dtype, buffer=self.shm.buf, offset=offset)
+            if not self.owner:
+                view.flags.writeable = False
+            self._views[name] = view
+        return view
+
+    def close(self):
+        """Drops cached views, closes the mapping and (owner only) unlinks the segment."""
+        self._views.clear()
+        self._finalizer()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+def publish_panel(panel, fields=FEATURE_COLUMNS):
+    """
+    Shares a featured Panel's feature matrices, mask and calendar.
+
+    Args:
+        panel (Panel): Output of feature_engineering.compute_features(panel).
+        fields (iterable): Fields to share as (dates x tickers) float64 matrices.
+
+    Returns:
+        SharedArrays: Owner handle; meta holds the tickers and field names.
+    """
+    arrays = {field: np.ascontiguousarray(panel.field(field)) for field in fields}
+    arrays["mask"] = panel.mask
+    arrays["dates"] = panel.dates.astype("datetime64[ns]").view(np.int64)
+    return SharedArrays.create(arrays, meta={"tickers": panel.tickers, "fields": tuple(fields)})
+
+def latest_rows(shared, columns):
+    """
+    Latest usable feature row of each ticker column.
+
+    Args:
+        shared (SharedArrays): Output of publish_panel (owner or attached).
+        columns (iterable): Ticker positions.
+
+    Returns:
+        list: (ticker, ISO timestamp, { field: float }) or (ticker, None, None)
+              for tickers without a usable row.
+    """
+    mask = shared["mask"]
+    dates = shared["dates"].view("datetime64[ns]")
+    rows = []
+    for i in columns:
+        ticker = shared.meta["tickers"][i]
+        usable = np.flatnonzero(mask[:, i])
+        if len(usable) == 0:
+            rows.append((ticker, None, None))
+            continue
+        d = usable[-1]
+        timestamp = str(np.datetime_as_string(dates[d], unit="s"))
+        rows.append((ticker, timestamp, {field: float(shared[field][d, i]) for field in shared.meta["fields"]}))
+    return rows
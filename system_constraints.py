@@ -19,5 +19,33 @@ EXCHANGE = "NSE"
 # Timeframe: Immutable candle timeframe
 TIMEFRAME = "1D"
 
+# Historical Window: Fixed start date, exclusive end date
+START_DATE = "2020-01-01"
+END_DATE = "2024-01-01"
+
 # Execution Mode: Simulation only, no live trading
 EXECUTION_MODE = "SIMULATION"
+
+def load_universe(path=None):
+    """
+    Loads a market universe from a text file (one ticker per line).
+
+    Blank lines and '#' comments are ignored; duplicates keep their first
+    position. Without a path the frozen MARKET_UNIVERSE is returned.
+
+    Args:
+        path (str, optional): Universe file.
+
+    Returns:
+        tuple: Tickers in file order.
+    """
+    if path is None:
+        return MARKET_UNIVERSE
+
+    tickers = []
+    with open(path, "r") as f:
+        for line in f:
+            ticker = line.split("#", 1)[0].strip()
+            if ticker and ticker not in tickers:
+                tickers.append(ticker)
+    return tuple(tickers)
@@ -0,0 +1,93 @@
+"""
+Offline check of the concurrent fetch engine through a LocalProvider with
+injected latency and failures (no network): retries with backoff, retry
+exhaustion, rate limiting, batch coalescing and token-bucket validation.
+Exits 1 on any failure.
+"""
+import sys
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from data_fetcher import LocalProvider
+from fetch_engine import ConcurrentFetcher, TokenBucket
+
+START, END = "2020-01-01", "2020-03-01"
+
+def frame(seed):
+    dates = pd.bdate_range("2019-12-01", "2020-04-01")
+    close = 100 + np.random.default_rng(seed).standard_normal(len(dates)).cumsum()
+    return pd.DataFrame({"Close": close, "Volume": np.full(len(dates), 1000)}, index=dates)
+
+TICKERS = [f"T{i}" for i in range(8)]
+FRAMES = {ticker: frame(i) for i, ticker in enumerate(TICKERS)}
+WINDOWS = {ticker: (START, END) for ticker in TICKERS}
+EXPECTED_ROWS = len(pd.bdate_range(START, END, inclusive="left"))
+
+class RecordingSleep:
+    """Records backoff / throttle sleeps; sleeps for real so the bucket refills."""
+
+    def __init__(self):
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def __call__(self, seconds):
+        with self._lock:
+            self.calls.append(seconds)
+        time.sleep(seconds)
+
+checks = []
+
+# 1. Transient failures are retried until every ticker is fetched
+provider = LocalProvider(FRAMES, latency=0.01, failure_rate=0.3, seed=1)
+fetcher = ConcurrentFetcher(provider, max_workers=4, rate=1000, burst=10, max_retries=10, backoff=0.001)
+data, report = fetcher.fetch(WINDOWS)
+retried = [s for s in report.stats.values() if s.attempts > 1]
+checks.append(("transient failures are retried", list(data) == TICKERS and not report.failures() and retried))
+checks.append(("rows match the requested window", all(len(df) == EXPECTED_ROWS for df in data.values())))
+checks.append(("provider calls are counted", report.provider_calls == len(provider.calls)))
+
+# 2. Persistent failures stop after max_retries with exponential backoff
+sleep = RecordingSleep()
+provider = LocalProvider(FRAMES, failure_rate=1.0)
+fetcher = ConcurrentFetcher(provider, max_workers=1, rate=1000, burst=10, max_retries=3, backoff=0.001, sleep=sleep)
+data, report = fetcher.fetch({"T0": (START, END)})
+stats = report.stats["T0"]
+checks.append(("retries are bounded", not data and stats.attempts == 4 and len(provider.calls) == 4))
+checks.append(("error is reported", stats.error == "ConnectionError: Injected failure for T0"))
+checks.append(("backoff doubles", sleep.calls == [0.001, 0.002, 0.004]))
+
+# 3. The shared token bucket throttles to `rate` calls per second after the burst
+provider = LocalProvider(FRAMES)
+fetcher = ConcurrentFetcher(provider, max_workers=4, rate=40, burst=2, max_retries=0)
+data, report = fetcher.fetch(WINDOWS)
+throttled = sum(s.throttled for s in report.stats.values())
+min_wall = (len(TICKERS) - 2) / 40
+checks.append(("rate limit holds", len(data) == len(TICKERS) and report.wall_time >= 0.9 * min_wall and throttled > 0))
+
+# 4. Batch-capable providers get coalesced calls
+provider = LocalProvider(FRAMES, latency=0.01, supports_batch=True)
+fetcher = ConcurrentFetcher(provider, max_workers=2, rate=1000, burst=10, batch_size=3)
+data, report = fetcher.fetch(WINDOWS)
+checks.append(("tickers are coalesced", list(data) == TICKERS and report.provider_calls == 3
+               and {s.batch_size for s in report.stats.values()} == {3, 2}))
+
+# 5. Buckets that could never grant a request are rejected instead of blocking forever
+def raises_value_error(func):
+    try:
+        func()
+    except ValueError:
+        return True
+    return False
+
+checks.append(("zero burst is rejected", raises_value_error(lambda: ConcurrentFetcher(LocalProvider(FRAMES), burst=0))))
+checks.append(("capacity below one is rejected", raises_value_error(lambda: TokenBucket(rate=0.5, capacity=0.5))))
+checks.append(("oversized acquire is rejected", raises_value_error(lambda: TokenBucket(rate=1, capacity=2).acquire(3))))
+
+for name, ok in checks:
+    print(f"[{'OK' if ok else 'FAIL'}] {name}", flush=True)
+failed = [name for name, ok in checks if not ok]
+print("\nAll fetch engine checks passed." if not failed else f"\n{len(failed)} fetch engine check(s) failed.")
+sys.exit(1 if failed else 0)
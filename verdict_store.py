@@ -0,0 +1,193 @@
+"""
+VERDICT STORE
+-------------
+Persistent, indexed history of simulation verdicts (SQLite).
+
+- Primary key (ticker, timestamp): range scans per ticker never touch other rows.
+- A small `latest` table tracks the newest timestamp per ticker, so
+  "latest verdict for every ticker" costs O(tickers), not O(history).
+- export_json writes the legacy server/data.json for the current frontend.
+"""
+
+import json
+import os
+import sqlite3
+
+DB_PATH = "data/verdicts.sqlite"
+
+# Column order of output_schema.json ("is_simulation" is always true and not stored)
+FIELDS = (
+    "ticker", "timestamp", "action", "confidence", "is_simulation", "execution_allowed",
+    "consensus_score", "disagreement_index", "risk_level", "regime", "regime_confidence", "reason"
+)
+STORED_FIELDS = tuple(f for f in FIELDS if f != "is_simulation")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS verdicts (
+    ticker TEXT NOT NULL,
+    timestamp TEXT NOT NULL,
+    action TEXT NOT NULL,
+    confidence REAL NOT NULL,
+    execution_allowed INTEGER NOT NULL,
+    consensus_score REAL NOT NULL,
+    disagreement_index REAL NOT NULL,
+    risk_level TEXT NOT NULL,
+    regime TEXT NOT NULL,
+    regime_confidence REAL NOT NULL,
+    reason TEXT NOT NULL,
+    PRIMARY KEY (ticker, timestamp)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS latest (
+    ticker TEXT PRIMARY KEY,
+    timestamp TEXT NOT NULL
+) WITHOUT ROWID;
+"""
+
+_COLUMNS = ", ".join(STORED_FIELDS)
+
+class VerdictStore:
+    """
+    SQLite-backed verdict history keyed on (ticker, timestamp).
+    """
+
+    def __init__(self, path=DB_PATH):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(_SCHEMA)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self.conn.close()
+
+    @staticmethod
+    def _to_row(verdict):
+        row = [verdict[f] for f in STORED_FIELDS]
+        row[STORED_FIELDS.index("execution_allowed")] = int(verdict["execution_allowed"])
+        return row
+
+    @staticmethod
+    def _to_verdict(row):
+        verdict = dict(zip(STORED_FIELDS, row))
+        verdict["execution_allowed"] = bool(verdict["execution_allowed"])
+        verdict["is_simulation"] = True
+        return {f: verdict[f] for f in FIELDS}
+
+    def insert_many(self, verdicts) -> int:
+        """
+        Bulk-inserts verdicts in one transaction (re-runs overwrite the same key).
+
+        Args:
+            verdicts (iterable): Verdict dicts matching output_schema.json.
+
+        Returns:
+            int: Number of verdicts written.
+        """
+        rows = [self._to_row(v) for v in verdicts]
+        if not rows:
+            return 0
+
+        placeholders = ", ".join("?" for _ in STORED_FIELDS)
+        ticker_idx = STORED_FIELDS.index("ticker")
+        ts_idx = STORED_FIELDS.index("timestamp")
+
+        newest = {}
+        for row in rows:
+            ticker, ts = row[ticker_idx], row[ts_idx]
+            if ts > newest.get(ticker, ""):
+                newest[ticker] = ts
+
+        with self.conn:
+            self.conn.executemany(
+                f"INSERT OR REPLACE INTO verdicts ({_COLUMNS}) VALUES ({placeholders})", rows
+            )
+            self.conn.executemany(
+                "INSERT INTO latest (ticker, timestamp) VALUES (?, ?) "
+                "ON CONFLICT(ticker) DO UPDATE SET timestamp = excluded.timestamp "
+                "WHERE excluded.timestamp > latest.timestamp",
+                newest.items()
+            )
+        return len(rows)
+
+    def latest(self, tickers=None) -> list:
+        """
+        Latest verdict per ticker.
+
+        Args:
+            tickers (iterable, optional): Tickers to return, in this order.
+                Defaults to every stored ticker (sorted).
+
+        Returns:
+            list: Verdict dicts (tickers without history are omitted).
+        """
+        query = (
+            f"SELECT {', '.join('v.' + f for f in STORED_FIELDS)} FROM latest l "
+            "JOIN verdicts v ON v.ticker = l.ticker AND v.timestamp = l.timestamp"
+        )
+        if tickers is None:
+            rows = self.conn.execute(query + " ORDER BY l.ticker").fetchall()
+            return [self._to_verdict(r) for r in rows]
+
+        by_ticker = {}
+        for ticker in tickers:
+            row = self.conn.execute(query + " WHERE l.ticker = ?", (ticker,)).fetchone()
+            if row is not None:
+                by_ticker[ticker] = self._to_verdict(row)
+        return list(by_ticker.values())
+
+    def history(self, ticker, start=None, end=None) -> list:
+        """
+        Verdicts of one ticker in [start, end], oldest first.
+
+        Args:
+            ticker (str): The stock ticker.
+            start (str, optional): Inclusive ISO timestamp lower bound.
+            end (str, optional): Inclusive ISO timestamp upper bound.
+
+        Returns:
+            list: Verdict dicts.
+        """
+        query = f"SELECT {_COLUMNS} FROM verdicts WHERE ticker = ?"
+        params = [ticker]
+        if start is not None:
+            query += " AND timestamp >= ?"
+            params.append(start)
+        if end is not None:
+            query += " AND timestamp <= ?"
+            params.append(end)
+        query += " ORDER BY timestamp"
+
+        return [self._to_verdict(r) for r in self.conn.execute(query, params)]
+
+    def count(self) -> int:
+        return self.conn.execute("SELECT COUNT(*) FROM verdicts").fetchone()[0]
+
+    def export_json(self, path="server/data.json", tickers=None, verdicts=None) -> list:
+        """
+        Writes verdicts in the legacy data.json format.
+
+        Args:
+            path (str): Output file.
+            tickers (iterable, optional): Tickers to export (see latest).
+            verdicts (list, optional): Verdicts to write as-is, e.g. one run's
+                results, so tickers that failed in that run are not served
+                from older history. Defaults to the latest stored verdicts.
+
+        Returns:
+            list: The exported verdicts.
+        """
+        if verdicts is None:
+            verdicts = self.latest(tickers)
+        with open(path, "w") as f:
+            json.dump(verdicts, f, indent=2)
+        return verdicts